@@ -18,3 +18,13 @@ class BaseAgent:
 
     async def run(self, case: Dict[str, Any], notes: str = "") -> AgentResult:
         raise NotImplementedError("Agent must implement run()")
+
+    async def run_batch(self, cases: List[Dict[str, Any]], notes: str = "", **kwargs: Any) -> List[AgentResult]:
+        """
+        Run the agent over many cases. Results line up with `cases` by index.
+        Default is a per-case loop; stateless agents override this to compute
+        each distinct input key once and fan the result back out. Fanned-out
+        results share their nested lists/dicts, so treat them as read-only
+        (CaseStore replaces agent outputs, it never mutates them in place).
+        """
+        return [await self.run(case, notes=notes, **kwargs) for case in cases]
@@ -1,19 +1,26 @@
 from __future__ import annotations
 
+from dataclasses import replace
+from typing import Any, Dict, List, Optional, Tuple
+
 from app.agents.base_agent import BaseAgent, AgentResult
 from app.tools.compliance_tools import required_docs, compliance_risk_flags, estimate_visa_timeline_weeks
 
 
+def _inputs(case: dict) -> Tuple[str, str, str, Optional[str]]:
+    seed = case.get("seed", {}) or {}
+    return (
+        seed.get("nationality") or "",
+        seed.get("workLocation") or "",
+        seed.get("role") or "",
+        seed.get("startDate"),
+    )
+
+
 class ComplianceAgent(BaseAgent):
     name = "compliance"
 
-    async def run(self, case: dict, notes: str = "") -> AgentResult:
-        seed = case.get("seed", {}) or {}
-        role = seed.get("role") or ""
-        work_location = seed.get("workLocation") or ""
-        nationality = seed.get("nationality") or ""
-        start_date = seed.get("startDate")
-
+    def _evaluate(self, nationality: str, work_location: str, role: str, start_date: Optional[str]) -> AgentResult:
         docs = required_docs(nationality, work_location, role)
         risks, summary2 = compliance_risk_flags(nationality, work_location, role, start_date)
         weeks = estimate_visa_timeline_weeks(nationality, work_location)
@@ -32,3 +39,20 @@ class ComplianceAgent(BaseAgent):
             actions=actions,
             data={"requiredDocs": docs, "visaTimelineWeeks": weeks},
         )
+
+    async def run(self, case: dict, notes: str = "") -> AgentResult:
+        return self._evaluate(*_inputs(case))
+
+    async def run_batch(self, cases: List[Dict[str, Any]], notes: str = "", **kwargs: Any) -> List[AgentResult]:
+        # Output depends on (nationality, work_location, role) only; the visa
+        # rules do not read startDate, so each distinct tuple is evaluated once.
+        groups: Dict[Tuple[str, str, str], AgentResult] = {}
+        out: List[AgentResult] = []
+        for case in cases:
+            nationality, work_location, role, start_date = _inputs(case)
+            key = (nationality, work_location, role)
+            res = groups.get(key)
+            if res is None:
+                res = groups[key] = self._evaluate(nationality, work_location, role, start_date)
+            out.append(replace(res))
+        return out
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from app.agents.base_agent import BaseAgent, AgentResult
+from app.services.ticket_scheduler import schedule_tickets
+from app.store.device_inventory import BACKORDERED, device_inventory
 from app.tools.it_tools import (
     access_groups_by_role,
     equipment_bundle_by_role,
@@ -34,12 +36,35 @@ def _days_until(start_date_str: Optional[str]) -> Optional[int]:
 class ITProvisioningAgent(BaseAgent):
     name = "it"
 
-    async def run(self, case: Dict[str, Any], notes: str = "") -> AgentResult:
-        seed = case.get("seed", {}) or {}
-        role = seed.get("role") or ""
-        work_location = seed.get("workLocation") or ""
-        start_date = seed.get("startDate")
+    def _role_location_plan(self, role: str, work_location: str) -> Dict[str, Any]:
+        # Everything here depends only on (role, work_location).
+        return {
+            "bundle": equipment_bundle_by_role(role),  # fallback
+            "delivery": it_delivery_days_for_location(work_location),
+            "groups": access_groups_by_role(role),
+            "tickets": ticket_templates(),
+        }
+
+    @staticmethod
+    def _device_model(case: Dict[str, Any], shared: Dict[str, Any]) -> str:
+        # Workplace decision (if present) overrides IT fallback bundle model
+        workplace_equipment = (
+            ((case.get("agentOutputs") or {}).get("workplace") or {}).get("data") or {}
+        ).get("equipment") or {}
+        return workplace_equipment.get("deviceModel") or shared["bundle"].get("model")
 
+    @staticmethod
+    def _needs_device(case: Dict[str, Any]) -> bool:
+        hris_out = ((case.get("agentOutputs") or {}).get("hris") or {}).get("data") or {}
+        return bool(hris_out.get("employeeId")) and bool((case.get("caseId") or "").strip())
+
+    def _evaluate(
+        self,
+        case: Dict[str, Any],
+        shared: Dict[str, Any],
+        days_to_start: Optional[int],
+        reservation: Optional[Dict[str, str]] = None,
+    ) -> AgentResult:
         hris_out = ((case.get("agentOutputs") or {}).get("hris") or {}).get("data") or {}
         employee_id = hris_out.get("employeeId")
 
@@ -54,22 +79,20 @@ class ITProvisioningAgent(BaseAgent):
                 data={"blocked": True},
             )
 
-        # Workplace decision (if present) overrides IT fallback bundle model
         workplace_equipment = (
             ((case.get("agentOutputs") or {}).get("workplace") or {}).get("data") or {}
         ).get("equipment") or {}
         workplace_model = workplace_equipment.get("deviceModel")
 
-        it_bundle = equipment_bundle_by_role(role)  # fallback
-        delivery = it_delivery_days_for_location(work_location)
-        groups = access_groups_by_role(role)
-        tickets = ticket_templates()
+        it_bundle = shared["bundle"]
+        delivery = shared["delivery"]
+        groups = shared["groups"]
+        tickets = shared["tickets"]
 
-        device_model = workplace_model or it_bundle.get("model")
+        device_model = self._device_model(case, shared)
         accessories = workplace_equipment.get("accessories") or it_bundle.get("accessories") or []
 
         # SLA risk: device delivery after start date (or too close to start)
-        days_to_start = _days_until(start_date)
         sla_risks = []
         if days_to_start is not None:
             if delivery > days_to_start:
@@ -91,13 +114,30 @@ class ITProvisioningAgent(BaseAgent):
                     }
                 )
 
+        # Ticket chain (AD/SSO before mailbox, access and device) must finish by Day-1.
+        schedule = schedule_tickets(tickets, (case.get("seed") or {}).get("startDate"))
+        if not schedule["feasible"]:
+            sla_risks.append(
+                {
+                    "code": "TICKETS_AFTER_START",
+                    "severity": 7,
+                    "message": (
+                        f"IT ticket critical path ({' -> '.join(schedule['criticalPath'])}, "
+                        f"{schedule['makespanDays']} days) finishes after start date (in {days_to_start} days)."
+                    ),
+                    "mitigation": "Escalate the critical-path tickets or adjust start date.",
+                }
+            )
+
         if sla_risks:
             risks.append("IT SLA risk detected for device provisioning.")
+        if reservation and reservation["state"] == BACKORDERED:
+            risks.append(f"{device_model} is backordered at {reservation['location']}; consider a loaner device.")
 
         actions = [
             {"type": "CREATE_TICKETS", "count": len(tickets)},
             {"type": "ASSIGN_ACCESS_GROUPS", "groups": groups},
-            {"type": "REQUEST_DEVICE", "model": device_model, "deliveryDays": delivery},
+            {"type": "REQUEST_DEVICE", "model": device_model, "deliveryDays": delivery, "reservation": reservation},
         ]
         if workplace_model:
             actions.append({"type": "DEVICE_SOURCE_OF_TRUTH", "source": "WORKPLACE", "model": workplace_model})
@@ -117,9 +157,55 @@ class ITProvisioningAgent(BaseAgent):
             actions=actions,
             data={
                 "employeeId": employee_id,
-                "deviceRequest": {"model": device_model, "accessories": accessories, "deliveryDays": delivery},
+                "deviceRequest": {
+                    "model": device_model,
+                    "accessories": accessories,
+                    "deliveryDays": delivery,
+                    "reservation": reservation,
+                },
                 "tickets": tickets,
+                "ticketSchedule": schedule,
                 "accessGroups": groups,
                 "slaRisks": sla_risks,
             },
         )
+
+    async def run(self, case: Dict[str, Any], notes: str = "") -> AgentResult:
+        seed = case.get("seed", {}) or {}
+        work_location = seed.get("workLocation") or ""
+        shared = self._role_location_plan(seed.get("role") or "", work_location)
+        reservation = None
+        if self._needs_device(case):
+            reservation = device_inventory.reserve(case["caseId"].strip(), self._device_model(case, shared), work_location)
+        return self._evaluate(case, shared, _days_until(seed.get("startDate")), reservation)
+
+    async def run_batch(self, cases: List[Dict[str, Any]], notes: str = "", **kwargs: Any) -> List[AgentResult]:
+        # Role/location lookups and start-date parsing are shared; employee/workplace bits stay per case.
+        shared_by_key: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        days_by_start: Dict[Optional[str], Optional[int]] = {}
+        prepared: List[Tuple[Dict[str, Any], Dict[str, Any], Optional[int]]] = []
+        device_requests: List[Tuple[str, str, str]] = []
+        for case in cases:
+            seed = case.get("seed", {}) or {}
+            key = (seed.get("role") or "", seed.get("workLocation") or "")
+            shared = shared_by_key.get(key)
+            if shared is None:
+                shared = shared_by_key[key] = self._role_location_plan(*key)
+            start_date = seed.get("startDate")
+            if start_date not in days_by_start:
+                days_by_start[start_date] = _days_until(start_date)
+            prepared.append((case, shared, days_by_start[start_date]))
+            if self._needs_device(case):
+                device_requests.append((case["caseId"].strip(), self._device_model(case, shared), key[1]))
+
+        # One transaction for every device hold in the batch.
+        reservations = device_inventory.reserve_many(device_requests)
+        return [
+            self._evaluate(
+                case,
+                shared,
+                days,
+                reservations.get(case["caseId"].strip()) if self._needs_device(case) else None,
+            )
+            for case, shared, days in prepared
+        ]
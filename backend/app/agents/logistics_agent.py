@@ -1,41 +1,55 @@
 from __future__ import annotations
 
+from dataclasses import replace
+from typing import Any, Dict, List, Optional, Tuple
+
 from app.agents.base_agent import BaseAgent, AgentResult
+from app.store.device_inventory import device_inventory
 from app.tools.logistics_tools import delivery_days, facilities_seating_eta_days, laptop_stock
 
 
-class LogisticsAgent(BaseAgent):
-    name = "logistics"
+def _inputs(case: dict) -> Tuple[str, str, str, Optional[str]]:
+    seed = case.get("seed", {}) or {}
+    # Source of truth: Workplace deviceModel (if present)
+    workplace_equipment = (
+        ((case.get("agentOutputs") or {}).get("workplace") or {}).get("data") or {}
+    ).get("equipment") or {}
+    return (
+        (case.get("caseId") or "").strip(),
+        seed.get("role") or "",
+        seed.get("workLocation") or "",
+        workplace_equipment.get("deviceModel"),
+    )
 
-    async def run(self, case: dict, notes: str = "") -> AgentResult:
-        seed = case.get("seed", {}) or {}
-        role = seed.get("role") or ""
-        work_location = seed.get("workLocation") or ""
 
-        # Source of truth: Workplace deviceModel (if present)
-        workplace_equipment = (
-            ((case.get("agentOutputs") or {}).get("workplace") or {}).get("data") or {}
-        ).get("equipment") or {}
-        preferred_model = workplace_equipment.get("deviceModel")
+def _stock_from_reservation(reservation: Dict[str, str]) -> Dict[str, Any]:
+    return {"model": reservation["model"], "status": reservation["stockStatus"], "reservation": reservation["state"]}
 
-        delivery = delivery_days(work_location)
-        seating = facilities_seating_eta_days(work_location)
 
-        # Use existing stock tool as a baseline signal,
-        # but override the model if Workplace already decided it.
-        stock = laptop_stock(role)
+class LogisticsAgent(BaseAgent):
+    name = "logistics"
+
+    def _stock(self, case_id: str, role: str, work_location: str, preferred_model: Optional[str]) -> Dict[str, Any]:
+        # Once Workplace has picked the model, hold a unit for the case;
+        # before that, only report the stock level of the role's default model.
+        if preferred_model and case_id:
+            return _stock_from_reservation(device_inventory.reserve(case_id, preferred_model, work_location))
         if preferred_model:
-            stock = dict(stock or {})
-            stock["model"] = preferred_model
+            level = device_inventory.availability(preferred_model, work_location)
+            return {"model": preferred_model, "status": level["status"]}
+        stock = laptop_stock(role, work_location)
+        return {"model": stock["model"], "status": stock["status"]}
 
-            # Demo-safe, deterministic status rule:
-            # treat XPS as low stock, others in stock (avoids mismatch confusion)
-            m = (preferred_model or "").lower()
-            stock["status"] = "LOW_STOCK" if "xps" in m else "IN_STOCK"
+    def _evaluate(self, work_location: str, stock: Dict[str, Any]) -> AgentResult:
+        delivery = delivery_days(work_location)
+        seating = facilities_seating_eta_days(work_location)
 
         risks = []
-        if (stock.get("status") or "") == "LOW_STOCK":
+        status = stock.get("status") or ""
+        if status == "LOW_STOCK":
             risks.append("Selected device model is low stock; risk of delay or substitution.")
+        elif status == "OUT_OF_STOCK":
+            risks.append("Selected device model is out of stock at this location; device is backordered.")
 
         actions = [
             {"type": "DEVICE_SUPPLY_CHECK", "laptop": stock, "deliveryDays": delivery},
@@ -54,3 +68,29 @@ class LogisticsAgent(BaseAgent):
             actions=actions,
             data={"laptop": stock, "deliveryDays": delivery, "seatingEtaDays": seating},
         )
+
+    async def run(self, case: dict, notes: str = "") -> AgentResult:
+        case_id, role, work_location, preferred_model = _inputs(case)
+        return self._evaluate(work_location, self._stock(case_id, role, work_location, preferred_model))
+
+    async def run_batch(self, cases: List[Dict[str, Any]], notes: str = "", **kwargs: Any) -> List[AgentResult]:
+        inputs = [_inputs(case) for case in cases]
+
+        # All holds for the batch go through one transaction.
+        reservations = device_inventory.reserve_many(
+            [(case_id, model, loc) for case_id, _, loc, model in inputs if case_id and model]
+        )
+
+        groups: Dict[Tuple[str, Tuple[Tuple[str, Any], ...]], AgentResult] = {}
+        out: List[AgentResult] = []
+        for case_id, role, work_location, preferred_model in inputs:
+            if case_id in reservations and preferred_model:
+                stock = _stock_from_reservation(reservations[case_id])
+            else:
+                stock = self._stock("", role, work_location, preferred_model)
+            key = (work_location, tuple(stock.items()))
+            res = groups.get(key)
+            if res is None:
+                res = groups[key] = self._evaluate(work_location, stock)
+            out.append(replace(res))
+        return out
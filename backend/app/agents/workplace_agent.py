@@ -1,12 +1,21 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
 from app.agents.base_agent import BaseAgent, AgentResult
-from app.db.database import SessionLocal
+from app.db.database import SessionLocal, engine
 from app.db.models import WorkplaceAssignment
-from app.tools.workplace_tools import equipment_bundle_by_role, seating_plan_for_location
+from app.store.device_inventory import BACKORDERED, device_inventory
+from app.store.seat_inventory import normalize_location, seat_inventory
+from app.tools.workplace_tools import (
+    cohort_week,
+    equipment_bundle_by_role,
+    plan_cohort_zones,
+    seating_plan_for_location,
+)
+
+_REMOTE_MODES = {"REMOTE", "HYBRID_REMOTE"}
 
 
 @dataclass
@@ -15,33 +24,133 @@ class _WorkplacePlan:
     seating: Dict[str, Any]
 
 
+@dataclass
+class _WorkplaceInputs:
+    case_id: str
+    role: str
+    work_location: str
+    full_name: str
+    work_mode: str
+    team: str
+    start_date: Optional[str]
+
+
+def _inputs(case: Dict[str, Any]) -> _WorkplaceInputs:
+    seed = case.get("seed", {}) or {}
+    steps = case.get("steps", {}) or {}
+    role = (seed.get("role") or "").strip()
+    work_mode = (
+        (steps.get("work_preferences") or {}).get("workMode")
+        or (steps.get("offer") or {}).get("workMode")
+        or "ONSITE"
+    )
+    return _WorkplaceInputs(
+        case_id=(case.get("caseId") or "").strip(),
+        role=role,
+        work_location=(seed.get("workLocation") or "").strip(),
+        full_name=seed.get("candidateName") or case.get("candidateName") or "Candidate",
+        work_mode=work_mode,
+        # Seat neighbours: explicit team/department if the seed has one, else same role.
+        team=(seed.get("team") or seed.get("department") or role).strip().lower(),
+        start_date=seed.get("startDate"),
+    )
+
+
 class WorkplaceServicesAgent(BaseAgent):
     """
     Workplace Services Agent (Milestone 3.1):
     - Choose equipment bundle (workplace-managed)
     - Assign seating based on location and role
     - DB-backed idempotency: one assignment per case_id
+    - run_batch: cohort seating (same location + start week) solved in one pass
     """
     name = "workplace"
 
-    async def run(self, case: Dict[str, Any], notes: str = "") -> AgentResult:
-        seed = case.get("seed", {}) or {}
-        steps = case.get("steps", {}) or {}
+    def _existing_result(self, inp: _WorkplaceInputs, existing: WorkplaceAssignment, reservation: Optional[Dict[str, str]]) -> AgentResult:
+        summary = (
+            f"Workplace already assigned for {inp.full_name}: "
+            f"Bundle '{existing.bundle_name}' + Seat '{existing.seat_id}'."
+        )
+        actions = [
+            {
+                "type": "WORKPLACE_IDEMPOTENT_HIT",
+                "seatId": existing.seat_id,
+                "bundleName": existing.bundle_name,
+                "deviceModel": existing.device_model,
+            }
+        ]
+        return AgentResult(
+            agent=self.name,
+            summary=summary,
+            risks=[],
+            actions=actions,
+            data={
+                "fullName": inp.full_name,
+                "workMode": inp.work_mode,
+                "equipment": existing.equipment or {},
+                "seating": existing.seating or {},
+                "deviceReservation": reservation,
+            },
+        )
 
-        case_id = (case.get("caseId") or "").strip()
-        role = (seed.get("role") or "").strip()
-        work_location = (seed.get("workLocation") or "").strip()
+    def _planned_result(
+        self,
+        inp: _WorkplaceInputs,
+        equip: Dict[str, Any],
+        seat: Dict[str, Any],
+        reservation: Optional[Dict[str, str]],
+    ) -> AgentResult:
+        risks: List[str] = []
+        actions: List[dict] = []
 
-        full_name = seed.get("candidateName") or case.get("candidateName") or "Candidate"
+        if reservation and reservation["state"] == BACKORDERED:
+            risks.append(f"{reservation['model']} is out of stock at {reservation['location']}; device backordered.")
+        if not seat.get("seatId"):
+            risks.append(seat.get("notes") or "No seat could be allocated.")
+        if not inp.work_location:
+            risks.append("Missing workLocation. Seating assignment may be incorrect.")
+        if not inp.role:
+            risks.append("Missing role. Equipment bundle may be generic.")
 
-        work_mode = (
-            (steps.get("work_preferences") or {}).get("workMode")
-            or (steps.get("offer") or {}).get("workMode")
-            or "ONSITE"
+        actions.append({"type": "WORKPLACE_EQUIPMENT_BUNDLE", "bundle": equip})
+        actions.append({"type": "WORKPLACE_SEATING_ASSIGNED", "seat": seat})
+        if reservation:
+            actions.append({"type": "DEVICE_RESERVED", "reservation": reservation})
+
+        summary = (
+            f"Workplace planned for {inp.full_name}: "
+            f"Bundle '{equip.get('bundleName')}' + Seat '{seat.get('seatId')}'."
         )
 
-        risks: List[str] = []
-        actions: List[dict] = []
+        return AgentResult(
+            agent=self.name,
+            summary=summary,
+            risks=risks,
+            actions=actions,
+            data={
+                "fullName": inp.full_name,
+                "workMode": inp.work_mode,
+                "equipment": equip,
+                "seating": seat,
+                "deviceReservation": reservation,
+            },
+        )
+
+    @staticmethod
+    def _assignment_row(case_id: str, equip: Dict[str, Any], seat: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "case_id": case_id,
+            "seat_id": seat.get("seatId") or "",
+            "bundle_name": equip.get("bundleName") or "",
+            "device_model": equip.get("deviceModel") or "",
+            "equipment": equip,
+            "seating": seat,
+            "asset_id": equip.get("assetId") or None,
+        }
+
+    async def run(self, case: Dict[str, Any], notes: str = "") -> AgentResult:
+        inp = _inputs(case)
+        case_id = inp.case_id
 
         # --- Idempotency: if assignment exists, return it ---
         if case_id:
@@ -49,78 +158,130 @@ class WorkplaceServicesAgent(BaseAgent):
             try:
                 existing = db.query(WorkplaceAssignment).filter(WorkplaceAssignment.case_id == case_id).first()
                 if existing:
-                    equip = existing.equipment or {}
-                    seat = existing.seating or {}
-                    summary = (
-                        f"Workplace already assigned for {full_name}: "
-                        f"Bundle '{existing.bundle_name}' + Seat '{existing.seat_id}'."
-                    )
-                    actions.append(
-                        {
-                            "type": "WORKPLACE_IDEMPOTENT_HIT",
-                            "seatId": existing.seat_id,
-                            "bundleName": existing.bundle_name,
-                            "deviceModel": existing.device_model,
-                        }
-                    )
-                    return AgentResult(
-                        agent=self.name,
-                        summary=summary,
-                        risks=[],
-                        actions=actions,
-                        data={
-                            "fullName": full_name,
-                            "workMode": work_mode,
-                            "equipment": equip,
-                            "seating": seat,
-                        },
+                    reservation = (
+                        device_inventory.reserve(case_id, existing.device_model, inp.work_location)
+                        if existing.device_model
+                        else None
                     )
+                    return self._existing_result(inp, existing, reservation)
             finally:
                 db.close()
 
         # --- Create assignment ---
-        equip = equipment_bundle_by_role(role)
-        seat = seating_plan_for_location(work_location, role=role, work_mode=work_mode)
+        equip = equipment_bundle_by_role(inp.role)
+        seat = seating_plan_for_location(inp.work_location, role=inp.role, work_mode=inp.work_mode, case_id=case_id)
 
-        if not work_location:
-            risks.append("Missing workLocation. Seating assignment may be incorrect.")
-        if not role:
-            risks.append("Missing role. Equipment bundle may be generic.")
-
-        actions.append({"type": "WORKPLACE_EQUIPMENT_BUNDLE", "bundle": equip})
-        actions.append({"type": "WORKPLACE_SEATING_ASSIGNED", "seat": seat})
-
-        summary = (
-            f"Workplace planned for {full_name}: "
-            f"Bundle '{equip.get('bundleName')}' + Seat '{seat.get('seatId')}'."
-        )
+        reservation = None
+        if case_id and equip.get("deviceModel"):
+            reservation = device_inventory.reserve(case_id, equip["deviceModel"], inp.work_location)
 
         # Persist for idempotency if possible
         if case_id:
             db = SessionLocal()
             try:
-                row = WorkplaceAssignment(
-                    case_id=case_id,
-                    seat_id=(seat.get("seatId") or ""),
-                    bundle_name=(equip.get("bundleName") or ""),
-                    device_model=(equip.get("deviceModel") or ""),
-                    equipment=equip,
-                    seating=seat,
-                )
-                db.merge(row)  # safe upsert for SQLite demo
+                db.merge(WorkplaceAssignment(**self._assignment_row(case_id, equip, seat)))  # safe upsert for SQLite demo
                 db.commit()
             finally:
                 db.close()
 
-        return AgentResult(
-            agent=self.name,
-            summary=summary,
-            risks=risks,
-            actions=actions,
-            data={
-                "fullName": full_name,
-                "workMode": work_mode,
-                "equipment": equip,
-                "seating": seat,
-            },
-        )
+        return self._planned_result(inp, equip, seat, reservation)
+
+    async def run_batch(self, cases: List[Dict[str, Any]], notes: str = "", **kwargs: Any) -> List[AgentResult]:
+        """
+        Cohort mode. New onsite hires are grouped by (location, start week); each cohort's
+        teams are laid out over the free zones with plan_cohort_zones and claimed in one
+        seat-inventory transaction. Device holds and workplace_assignments rows are written
+        in bulk. Cases that already have an assignment keep it.
+        """
+        inputs = [_inputs(case) for case in cases]
+        case_ids = [inp.case_id for inp in inputs if inp.case_id]
+
+        existing: Dict[str, WorkplaceAssignment] = {}
+        if case_ids:
+            db = SessionLocal()
+            try:
+                for row in db.query(WorkplaceAssignment).filter(WorkplaceAssignment.case_id.in_(case_ids)).all():
+                    existing[row.case_id] = row
+            finally:
+                db.close()
+
+        # Cohorts of new onsite cases; everything else takes the single-case seating path.
+        cohorts: Dict[Tuple[str, Optional[str]], List[_WorkplaceInputs]] = {}
+        seats: Dict[str, Dict[str, Any]] = {}
+        for inp in inputs:
+            if not inp.case_id or inp.case_id in existing or inp.case_id in seats:
+                continue
+            if inp.work_mode.strip().upper() in _REMOTE_MODES:
+                seats[inp.case_id] = seating_plan_for_location(inp.work_location, inp.role, inp.work_mode, inp.case_id)
+                continue
+            key = (normalize_location(inp.work_location), cohort_week(inp.start_date))
+            cohorts.setdefault(key, []).append(inp)
+            seats[inp.case_id] = {}  # placeholder; filled per cohort below
+
+        for (location, week), members in cohorts.items():
+            by_team: Dict[str, List[str]] = {}
+            for inp in members:
+                by_team.setdefault(inp.team, []).append(inp.case_id)
+            zone_free = list(seat_inventory.stats(location)["zones"].items())
+            plan = plan_cohort_zones({team: len(ids) for team, ids in by_team.items()}, zone_free)
+
+            zone_plan: Dict[str, str] = {}
+            for team, spans in plan.items():
+                ids = iter(sorted(by_team[team]))
+                for zone_key, count in spans:
+                    for _ in range(count):
+                        zone_plan[next(ids)] = zone_key
+
+            # Planned cases first, so overflow cases can't take desks the plan handed to someone else.
+            ordered = sorted(members, key=lambda inp: inp.case_id not in zone_plan)
+            allocated = seat_inventory.allocate_many(
+                location, [(inp.case_id, inp.team) for inp in ordered], zone_plan=zone_plan
+            )
+            cohort_label = f"{location} {week}" if week else location
+            for inp in members:
+                seat = allocated.get(inp.case_id)
+                if seat:
+                    seats[inp.case_id] = {**seat, "notes": f"Allocated from seat inventory (cohort {cohort_label})."}
+                else:
+                    seats[inp.case_id] = {
+                        "seatId": None,
+                        "building": location,
+                        "floor": None,
+                        "zone": None,
+                        "notes": f"No free seats at {location}; facilities follow-up required.",
+                    }
+
+        equip_by_role: Dict[str, Dict[str, Any]] = {}
+        device_requests: List[Tuple[str, str, str]] = []
+        for inp in inputs:
+            if inp.case_id in existing:
+                if existing[inp.case_id].device_model:
+                    device_requests.append((inp.case_id, existing[inp.case_id].device_model, inp.work_location))
+                continue
+            if inp.role not in equip_by_role:
+                equip_by_role[inp.role] = equipment_bundle_by_role(inp.role)
+            model = equip_by_role[inp.role].get("deviceModel")
+            if inp.case_id and model:
+                device_requests.append((inp.case_id, model, inp.work_location))
+        reservations = device_inventory.reserve_many(device_requests)
+
+        out: List[AgentResult] = []
+        rows: List[Dict[str, Any]] = []
+        for inp in inputs:
+            if inp.case_id in existing:
+                out.append(self._existing_result(inp, existing[inp.case_id], reservations.get(inp.case_id)))
+                continue
+            # Per-case copy: each row owns its equipment JSON.
+            equip = {**equip_by_role[inp.role], "accessories": list(equip_by_role[inp.role]["accessories"])}
+            if inp.case_id:
+                seat = seats[inp.case_id]
+                rows.append(self._assignment_row(inp.case_id, equip, seat))
+            else:
+                seat = seating_plan_for_location(inp.work_location, inp.role, inp.work_mode)
+            out.append(self._planned_result(inp, equip, seat, reservations.get(inp.case_id)))
+
+        if rows:
+            with engine.begin() as conn:
+                # OR IGNORE: a concurrent single-case run may have written the row first.
+                conn.execute(WorkplaceAssignment.__table__.insert().prefix_with("OR IGNORE"), rows)
+        return out
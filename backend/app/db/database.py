@@ -1,7 +1,9 @@
+import os
+
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 
-DATABASE_URL = "sqlite:///./hr_automator.db"
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./hr_automator.db")
 
 engine = create_engine(
     DATABASE_URL,
@@ -0,0 +1,111 @@
+"""
+Schema changes that create_all can't make on an existing database (it only creates missing
+tables). Each step is idempotent and runs from main._startup; `python -m app.db.migrations`
+runs them by hand.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+from typing import Any, Dict
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.db.database import Base, engine
+from app.db.models import WorkplaceAssignment
+
+MIGRATION_BATCH_SIZE = int(os.getenv("MIGRATION_BATCH_SIZE", "5000"))
+
+
+def _has_column(conn: Connection, table: str, column: str) -> bool:
+    return any(r[1] == column for r in conn.execute(text(f"PRAGMA table_info({table})")).fetchall())
+
+
+def add_column(table: str, column: str, ddl: str) -> bool:
+    """ALTER TABLE ... ADD COLUMN if it isn't there yet. Returns True if added."""
+    with engine.begin() as conn:
+        if _has_column(conn, table, column):
+            return False
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+        return True
+
+
+def backfill_asset_ids(batch_size: int = MIGRATION_BATCH_SIZE) -> Dict[str, Any]:
+    """
+    Copy equipment["assetId"] into workplace_assignments.asset_id, one rowid range per
+    transaction so a large table doesn't hold the write lock for the whole pass. Rows whose
+    asset id is already taken by another case are left NULL and reported as conflicts.
+    """
+    updated = 0
+    conflicts = []
+    last = 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(
+                text(
+                    "SELECT rowid, case_id, asset_id, json_extract(equipment, '$.assetId') "
+                    "FROM workplace_assignments WHERE rowid > :last ORDER BY rowid LIMIT :n"
+                ),
+                {"last": last, "n": batch_size},
+            ).fetchall()
+            if not rows:
+                break
+            last = rows[-1][0]
+            todo = [
+                {"r": rowid, "a": str(tag)}
+                for rowid, _, current, tag in rows
+                if current is None and tag not in (None, "")
+            ]
+            for item in todo:
+                # OR IGNORE: a duplicate tag skips the row instead of aborting the batch.
+                res = conn.execute(
+                    text("UPDATE OR IGNORE workplace_assignments SET asset_id = :a WHERE rowid = :r"), item
+                )
+                if res.rowcount:
+                    updated += 1
+                else:
+                    conflicts.append(item["a"])
+    return {"updated": updated, "conflicts": conflicts}
+
+
+def migrate_workplace_asset_ids() -> Dict[str, Any]:
+    added = add_column("workplace_assignments", "asset_id", "VARCHAR")
+    with engine.begin() as conn:
+        # Partial: rows without an issued device (NULL) don't collide.
+        conn.execute(
+            text(
+                "CREATE UNIQUE INDEX IF NOT EXISTS ux_workplace_assignments_asset "
+                "ON workplace_assignments(asset_id) WHERE asset_id IS NOT NULL"
+            )
+        )
+    # Tables created with the column are kept populated by their writers; only upgrades need the pass.
+    result = backfill_asset_ids() if added else {"updated": 0, "conflicts": []}
+    return {"columnAdded": added, **result}
+
+
+def run_migrations() -> Dict[str, Any]:
+    return {"workplace_asset_ids": migrate_workplace_asset_ids()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Schema migrations.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("run", help="apply pending migrations")
+    backfill = sub.add_parser("backfill-assets", help="(re)copy equipment assetId into workplace_assignments.asset_id")
+    backfill.add_argument("--batch-size", type=int, default=MIGRATION_BATCH_SIZE)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine, tables=[WorkplaceAssignment.__table__])
+    if args.cmd == "run":
+        print(run_migrations())
+    else:
+        migrate_workplace_asset_ids()
+        result = backfill_asset_ids(args.batch_size)
+        print(f"asset_id backfilled on {result['updated']} rows, {len(result['conflicts'])} conflicts")
+        for tag in result["conflicts"]:
+            print(f"  duplicate asset id: {tag}")
+
+
+if __name__ == "__main__":
+    main()
@@ -65,6 +65,8 @@ class WorkplaceAssignment(Base):
     device_model = Column(String, index=True)
     equipment = Column(JSON, default={})
     seating = Column(JSON, default={})
+    # Shadow of equipment["assetId"] for reverse lookups; unique (partial) index in app/db/migrations.py.
+    asset_id = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
 
@@ -78,3 +80,109 @@ class CaseState(Base):
     case_id = Column(String, ForeignKey("cases.id"), primary_key=True, index=True)
     state = Column(JSON, default={})
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class Seat(Base):
+    """
+    Seat inventory (floors/zones/desks per location).
+    case_id is NULL for free seats; unique so a case can occupy at most one seat.
+    """
+    __tablename__ = "seats"
+
+    seat_id = Column(String, primary_key=True, index=True)
+    location = Column(String, index=True)
+    floor = Column(Integer)
+    zone = Column(String)
+    desk = Column(Integer)
+    case_id = Column(String, ForeignKey("cases.id"), unique=True, nullable=True)
+    assigned_at = Column(DateTime, nullable=True)
+
+
+class DeviceStock(Base):
+    """
+    Device counters per (model, location).
+    available = on_hand - reserved; commit moves one unit from on_hand/reserved to committed.
+    """
+    __tablename__ = "device_stock"
+
+    model = Column(String, primary_key=True)
+    location = Column(String, primary_key=True)
+    on_hand = Column(Integer, nullable=False, default=0)
+    reserved = Column(Integer, nullable=False, default=0)
+    committed = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class DeviceReservation(Base):
+    """
+    One device hold per case (idempotency key = case_id).
+    state: RESERVED | COMMITTED | BACKORDERED
+    """
+    __tablename__ = "device_reservations"
+
+    case_id = Column(String, ForeignKey("cases.id"), primary_key=True, index=True)
+    model = Column(String, index=True)
+    location = Column(String)
+    state = Column(String)
+    stock_status = Column(String)  # stock level seen when the hold was placed
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class CaseStatEntry(Base):
+    """
+    The dimension values each case is currently counted under in case_stat_counters.
+    Lets an update subtract the old values without rescanning cases.
+    """
+    __tablename__ = "case_stat_entries"
+
+    case_id = Column(String, primary_key=True, index=True)
+    status = Column(String)
+    risk_status = Column(String)
+    location = Column(String)
+    start_week = Column(String)
+
+
+class CaseStatCounter(Base):
+    """HR dashboard aggregates: number of cases per (dimension, value)."""
+    __tablename__ = "case_stat_counters"
+
+    dimension = Column(String, primary_key=True)  # status | riskStatus | location | startWeek
+    value = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class CaseSummary(Base):
+    """
+    Read model for the HR dashboard and employee views: one flat row per case, rebuilt from
+    cases, application_codes, employee_records, workplace_assignments and case_states whenever
+    any of them changes (see app/store/case_summary.py).
+    """
+    __tablename__ = "case_summary"
+
+    case_id = Column(String, primary_key=True, index=True)
+    candidate_name = Column(String)
+    role = Column(String)
+    nationality = Column(String)
+    work_location = Column(String)
+    start_date = Column(String)
+    salary = Column(String)
+    benefits = Column(JSON, default={})
+    prior_notes = Column(String)
+    case_status = Column(String)  # cases.status (what the cases list shows)
+    status = Column(String, index=True)  # wizard status if any, else cases.status
+    risk_status = Column(String, index=True)
+    application_code = Column(String, index=True)
+    employee_id = Column(String, index=True)
+    full_name = Column(String)
+    email = Column(String)
+    department = Column(String)
+    offer_decision = Column(String)
+    offer_concerns = Column(JSON)
+    salary_appeal = Column(JSON)
+    seat_location = Column(String)
+    device_model = Column(String)
+    asset_id = Column(String)
+    steps = Column(JSON, default={})
+    confirmed = Column(Boolean, default=False, index=True)  # has an employee and status in CONFIRMED_STATUSES
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
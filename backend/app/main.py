@@ -1,9 +1,12 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+import json
+import os
+from typing import Any, Dict, List, Optional
 
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from sqlalchemy import text
 
@@ -11,11 +14,27 @@ from app.agents.hris_agent import HRISAgent
 from app.agents.it_agent import ITProvisioningAgent
 from app.agents.workplace_agent import WorkplaceServicesAgent
 from app.db.database import SessionLocal, engine
-from app.db.models import ApplicationCode, Base, Case, HRUser
+from app.db.migrations import run_migrations
+from app.db.models import Base, Case, HRUser
 from app.routes.hr import router as hr_router
-from app.services.case_bridge import ensure_case_seeded
+from app.services.case_bridge import (
+    ensure_case_seeded,
+    ensure_cases_seeded,
+    invalidate_case_codes,
+    resolve_application_code,
+    seed_for,
+)
+from app.services.case_projection import parse_fields, project
+from app.services.case_warmup import CASE_WARMUP_ENABLED, case_warmup
 from app.services.orchestrator_service import run_orchestrator_for_case
-from app.store.case_store import case_store
+from app.services.risk_sweeper import RISK_SWEEPER_ENABLED, risk_sweeper
+from app.services.sql_profiler import SQL_PROFILER_ENABLED, SQLProfilerMiddleware, instrument_engine, recent_requests
+from app.store.case_stats import case_stats
+from app.store.case_summary import case_summary
+from app.store.search_index import ensure_search_index
+from app.store.case_store import case_store, serialise
+
+CASE_BATCH_MAX = int(os.getenv("CASE_BATCH_MAX", "100"))
 
 app = FastAPI(title="HR Automator Backend", version="0.1.0")
 
@@ -27,6 +46,8 @@ workplace_agent = WorkplaceServicesAgent()
 @app.on_event("startup")
 def _startup() -> None:
     Base.metadata.create_all(bind=engine)
+    # Columns/indexes added to existing tables (create_all only creates missing tables).
+    run_migrations()
 
     # Only one active application code per case
     try:
@@ -67,6 +88,39 @@ def _startup() -> None:
     finally:
         db.close()
 
+    # Dashboard counters: count existing cases once on the first start after upgrading.
+    case_stats.ensure_built()
+    # Full-text search over case_summary (FTS5 + sync triggers); must exist before the backfill below.
+    ensure_search_index()
+    # Read model for the HR list views: backfill once if it's empty.
+    case_summary.ensure_built()
+
+
+# Background Day-1 risk sweeper (RISK_SWEEPER_ENABLED=0 to disable)
+@app.on_event("startup")
+async def _start_risk_sweeper() -> None:
+    if RISK_SWEEPER_ENABLED:
+        risk_sweeper.start()
+
+
+@app.on_event("shutdown")
+async def _stop_risk_sweeper() -> None:
+    await risk_sweeper.stop()
+
+
+# Background warm-up of open cases into case_store (CASE_WARMUP_ENABLED=0 to disable)
+@app.on_event("startup")
+async def _start_case_warmup() -> None:
+    if CASE_WARMUP_ENABLED:
+        case_warmup.start()
+    else:
+        case_warmup.state = "disabled"
+
+
+@app.on_event("shutdown")
+async def _stop_case_warmup() -> None:
+    await case_warmup.stop()
+
 
 # HR routes
 app.include_router(hr_router)
@@ -79,69 +133,146 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Case-Version"],
 )
 
+# Opt-in SQL profiler (SQL_PROFILER=1): per-request query counts/timings + N+1 flags.
+if SQL_PROFILER_ENABLED:
+    instrument_engine(engine)
+    app.add_middleware(SQLProfilerMiddleware)
+
+    @app.get("/debug/requests")
+    def debug_requests(n_plus_one_only: bool = False) -> Dict[str, Any]:
+        entries = recent_requests()
+        if n_plus_one_only:
+            entries = [e for e in entries if e["nPlusOne"]]
+        return {"requests": list(reversed(entries))}
+
 
 @app.get("/health")
-def health() -> Dict[str, bool]:
-    return {"ok": True}
+def health() -> Dict[str, Any]:
+    # Ready as soon as startup returns; warmup reports the background case_store load.
+    return {"ok": True, "warmup": case_warmup.stats()}
 
 
 @app.post("/api/case/init")
 def init_case(payload: dict) -> Dict[str, Any]:
     """
     Candidate entry-point:
-    - Validate applicationCode in DB
+    - Validate applicationCode (cached in case_bridge; reloads don't reach the DB)
     - Seed case_store using DB Case.id so frontend and backend agree
     """
     application_code = payload.get("applicationCode")
     if not application_code:
         raise HTTPException(status_code=400, detail="applicationCode required")
 
-    db = SessionLocal()
+    entry = resolve_application_code(application_code)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Invalid application code")
+
+    seeded_case = case_store.init_or_get_case(
+        application_number=application_code,
+        seed=seed_for(entry),
+        case_id=entry.case_id,
+    )
+
+    if entry.status and seeded_case.get("status") != entry.status:
+        case_store.set_status(entry.case_id, entry.status)
+
+    return seeded_case
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    # If-None-Match uses weak comparison: W/"x" matches "x".
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or any((t[2:] if t.startswith("W/") else t) == etag for t in tags)
+
+
+@app.get("/api/case/{case_id}")
+def get_case(
+    case_id: str,
+    request: Request,
+    fields: Optional[str] = None,
+    since_version: Optional[int] = Query(None, alias="sinceVersion"),
+) -> Response:
+    """
+    Polled by the wizard. The body is CaseStore's cached serialisation (re-encoded only after a
+    change) with a strong ETag; a matching If-None-Match gets 304 and no body.
+
+    ?fields=status,currentStepIndex,steps.offer,agentOutputs.it.data returns only those paths.
+    ?sinceVersion=N (from X-Case-Version) returns {version, full, changes}: only the top-level keys
+    changed since N, or the whole case (full=true) when N is from before a restart/reload or too old.
+    """
+    ensure_case_seeded(case_id)
     try:
-        code = (
-            db.query(ApplicationCode)
-            .filter(ApplicationCode.code == application_code, ApplicationCode.active == True)  # noqa: E712
-            .first()
-        )
-        if not code:
-            raise HTTPException(status_code=404, detail="Invalid application code")
-
-        case = db.query(Case).filter(Case.id == code.case_id).first()
-        if not case:
-            raise HTTPException(status_code=404, detail="Case not found")
-
-        seeded_case = case_store.init_or_get_case(
-            application_number=application_code,
-            seed={
-                "candidateName": case.candidate_name,
-                "role": case.role,
-                "workLocation": case.work_location,
-                "nationality": case.nationality,
-                "startDate": case.start_date,
-                "compensation": {"salary": case.salary},
-                "benefitsContext": case.benefits or {},
-                "priorNotes": case.prior_notes or "",
+        paths = parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if since_version is not None:
+        c = case_store.get_case(case_id)
+        if c is None:
+            return JSONResponse({"error": "Case not found"})
+        version = case_store.versions.get(case_id, 0)
+        keys = case_store.changed_keys(case_id, since_version)
+        changes = {k: c[k] for k in (c if keys is None else keys) if k in c}
+        return JSONResponse(
+            {
+                "caseId": case_id,
+                "version": version,
+                "sinceVersion": since_version,
+                "full": keys is None,
+                "changes": project(changes, paths) if paths else changes,
             },
-            case_id=case.id,
+            headers={"X-Case-Version": str(version), "Cache-Control": "no-cache"},
         )
 
-        if case.status:
-            case_store.set_status(case.id, case.status)
+    snap = case_store.snapshot(case_id)
+    if snap is None:
+        return JSONResponse({"error": "Case not found"})
+    body, etag = snap.body, snap.etag
+    if paths:
+        body, etag = serialise(project(case_store.get_case(case_id) or {}, paths))
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "X-Case-Version": str(snap.version)}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
-        return seeded_case
-    finally:
-        db.close()
 
+class BatchCasesRequest(BaseModel):
+    caseIds: List[str]
+    fields: Optional[str] = None
 
-@app.get("/api/case/{case_id}")
-def get_case(case_id: str) -> Dict[str, Any]:
-    ensure_case_seeded(case_id)
-    c = case_store.get_case(case_id)
-    if not c:
-        return {"error": "Case not found"}
-    return c
+
+@app.post("/api/case/batch")
+def get_cases_batch(req: BatchCasesRequest) -> Response:
+    """
+    Up to CASE_BATCH_MAX cases in one round trip: {"cases": {caseId: case}, "missing": [...]}.
+    Cases not in memory are loaded with bulk IN queries (ensure_cases_seeded); without `fields`
+    each case's cached snapshot bytes are spliced into the response as is.
+    """
+    case_ids = list(dict.fromkeys(cid for cid in req.caseIds if cid))
+    if len(case_ids) > CASE_BATCH_MAX:
+        raise HTTPException(status_code=400, detail=f"At most {CASE_BATCH_MAX} caseIds per request")
+    try:
+        paths = parse_fields(req.fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    found = ensure_cases_seeded(case_ids)
+    missing = [cid for cid in case_ids if cid not in found]
+    if paths:
+        return JSONResponse({"cases": {cid: project(c, paths) for cid, c in found.items()}, "missing": missing})
+
+    parts = []
+    for cid in case_ids:
+        snap = case_store.snapshot(cid) if cid in found else None
+        if snap is not None:
+            parts.append(json.dumps(cid).encode("utf-8") + b":" + snap.body)
+    body = b'{"cases":{' + b",".join(parts) + b'},"missing":' + json.dumps(missing).encode("utf-8") + b"}"
+    return Response(content=body, media_type="application/json")
 
 
 class SaveStepRequest(BaseModel):
@@ -189,6 +320,7 @@ def set_case_status(case_id: str, req: SetStatusRequest) -> Dict[str, Any]:
         db.commit()
     finally:
         db.close()
+    invalidate_case_codes(case_id)
 
     case_store.set_status(case_id, req.status)
     return case_store.get_case(case_id) or {"error": "Case not found"}
@@ -207,6 +339,7 @@ async def submit_case(case_id: str, req: SubmitRequest) -> Dict[str, Any]:
         db.commit()
     finally:
         db.close()
+    invalidate_case_codes(case_id)
 
     case_store.set_status(case_id, "ONBOARDING_IN_PROGRESS")
     case_store.emit(case_id, "case.submitted", {"status": "ONBOARDING_IN_PROGRESS"})
@@ -1,13 +1,28 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+import os
+import time
 from uuid import uuid4
 from typing import Any, Dict, List, Optional
 
 from app.db.database import SessionLocal
-from app.db.models import HRUser, Case, ApplicationCode, EmployeeRecord, WorkplaceAssignment
-from app.services.orchestrator_service import run_orchestrator_for_case
-from app.services.case_bridge import ensure_case_seeded
+from app.db.models import HRUser, Case, ApplicationCode, CaseState, CaseSummary, EmployeeRecord, WorkplaceAssignment
+from app.services.orchestrator_service import run_orchestrator_for_case, workplace_agent
+from app.services.case_bridge import ensure_case_seeded, forget_missing_case, invalidate_case_codes
+from app.services.risk_forecast import TERMINAL_STATUSES, run_forecast
+from app.services.risk_sweeper import risk_sweeper
+from app.services.ticket_scheduler import IT_DAILY_TICKET_CAPACITY, capacity_report, schedule_tickets
+from app.services.start_date_optimizer import HORIZON_DAYS, WORK_MODES, start_date_options
+from app.store.case_stats import case_stats
 from app.store.case_store import case_store
+from app.store.case_summary import case_summary
+from app.store.device_inventory import device_inventory
+from app.store.search_index import search as search_cases
+from app.store.seat_inventory import SeatConflict, normalize_location, seat_inventory
+from app.tools.it_tools import ticket_templates
+from app.tools.workplace_tools import cohort_week, cohort_week_range
 
 router = APIRouter(prefix="/api/hr", tags=["HR"])
 
@@ -52,6 +67,9 @@ def create_case(payload: dict, db: Session = Depends(get_db)):
 
         db.add(new_case)
         db.commit()
+        forget_missing_case(case_id)
+        case_stats.sync(case_id)
+        case_summary.refresh(case_id)
         return {"case_id": case_id}
     except Exception:
         db.rollback()
@@ -85,6 +103,8 @@ def generate_application_code(case_id: str, db: Session = Depends(get_db)):
         db.add(code)
         db.commit()
         db.refresh(code)
+        invalidate_case_codes(case_id, code.code)
+        case_summary.refresh(case_id)
         return {"applicationCode": code.code}
     except HTTPException:
         raise
@@ -93,61 +113,55 @@ def generate_application_code(case_id: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/cases")
-def list_cases(db: Session = Depends(get_db)):
-    cases = db.query(Case).all()
-    result = []
-
-    for c in cases:
-        code = (
-            db.query(ApplicationCode)
-            .filter(
-                ApplicationCode.case_id == c.id,
-                ApplicationCode.active == True,  # noqa: E712
-            )
-            .first()
-        )
+@router.get("/stats")
+def case_stats_summary():
+    """Dashboard counts by status / riskStatus / location / start week from the maintained counters."""
+    return case_stats.snapshot()
 
-        # Wizard / candidate feedback
-        wizard_data = case_store.get_case(c.id)
-        offer_step = (
-            wizard_data.get("steps", {}).get("offer", {})
-            if wizard_data
-            else {}
-        )
 
-        # HRIS / employee record
-        emp = (
-            db.query(EmployeeRecord)
-            .filter(EmployeeRecord.case_id == c.id)
-            .first()
-        )
+@router.get("/search")
+def search(q: str = "", limit: int = 20, offset: int = 0, scope: str = "all"):
+    """
+    Ranked typeahead over candidate name, role, location, employee id, email, seat and asset tag.
+    scope=employees restricts to confirmed employees.
+    """
+    if not 1 <= limit <= 100:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 100")
+    if offset < 0:
+        raise HTTPException(status_code=400, detail="offset must be >= 0")
+    if scope not in ("all", "employees"):
+        raise HTTPException(status_code=400, detail="scope must be 'all' or 'employees'")
+    return search_cases(q, limit=limit, offset=offset, employees_only=scope == "employees")
 
-        result.append(
-            {
-                "id": c.id,
-                "candidate_name": c.candidate_name,
-                "role": c.role,
-                "nationality": c.nationality,
-                "work_location": c.work_location,
-                "start_date": c.start_date,
-                "salary": c.salary,
-                "benefits": c.benefits,
-                "prior_notes": c.prior_notes,
-                "status": c.status,
-                "applicationCode": code.code if code else None,
-
-                # Candidate-facing signals
-                "candidate_decision": offer_step.get("decision"),
-                "candidate_concerns": offer_step.get("concerns"),
-                "salary_appeal": offer_step.get("salaryAppeal"),
-
-                # HRIS outcome
-                "employeeId": emp.employee_id if emp else None,
-            }
-        )
 
-    return result
+@router.get("/cases")
+def list_cases(db: Session = Depends(get_db)):
+    # Single-table read from the case_summary read model (see app/store/case_summary.py).
+    rows = db.query(CaseSummary).order_by(CaseSummary.created_at, CaseSummary.case_id).all()
+    return [
+        {
+            "id": r.case_id,
+            "candidate_name": r.candidate_name,
+            "role": r.role,
+            "nationality": r.nationality,
+            "work_location": r.work_location,
+            "start_date": r.start_date,
+            "salary": r.salary,
+            "benefits": r.benefits,
+            "prior_notes": r.prior_notes,
+            "status": r.case_status,
+            "applicationCode": r.application_code,
+
+            # Candidate-facing signals
+            "candidate_decision": r.offer_decision,
+            "candidate_concerns": r.offer_concerns,
+            "salary_appeal": r.salary_appeal,
+
+            # HRIS outcome
+            "employeeId": r.employee_id,
+        }
+        for r in rows
+    ]
 
 
 @router.put("/cases/{case_id}")
@@ -172,6 +186,9 @@ def update_case(case_id: str, payload: dict, db: Session = Depends(get_db)):
                 setattr(c, field, payload[field])
 
         db.commit()
+        invalidate_case_codes(case_id)
+        case_stats.sync(case_id)
+        case_summary.refresh(case_id)
         return {"ok": True, "case_id": case_id}
     except HTTPException:
         raise
@@ -190,11 +207,21 @@ def delete_case(case_id: str, db: Session = Depends(get_db)):
         db.query(ApplicationCode).filter(
             ApplicationCode.case_id == case_id
         ).delete()
+        # Persisted state goes in the same transaction, whether or not the case is in memory,
+        # so the warm-up and stats rebuild can't bring it back.
+        db.query(CaseState).filter(CaseState.case_id == case_id).delete()
 
         db.delete(c)
         db.commit()
+        invalidate_case_codes(case_id)
 
+        seat_inventory.release(case_id)
+        device_inventory.release(case_id)
+        risk_sweeper.unschedule(case_id)
         case_store.delete_case(case_id)
+        # Cases never loaded into CaseStore are counted/summarised too.
+        case_stats.remove(case_id)
+        case_summary.remove(case_id)
 
         return {"ok": True, "deleted": case_id}
     except HTTPException:
@@ -213,13 +240,14 @@ def resume_case(case_id: str, db: Session = Depends(get_db)):
 
         c.status = "ONBOARDING_IN_PROGRESS"
         db.commit()
+        invalidate_case_codes(case_id)
 
         case_store.set_status(case_id, "ONBOARDING_IN_PROGRESS")
 
+        # Through CaseStore (not the dict it returns) so the change is versioned and persisted.
         wizard_data = case_store.get_case(case_id)
         if wizard_data and wizard_data.get("currentStepIndex", 0) == 1:
-            wizard_data["currentStepIndex"] = 2
-            wizard_data["status"] = "ONBOARDING_IN_PROGRESS"
+            case_store.set_current_step(case_id, 2)
 
         return {
             "ok": True,
@@ -237,17 +265,6 @@ def resume_case(case_id: str, db: Session = Depends(get_db)):
 # HR Admin - Employees View
 # -----------------------------------------------------------------------------
 
-CONFIRMED_STATUSES = {
-    "ONBOARDING_IN_PROGRESS",
-    "SUBMITTED",
-    "ONBOARDING_COMPLETE",
-    "READY_DAY1",
-    "HRIS_COMPLETED",
-    # keep AT_RISK here for safety if any older cases still have it stored as status
-    "AT_RISK",
-}
-
-
 def _get_assets_for_case(db: Session, case_id: str) -> Dict[str, Any]:
     """
     Assets source-of-truth:
@@ -266,9 +283,9 @@ def _get_assets_for_case(db: Session, case_id: str) -> Dict[str, Any]:
     else:
         seat_location = wa.seat_id
 
-    # Laptop asset tag/id (persisted in equipment JSON)
-    asset_id = None
-    if isinstance(wa.equipment, dict) and wa.equipment:
+    # Laptop asset tag/id (asset_id column; older rows may only have it in the equipment JSON)
+    asset_id = wa.asset_id
+    if asset_id is None and isinstance(wa.equipment, dict) and wa.equipment:
         asset_id = wa.equipment.get("assetId")
 
     return {
@@ -277,80 +294,91 @@ def _get_assets_for_case(db: Session, case_id: str) -> Dict[str, Any]:
     }
 
 
-def _get_steps_for_case(case_id: str) -> Dict[str, Any]:
-    """
-    Steps source-of-truth:
-    - case_store persisted JSON via CaseState (restart-safe)
-    """
-    wizard = case_store.get_case(case_id) or {}
-    steps = wizard.get("steps") or {}
-    return steps if isinstance(steps, dict) else {}
-
-
-def _is_confirmed_case(db_case: Optional[Case], wizard: Dict[str, Any]) -> bool:
-    db_status = (db_case.status if db_case else None) or ""
-    wiz_status = (wizard.get("status") or "") if isinstance(wizard, dict) else ""
-    status = wiz_status or db_status
-    return bool(status) and status in CONFIRMED_STATUSES
+def _employee_view(r: CaseSummary) -> Dict[str, Any]:
+    return {
+        "employee_id": r.employee_id,
+        "case_id": r.case_id,
+        "full_name": r.full_name,
+        "email": r.email,
+        "department": r.department,
+        "role": r.role,
+        "start_date": r.start_date,
+        "status": r.status,
+        "steps": r.steps or {},
+        "assets": {
+            "laptop": {"assigned": bool(r.device_model), "model": r.device_model, "asset_id": r.asset_id},
+            "seat": {"assigned": bool(r.seat_location), "location": r.seat_location},
+        },
+    }
 
 
 @router.get("/employees")
 def list_employees(db: Session = Depends(get_db)):
-    employees = db.query(EmployeeRecord).all()
-    out: List[Dict[str, Any]] = []
-
-    for emp in employees:
-        db_case = db.query(Case).filter(Case.id == emp.case_id).first()
-        wizard = case_store.get_case(emp.case_id) or {}
-
-        if not _is_confirmed_case(db_case, wizard):
-            continue
-
-        out.append({
-            "employee_id": emp.employee_id,
-            "case_id": emp.case_id,
-            "full_name": emp.full_name,
-            "email": emp.email,
-            "department": emp.department,
-            "role": (db_case.role if db_case else None),
-            "start_date": (db_case.start_date if db_case else None),
-            "status": (
-                wizard.get("status")
-                if isinstance(wizard, dict) and wizard.get("status")
-                else (db_case.status if db_case else "UNKNOWN")
-            ),
-            "steps": _get_steps_for_case(emp.case_id),
-            "assets": _get_assets_for_case(db, emp.case_id),
-        })
+    # confirmed = has an employee record and status in CONFIRMED_STATUSES (maintained by case_summary).
+    rows = (
+        db.query(CaseSummary)
+        .filter(CaseSummary.confirmed == True)  # noqa: E712
+        .order_by(CaseSummary.created_at, CaseSummary.case_id)
+        .all()
+    )
+    return [_employee_view(r) for r in rows]
 
-    return out
+
+HR_BATCH_MAX = int(os.getenv("HR_BATCH_MAX", "100"))
+
+
+@router.post("/employees/batch")
+def get_employees_batch(payload: dict, db: Session = Depends(get_db)):
+    """
+    Expected payload: {"employee_ids": ["EMP-...", ...]} (at most HR_BATCH_MAX).
+    Returns {"employees": {employee_id: <same shape as GET /employees/{id}>}, "missing": [...]}.
+    """
+    employee_ids = payload.get("employee_ids")
+    if not isinstance(employee_ids, list) or not all(isinstance(e, str) for e in employee_ids):
+        raise HTTPException(status_code=400, detail="employee_ids must be a list of strings")
+    employee_ids = list(dict.fromkeys(e for e in employee_ids if e))
+    if len(employee_ids) > HR_BATCH_MAX:
+        raise HTTPException(status_code=400, detail=f"At most {HR_BATCH_MAX} employee_ids per request")
+
+    rows = db.query(CaseSummary).filter(CaseSummary.employee_id.in_(employee_ids)).all() if employee_ids else []
+    found = {r.employee_id: _employee_view(r) for r in rows}
+    return {
+        "employees": {e: found[e] for e in employee_ids if e in found},
+        "missing": [e for e in employee_ids if e not in found],
+    }
 
 
 @router.get("/employees/{employee_id}")
 def get_employee_details(employee_id: str, db: Session = Depends(get_db)):
-    emp = db.query(EmployeeRecord).filter(EmployeeRecord.employee_id == employee_id).first()
-    if not emp:
+    r = db.query(CaseSummary).filter(CaseSummary.employee_id == employee_id).first()
+    if not r:
         raise HTTPException(status_code=404, detail="Employee not found")
+    return _employee_view(r)
 
-    db_case = db.query(Case).filter(Case.id == emp.case_id).first()
-    wizard = case_store.get_case(emp.case_id) or {}
 
-    return {
-        "employee_id": emp.employee_id,
-        "case_id": emp.case_id,
-        "full_name": emp.full_name,
-        "email": emp.email,
-        "department": emp.department,
-        "role": (db_case.role if db_case else None),
-        "start_date": (db_case.start_date if db_case else None),
-        "status": (
-            wizard.get("status")
-            if isinstance(wizard, dict) and wizard.get("status")
-            else (db_case.status if db_case else "UNKNOWN")
-        ),
-        "steps": _get_steps_for_case(emp.case_id),
-        "assets": _get_assets_for_case(db, emp.case_id),
-    }
+_ASSIGNMENT_COLUMNS = ("seat_id", "device_model", "equipment", "seating", "asset_id")
+
+
+def _restore_assignment(db: Session, case_id: str, previous: Optional[Dict[str, Any]]) -> None:
+    """Undo an already committed asset override whose seat claim was then rejected."""
+    wa = db.query(WorkplaceAssignment).filter(WorkplaceAssignment.case_id == case_id).first()
+    if wa is None:
+        return
+    if previous is None:
+        db.delete(wa)
+    else:
+        for col, value in previous.items():
+            setattr(wa, col, value)
+    try:
+        db.commit()
+    except IntegrityError:
+        # The old tag was claimed by another case in the meantime; it can't be given back.
+        db.rollback()
+        previous = {**previous, "asset_id": None}
+        wa = db.query(WorkplaceAssignment).filter(WorkplaceAssignment.case_id == case_id).first()
+        for col, value in previous.items():
+            setattr(wa, col, value)
+        db.commit()
 
 
 @router.put("/employees/{employee_id}/assets")
@@ -376,10 +404,28 @@ def update_employee_assets(employee_id: str, payload: dict, db: Session = Depend
     asset_id = laptop.get("asset_id")
     seat_location = seat.get("location")
 
+    # Asset tags are unique across assignments; check before any inventory side effects.
+    if asset_id:
+        holder = (
+            db.query(WorkplaceAssignment.case_id)
+            .filter(WorkplaceAssignment.asset_id == asset_id, WorkplaceAssignment.case_id != case_id)
+            .first()
+        )
+        if holder:
+            raise HTTPException(status_code=409, detail=f"Asset {asset_id} is already assigned to case {holder[0]}")
+
+    c = db.query(Case).filter(Case.id == case_id).first()
+    work_location = c.work_location if c else None
+    if seat_location:
+        # Store inventory seats under their canonical id; free text is kept as typed.
+        seat_location = seat_inventory.resolve_seat(seat_location, work_location) or seat_location
+
     wa = db.query(WorkplaceAssignment).filter(WorkplaceAssignment.case_id == case_id).first()
+    previous = {col: getattr(wa, col) for col in _ASSIGNMENT_COLUMNS} if wa else None
 
+    # Copies: the JSON columns aren't mutation-tracked, so reassigning the same dict is not a change.
     def _as_dict(v: Any) -> Dict[str, Any]:
-        return v if isinstance(v, dict) else {}
+        return dict(v) if isinstance(v, dict) else {}
 
     if not wa:
         equipment_payload = {"manual_override": True, "source": "HR_ADMIN"}
@@ -396,6 +442,7 @@ def update_employee_assets(employee_id: str, payload: dict, db: Session = Depend
             device_model=device_model,
             equipment=equipment_payload,
             seating=seating_payload,
+            asset_id=asset_id or None,
         )
         db.add(wa)
     else:
@@ -415,9 +462,32 @@ def update_employee_assets(employee_id: str, payload: dict, db: Session = Depend
         equipment_dict.update({"manual_override": True, "source": "HR_ADMIN"})
         if asset_id is not None:
             equipment_dict["assetId"] = asset_id
+            wa.asset_id = asset_id or None
         wa.equipment = equipment_dict
 
-    db.commit()
+    # The row under ux_workplace_assignments_asset is committed before either inventory moves,
+    # so losing a race for the same tag leaves seats and device stock untouched.
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=f"Asset {asset_id} is already assigned to another case")
+
+    # Keep the seat inventory in step with manual overrides (free-text seats just release the old one).
+    if seat_location:
+        try:
+            seat_inventory.assign_seat(case_id, seat_location, work_location)
+        except SeatConflict as e:
+            _restore_assignment(db, case_id, previous)
+            raise HTTPException(status_code=409, detail=str(e))
+
+    # Device stock: a model change moves the hold, an asset tag means the device was issued
+    # (clearing the tag with "" doesn't).
+    if device_model:
+        device_inventory.reserve(case_id, device_model, work_location)
+    if asset_id:
+        device_inventory.commit(case_id)
+    case_summary.refresh(case_id)
 
     return {
         "success": True,
@@ -426,6 +496,66 @@ def update_employee_assets(employee_id: str, payload: dict, db: Session = Depend
     }
 
 
+_ASSET_LOOKUP_CHUNK = 500  # stay well under SQLite's bound-parameter limit
+_ASSET_LOOKUP_MAX = 10_000
+
+
+def _asset_holders(db: Session, asset_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """asset id -> holder, via ux_workplace_assignments_asset (one IN query per chunk)."""
+    out: Dict[str, Dict[str, Any]] = {}
+    for start in range(0, len(asset_ids), _ASSET_LOOKUP_CHUNK):
+        chunk = asset_ids[start:start + _ASSET_LOOKUP_CHUNK]
+        rows = (
+            db.query(WorkplaceAssignment.asset_id, WorkplaceAssignment.device_model, CaseSummary)
+            .outerjoin(CaseSummary, CaseSummary.case_id == WorkplaceAssignment.case_id)
+            .filter(WorkplaceAssignment.asset_id.in_(chunk))
+            .all()
+        )
+        for asset_id, device_model, summary in rows:
+            out[asset_id] = {
+                "asset_id": asset_id,
+                "model": device_model,
+                "case_id": summary.case_id if summary else None,
+                "employee_id": summary.employee_id if summary else None,
+                "full_name": (summary.full_name or summary.candidate_name) if summary else None,
+                "work_location": summary.work_location if summary else None,
+                "seat": summary.seat_location if summary else None,
+                "status": summary.status if summary else None,
+            }
+    return out
+
+
+@router.get("/assets/{asset_id}")
+def get_asset_holder(asset_id: str, db: Session = Depends(get_db)):
+    """Reverse lookup: who holds this laptop asset tag."""
+    holder = _asset_holders(db, [asset_id]).get(asset_id)
+    if not holder:
+        raise HTTPException(status_code=404, detail="Asset not assigned")
+    return holder
+
+
+@router.post("/assets/lookup")
+def lookup_assets(payload: dict, db: Session = Depends(get_db)):
+    """
+    Bulk reverse lookup for asset audits.
+    Expected payload: {"asset_ids": ["LAP-0001", ...]}
+    """
+    asset_ids = payload.get("asset_ids")
+    if not isinstance(asset_ids, list) or not all(isinstance(a, str) for a in asset_ids):
+        raise HTTPException(status_code=400, detail="asset_ids must be a list of strings")
+    asset_ids = list(dict.fromkeys(a for a in asset_ids if a))
+    if len(asset_ids) > _ASSET_LOOKUP_MAX:
+        raise HTTPException(status_code=400, detail=f"At most {_ASSET_LOOKUP_MAX} asset_ids per request")
+
+    t0 = time.perf_counter()
+    holders = _asset_holders(db, asset_ids)
+    return {
+        "assigned": [holders[a] for a in asset_ids if a in holders],
+        "unassigned": [a for a in asset_ids if a not in holders],
+        "elapsedMs": round((time.perf_counter() - t0) * 1000, 2),
+    }
+
+
 @router.post("/cases/{case_id}/orchestrate")
 async def orchestrate_case(case_id: str, db: Session = Depends(get_db)):
     """
@@ -446,3 +576,153 @@ async def orchestrate_case(case_id: str, db: Session = Depends(get_db)):
         return result
 
     return {"ok": True, "plan": result}
+
+
+@router.get("/cases/{case_id}/start-date-options")
+def case_start_date_options(
+    case_id: str,
+    modes: Optional[str] = None,
+    horizon_days: int = HORIZON_DAYS,
+    business_days_only: bool = True,
+    db: Session = Depends(get_db),
+):
+    """What-if: earliest feasible start date per work mode (comma-separated `modes`), with its critical path."""
+    c = db.query(Case).filter(Case.id == case_id).first()
+    if not c:
+        raise HTTPException(status_code=404, detail="Case not found")
+    wanted = [m.strip().upper() for m in modes.split(",") if m.strip()] if modes else list(WORK_MODES)
+    unknown = [m for m in wanted if m not in WORK_MODES]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown work mode(s): {', '.join(unknown)}")
+    if horizon_days < 0 or horizon_days > 730:
+        raise HTTPException(status_code=400, detail="horizon_days must be between 0 and 730")
+
+    case = ensure_case_seeded(case_id)
+    t0 = time.perf_counter()
+    result = start_date_options(case, modes=wanted, horizon_days=horizon_days, business_days_only=business_days_only)
+    result["elapsedMs"] = round((time.perf_counter() - t0) * 1000, 3)
+    return result
+
+
+@router.get("/cases/{case_id}/tickets/schedule")
+def case_ticket_schedule(case_id: str, db: Session = Depends(get_db)):
+    """Critical-path schedule (earliest/latest dates, slack) for the case's IT tickets."""
+    c = db.query(Case).filter(Case.id == case_id).first()
+    if not c:
+        raise HTTPException(status_code=404, detail="Case not found")
+    case = ensure_case_seeded(case_id)
+    it_data = ((case.get("agentOutputs") or {}).get("it") or {}).get("data") or {}
+    tickets = it_data.get("tickets") or ticket_templates()
+    try:
+        schedule = schedule_tickets(tickets, (case.get("seed") or {}).get("startDate"))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"caseId": case_id, "fromTemplates": not it_data.get("tickets"), **schedule}
+
+
+@router.get("/it/capacity")
+def it_capacity(horizon_days: int = 30, capacity: int = IT_DAILY_TICKET_CAPACITY):
+    """IT tickets in progress per day across all open cases; days over `capacity` are bottlenecks."""
+    if horizon_days < 0 or horizon_days > 365:
+        raise HTTPException(status_code=400, detail="horizon_days must be between 0 and 365")
+    return capacity_report(horizon_days=horizon_days, capacity=capacity)
+
+
+@router.get("/inventory/devices")
+def device_stock(location: Optional[str] = None):
+    return device_inventory.stats(location)
+
+
+@router.post("/inventory/devices/replenish")
+def replenish_devices(payload: dict):
+    """
+    Bulk stock import.
+    Expected payload: {"items": [{"model": "...", "location": "AE", "quantity": 25}, ...]}
+    """
+    try:
+        result = device_inventory.replenish(payload.get("items") or [])
+    except (TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"ok": True, **result}
+
+
+@router.post("/cohorts/seating")
+async def seat_cohort(payload: dict, db: Session = Depends(get_db)):
+    """
+    Seat a whole start cohort in one pass (same location + ISO start week).
+    Expected payload: {"workLocation": "HQ", "startWeek": "2026-W47"}  (or "startDate": "2026-11-20")
+    Cases that already have a workplace assignment keep it; closed cases (completed, cancelled,
+    withdrawn) are skipped.
+    """
+    location = normalize_location(payload.get("workLocation"))
+    week = payload.get("startWeek") or cohort_week(payload.get("startDate"))
+    if not week:
+        raise HTTPException(status_code=400, detail="startWeek or startDate is required")
+    week_range = cohort_week_range(week)
+    if week_range is None:
+        raise HTTPException(status_code=400, detail=f"Invalid startWeek: {week!r}")
+
+    rows = (
+        db.query(Case)
+        .filter(
+            func.upper(func.trim(func.coalesce(Case.work_location, "HQ"))) == location,
+            func.substr(Case.start_date, 1, 10).between(*week_range),
+            func.coalesce(Case.status, "").notin_(TERMINAL_STATUSES),
+        )
+        .all()
+    )
+    cases = []
+    for c in rows:
+        live = case_store.get_case(c.id)
+        if live is not None and live.get("status") in TERMINAL_STATUSES:
+            continue  # the wizard state can be ahead of the HR row
+        cases.append(
+            live
+            or {
+                "caseId": c.id,
+                "seed": {
+                    "candidateName": c.candidate_name,
+                    "role": c.role,
+                    "workLocation": c.work_location,
+                    "startDate": c.start_date,
+                },
+            }
+        )
+
+    t0 = time.perf_counter()
+    results = await workplace_agent.run_batch(cases, notes="hr_cohort_seating")
+    elapsed_ms = (time.perf_counter() - t0) * 1000
+    case_summary.refresh_many([c["caseId"] for c in cases])
+
+    zones: Dict[str, int] = {}
+    unassigned: List[str] = []
+    for case, res in zip(cases, results):
+        seating = (res.data or {}).get("seating") or {}
+        if seating.get("seatId") and seating.get("floor") is not None:
+            zone_key = f"{seating['floor']}{seating['zone']}"
+            zones[zone_key] = zones.get(zone_key, 0) + 1
+        elif not seating.get("seatId"):
+            unassigned.append(case["caseId"])
+
+    return {
+        "ok": True,
+        "cohort": {"workLocation": location, "startWeek": week},
+        "cases": len(cases),
+        "unassigned": unassigned,
+        "zones": dict(sorted(zones.items())),
+        "elapsedMs": round(elapsed_ms, 2),
+    }
+
+
+@router.post("/risk/forecast")
+def forecast_risk(dry_run: bool = False):
+    """Re-evaluate Day-1 risk for all active cases; only cases whose riskStatus flips are written."""
+    result = run_forecast(dry_run=dry_run)
+    if result["toGreen"]:
+        risk_sweeper.rebuild()  # cases back to GREEN need a new crossing day
+    return result
+
+
+@router.get("/risk/sweeper")
+def risk_sweeper_stats():
+    return risk_sweeper.stats()
@@ -1,12 +1,60 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+import copy
+import os
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence
 
 from fastapi import HTTPException
+from sqlalchemy import select
 
-from app.db.database import SessionLocal
-from app.db.models import ApplicationCode, Case as DbCase
+from app.db.database import SessionLocal, engine
+from app.db.models import ApplicationCode, Case as DbCase, CaseState
 from app.store.case_store import case_store
+from app.store.ttl_cache import MISSING, TTLCache
+
+APP_CODE_CACHE_SIZE = int(os.getenv("APP_CODE_CACHE_SIZE", "10000"))
+APP_CODE_CACHE_TTL_S = float(os.getenv("APP_CODE_CACHE_TTL_S", "300"))
+APP_CODE_NEGATIVE_TTL_S = float(os.getenv("APP_CODE_NEGATIVE_TTL_S", "30"))
+CASE_NEGATIVE_TTL_S = float(os.getenv("CASE_NEGATIVE_TTL_S", "10"))
+
+_IN_CHUNK = 500  # stay well under SQLite's bound-parameter limit
+
+
+@dataclass(frozen=True)
+class CodeEntry:
+    """What /api/case/init needs from the DB for an active application code."""
+    case_id: str
+    seed: Dict[str, Any]
+    status: Optional[str]
+
+
+# Separate maps so a flood of invalid codes can only evict other invalid codes.
+_codes: TTLCache[str, CodeEntry] = TTLCache(APP_CODE_CACHE_SIZE, APP_CODE_CACHE_TTL_S)
+_invalid_codes: TTLCache[str, bool] = TTLCache(APP_CODE_CACHE_SIZE, APP_CODE_NEGATIVE_TTL_S)
+# Case ids with neither a case_states row nor a cases row.
+_missing_cases: TTLCache[str, bool] = TTLCache(APP_CODE_CACHE_SIZE, CASE_NEGATIVE_TTL_S)
+
+# Single-flight: one loader per case id; [lock, waiters] entries are dropped when the last waiter leaves.
+_loads: Dict[str, List[Any]] = {}
+_loads_guard = threading.Lock()
+
+
+@contextmanager
+def _single_flight(case_id: str) -> Iterator[None]:
+    with _loads_guard:
+        entry = _loads.setdefault(case_id, [threading.Lock(), 0])
+        entry[1] += 1
+    try:
+        with entry[0]:
+            yield
+    finally:
+        with _loads_guard:
+            entry[1] -= 1
+            if entry[1] == 0:
+                _loads.pop(case_id, None)
 
 
 def _build_seed(db_case: DbCase) -> Dict[str, Any]:
@@ -28,23 +76,37 @@ def ensure_case_seeded(case_id: str) -> Dict[str, Any]:
     1) If in-memory exists -> return.
     2) If persisted case_state exists -> load into memory -> return.
     3) Else seed from DB Case + ApplicationCode -> init case_store.
+
+    Concurrent misses for the same case share one load (the others wait, then find it in
+    memory); ids that exist nowhere are remembered for CASE_NEGATIVE_TTL_S and 404 without a query.
     """
     existing = case_store.get_case(case_id)
     if existing:
         return existing
+    if _missing_cases.get(case_id) is not MISSING:
+        raise HTTPException(status_code=404, detail="Case not found")
+
+    with _single_flight(case_id):
+        existing = case_store.get_case(case_id)
+        if existing:
+            return existing
+        return _load_case(case_id)
+
 
+def _load_case(case_id: str) -> Dict[str, Any]:
     # 1) Try persisted runtime snapshot
     persisted = case_store.load_persisted_case(case_id)
     if persisted:
-        loaded = case_store.set_case_direct(case_id, persisted)
-        # no emit; we don't want to spam UI on seed
-        return loaded
+        # no emit; we don't want to spam UI on seed. The startup warm-up may have won the race.
+        case_store.load_if_absent(case_id, persisted)
+        return case_store.get_case(case_id)
 
     # 2) Fallback to DB seed
     db = SessionLocal()
     try:
         db_case = db.query(DbCase).filter(DbCase.id == case_id).first()
         if not db_case:
+            _missing_cases.set(case_id, True)
             raise HTTPException(status_code=404, detail="Case not found")
 
         active_code = (
@@ -52,18 +114,124 @@ def ensure_case_seeded(case_id: str) -> Dict[str, Any]:
             .filter(ApplicationCode.case_id == case_id, ApplicationCode.active == True)  # noqa: E712
             .first()
         )
+        return _seed_from_db(db_case, active_code.code if active_code else None)
+    finally:
+        db.close()
 
-        application_number = active_code.code if active_code else f"CASEID-{case_id}"
 
-        seeded = case_store.init_or_get_case(
-            application_number=application_number,
-            seed=_build_seed(db_case),
-            case_id=db_case.id,
-        )
+def _seed_from_db(db_case: DbCase, code: Optional[str]) -> Dict[str, Any]:
+    seeded = case_store.init_or_get_case(
+        application_number=code or f"CASEID-{db_case.id}",
+        seed=_build_seed(db_case),
+        case_id=db_case.id,
+    )
+
+    if getattr(db_case, "status", None):
+        case_store.set_status(db_case.id, db_case.status)
+
+    return seeded
+
+
+def ensure_cases_seeded(case_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Batch ensure_case_seeded: in-memory cases are returned as is, the rest are loaded with one
+    IN query per chunk against case_states and, for ids with no persisted state, one against
+    cases (+ active codes). Unknown ids are left out of the result (and negatively cached).
+    """
+    out: Dict[str, Dict[str, Any]] = {}
+    todo: List[str] = []
+    for case_id in dict.fromkeys(case_ids):
+        c = case_store.get_case(case_id)
+        if c:
+            out[case_id] = c
+        elif _missing_cases.get(case_id) is MISSING:
+            todo.append(case_id)
+    if not todo:
+        return out
+
+    # 1) Persisted runtime snapshots
+    for start in range(0, len(todo), _IN_CHUNK):
+        chunk = todo[start:start + _IN_CHUNK]
+        with engine.connect() as conn:
+            rows = conn.execute(
+                select(CaseState.case_id, CaseState.state).where(CaseState.case_id.in_(chunk))
+            ).fetchall()
+        for case_id, state in rows:
+            if state:
+                case_store.load_if_absent(case_id, state)
+                out[case_id] = case_store.get_case(case_id)
+
+    # 2) DB seed for the rest
+    rest = [cid for cid in todo if cid not in out]
+    if rest:
+        db = SessionLocal()
+        try:
+            for start in range(0, len(rest), _IN_CHUNK):
+                chunk = rest[start:start + _IN_CHUNK]
+                codes = dict(
+                    db.query(ApplicationCode.case_id, ApplicationCode.code)
+                    .filter(ApplicationCode.case_id.in_(chunk), ApplicationCode.active == True)  # noqa: E712
+                    .all()
+                )
+                for db_case in db.query(DbCase).filter(DbCase.id.in_(chunk)).all():
+                    with _single_flight(db_case.id):
+                        out[db_case.id] = case_store.get_case(db_case.id) or _seed_from_db(db_case, codes.get(db_case.id))
+        finally:
+            db.close()
+
+    for case_id in todo:
+        if case_id not in out:
+            _missing_cases.set(case_id, True)
+    return out
+
 
-        if getattr(db_case, "status", None):
-            case_store.set_status(db_case.id, db_case.status)
+def forget_missing_case(case_id: str) -> None:
+    """Call after creating a case so a recent 404 for its id isn't served from the negative cache."""
+    _missing_cases.pop(case_id)
 
-        return seeded
+
+def resolve_application_code(code: str) -> Optional[CodeEntry]:
+    """
+    Active application code -> case id, seed and HR status, read through a TTL cache.
+    Returns None for unknown/inactive codes (remembered for APP_CODE_NEGATIVE_TTL_S) and
+    raises 404 if the code points at a case that no longer exists.
+    """
+    entry = _codes.get(code)
+    if entry is not MISSING:
+        return entry
+    if _invalid_codes.get(code) is not MISSING:
+        return None
+
+    db = SessionLocal()
+    try:
+        db_case = (
+            db.query(DbCase)
+            .join(ApplicationCode, ApplicationCode.case_id == DbCase.id)
+            .filter(ApplicationCode.code == code, ApplicationCode.active == True)  # noqa: E712
+            .first()
+        )
+        if not db_case:
+            if not db.query(ApplicationCode.code).filter(
+                ApplicationCode.code == code, ApplicationCode.active == True  # noqa: E712
+            ).first():
+                _invalid_codes.set(code, True)
+                return None
+            raise HTTPException(status_code=404, detail="Case not found")
+        entry = CodeEntry(case_id=db_case.id, seed=_build_seed(db_case), status=db_case.status)
     finally:
         db.close()
+    _codes.set(code, entry)
+    return entry
+
+
+def seed_for(entry: CodeEntry) -> Dict[str, Any]:
+    # case_store keeps the seed dict it is given; hand it a copy, never the cached one.
+    return copy.deepcopy(entry.seed)
+
+
+def invalidate_case_codes(case_id: str, code: Optional[str] = None) -> None:
+    """Call after any write to a case's row, status or codes; `code` also clears a cached miss."""
+    _codes.pop_where(lambda _, e: e.case_id == case_id)
+    if code:
+        _invalid_codes.pop(code)
+
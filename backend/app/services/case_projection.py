@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+MAX_FIELDS = 32
+MAX_DEPTH = 6
+
+Path = Tuple[str, ...]
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[Path]]:
+    """
+    "status,steps.offer,agentOutputs.it.data" -> [("status",), ("steps", "offer"), ...].
+    None/empty means no projection. Raises ValueError on malformed input.
+    """
+    if fields is None or not fields.strip():
+        return None
+    paths: List[Path] = []
+    for raw in fields.split(","):
+        raw = raw.strip()
+        if not raw:
+            continue
+        parts = tuple(raw.split("."))
+        if any(not p for p in parts):
+            raise ValueError(f"Invalid field path: {raw!r}")
+        if len(parts) > MAX_DEPTH:
+            raise ValueError(f"Field path too deep (max {MAX_DEPTH}): {raw!r}")
+        paths.append(parts)
+    if len(paths) > MAX_FIELDS:
+        raise ValueError(f"At most {MAX_FIELDS} fields")
+    return paths or None
+
+
+def project(doc: Mapping[str, Any], paths: Sequence[Path]) -> Dict[str, Any]:
+    """
+    Copy of `doc` with only the given dotted paths, nested as in the original. Paths that
+    don't exist are left out; a path inside one already selected adds nothing. Leaf values
+    are shared with `doc`, not copied.
+    """
+    out: Dict[str, Any] = {}
+    selected = set()
+    for path in sorted(set(paths), key=len):
+        if any(path[:i] in selected for i in range(1, len(path))):
+            continue
+        node: Any = doc
+        for key in path:
+            if not isinstance(node, Mapping) or key not in node:
+                break
+            node = node[key]
+        else:
+            selected.add(path)
+            # Shorter paths went first, so every intermediate dict here is one of ours.
+            target = out
+            for key in path[:-1]:
+                target = target.setdefault(key, {})
+            target[path[-1]] = node
+    return out
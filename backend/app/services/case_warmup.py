@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+
+from app.db.database import engine
+from app.services.risk_forecast import TERMINAL_STATUSES
+from app.store.case_store import case_store
+
+logger = logging.getLogger(__name__)
+
+CASE_WARMUP_ENABLED = os.getenv("CASE_WARMUP_ENABLED", "1") == "1"
+CASE_WARMUP_BATCH_SIZE = int(os.getenv("CASE_WARMUP_BATCH_SIZE", "500"))
+CASE_WARMUP_RATE = float(os.getenv("CASE_WARMUP_RATE", "5000"))  # cases/s; 0 = unthrottled
+
+# Only states whose case still exists: rows orphaned by a delete must not be resurrected.
+_OPEN = (
+    f"COALESCE(json_extract(state, '$.status'), '') NOT IN ({', '.join(repr(s) for s in sorted(TERMINAL_STATUSES))})"
+    " AND case_id IN (SELECT id FROM cases)"
+)
+_COUNT_SQL = f"SELECT count(*) FROM case_states WHERE {_OPEN}"
+# Keyset pages rather than one long cursor: each batch is its own short read, so the warm-up
+# never holds SQLite's shared lock across its throttling sleeps and writers aren't blocked.
+_PAGE_SQL = f"SELECT rowid, case_id, state FROM case_states WHERE rowid > :last AND {_OPEN} ORDER BY rowid LIMIT :n"
+
+
+class CaseWarmup:
+    """
+    Loads the persisted state of every non-terminal case into case_store after a restart, in
+    the background: the app serves requests immediately (cases not loaded yet still load on
+    demand through ensure_case_seeded) and the in-memory store is warm a few seconds later.
+    Cases a request already loaded are left alone.
+    """
+
+    def __init__(self) -> None:
+        self._task: Optional[asyncio.Task] = None
+        self.state = "idle"
+        self.total = 0
+        self.loaded = 0
+        self.skipped = 0
+        self.started_at: Optional[str] = None
+        self.elapsed_ms: Optional[float] = None
+        self._t0: Optional[float] = None
+        self.error: Optional[str] = None
+
+    def run(self, batch_size: int = CASE_WARMUP_BATCH_SIZE, rate: float = CASE_WARMUP_RATE) -> Dict[str, Any]:
+        """Blocking warm-up; the background task runs this in a worker thread."""
+        self._t0 = t0 = time.perf_counter()
+        self.state, self.loaded, self.skipped, self.error = "running", 0, 0, None
+        self.started_at = datetime.utcnow().isoformat(timespec="seconds")
+        try:
+            with engine.connect() as conn:
+                self.total = conn.execute(text(_COUNT_SQL)).scalar() or 0
+            last = 0
+            while True:
+                batch_t0 = time.perf_counter()
+                with engine.connect() as conn:
+                    rows = conn.execute(text(_PAGE_SQL), {"last": last, "n": batch_size}).fetchall()
+                if not rows:
+                    break
+                last = rows[-1][0]
+                for _, case_id, state in rows:
+                    payload = json.loads(state) if isinstance(state, str) else state
+                    if isinstance(payload, dict) and case_store.load_if_absent(case_id, payload):
+                        self.loaded += 1
+                    else:
+                        self.skipped += 1
+                if rate > 0:
+                    time.sleep(max(0.0, len(rows) / rate - (time.perf_counter() - batch_t0)))
+            self.state = "done"
+        except Exception as e:
+            self.state, self.error = "failed", str(e)
+            logger.exception("Case warm-up failed")
+        self.elapsed_ms = round((time.perf_counter() - t0) * 1000, 2)
+        if self.state == "done":
+            logger.info("Case warm-up: %d case(s) loaded in %.0f ms", self.loaded, self.elapsed_ms)
+        return self.stats()
+
+    # ---------- background task ----------
+    def start(self) -> None:
+        if self._task is not None:
+            return
+        self.state = "pending"
+        self._task = asyncio.get_running_loop().create_task(asyncio.to_thread(self.run))
+
+    async def stop(self) -> None:
+        # The worker thread can't be interrupted; it's bounded by the number of open cases.
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        done = self.loaded + self.skipped
+        elapsed = self.elapsed_ms
+        if self.state == "running" and self._t0 is not None:
+            elapsed = round((time.perf_counter() - self._t0) * 1000, 2)
+        return {
+            "state": self.state,
+            "total": self.total,
+            "loaded": self.loaded,
+            "skipped": self.skipped,
+            "progress": round(min(1.0, done / self.total), 4) if self.total else (1.0 if self.state == "done" else 0.0),
+            "startedAt": self.started_at,
+            "elapsedMs": elapsed,
+            "error": self.error,
+        }
+
+
+case_warmup = CaseWarmup()
@@ -11,6 +11,9 @@ from app.agents.logistics_agent import LogisticsAgent
 from app.agents.workplace_agent import WorkplaceServicesAgent
 from app.db.database import SessionLocal
 from app.db.models import Case as DbCase
+from app.services.case_bridge import invalidate_case_codes
+from app.services.risk_sweeper import risk_sweeper
+from app.services.start_date_optimizer import start_date_options
 from app.store.case_store import case_store
 
 compliance_agent = ComplianceAgent()
@@ -120,6 +123,7 @@ def _persist_status(case_id: str, new_status: str) -> None:
             db.commit()
     finally:
         db.close()
+    invalidate_case_codes(case_id)
 
     case_store.set_status(case_id, new_status)
 
@@ -170,11 +174,16 @@ def _decision_for_conflicts(case: Dict[str, Any], conflicts: list[dict], complia
         impact = "Day-1 is at risk due to device delivery after start date."
         rationale = "Device availability is required for day-1 productivity."
 
+    # What-if: earliest feasible start per work mode, so DELAY/REMOTE options come with a date.
+    what_if = start_date_options(case)
+
     return {
         "primaryRecommendation": primary,
         "options": options,
         "impact": impact,
         "rationale": rationale,
+        "suggestedStartDate": what_if["suggestedStartDate"],
+        "startDateOptions": what_if["options"],
     }
 
 
@@ -327,6 +336,8 @@ async def run_orchestrator_for_case(case_id: str, notes: str = "") -> Dict[str,
         case_store.set_risk_status(case_id, "AT_RISK")
     else:
         case_store.set_risk_status(case_id, "GREEN")
+    # GREEN cases get a wake-up for the day their visa/device slack runs out.
+    risk_sweeper.schedule(case_id)
 
     return {
         "ok": True,
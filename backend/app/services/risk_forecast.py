@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import text
+
+from app.db.database import engine
+from app.store.case_stats import case_stats
+from app.store.case_summary import case_summary
+from app.store.case_store import case_store
+
+GREEN = "GREEN"
+AT_RISK = "AT_RISK"
+
+# Lifecycle states that no longer need a Day-1 forecast.
+TERMINAL_STATUSES = frozenset({"ONBOARDING_COMPLETE", "CANCELLED", "WITHDRAWN"})
+
+NO_IT = -1  # it_delivery / ticket_days sentinel: IT agent has not produced that output yet
+
+# Same inputs detect_conflicts() reads, pulled straight out of the persisted case JSON.
+# Only cases the orchestrator has evaluated (compliance/logistics present) carry a meaningful riskStatus.
+_LOAD_SQL = f"""
+SELECT case_id,
+       json_extract(state, '$.seed.startDate'),
+       json_extract(state, '$.agentOutputs.compliance.data.visaTimelineWeeks'),
+       json_extract(state, '$.agentOutputs.logistics.data.deliveryDays'),
+       json_extract(state, '$.agentOutputs.it.data.deviceRequest.deliveryDays'),
+       json_extract(state, '$.riskStatus'),
+       json_extract(state, '$.agentOutputs.it.data.tickets')
+FROM case_states
+WHERE COALESCE(json_extract(state, '$.status'), '') NOT IN ({', '.join(repr(s) for s in sorted(TERMINAL_STATUSES))})
+  AND (json_type(state, '$.agentOutputs.compliance') IS NOT NULL
+       OR json_type(state, '$.agentOutputs.logistics') IS NOT NULL)
+"""
+
+
+@dataclass
+class RiskInputs:
+    """Column-oriented forecast inputs; index i is case_ids[i]."""
+    case_ids: List[str]
+    start: np.ndarray  # datetime64[D], NaT when the start date can't be parsed
+    visa_days: np.ndarray  # int32
+    delivery_days: np.ndarray  # int32
+    it_delivery_days: np.ndarray  # int32, NO_IT when absent
+    at_risk_now: np.ndarray  # bool, current riskStatus
+    ticket_days: np.ndarray  # int32, IT ticket critical path (makespan); NO_IT when absent
+
+
+def _parse_start_dates(raw: Sequence[Optional[str]]) -> np.ndarray:
+    cleaned = [(s or "")[:10].replace("/", "-") or "NaT" for s in raw]
+    try:
+        return np.array(cleaned, dtype="datetime64[D]")
+    except ValueError:
+        # Rare malformed values: fall back to element-wise parsing with NaT for failures.
+        out = np.empty(len(cleaned), dtype="datetime64[D]")
+        for i, s in enumerate(cleaned):
+            try:
+                out[i] = np.datetime64(s, "D")
+            except ValueError:
+                out[i] = np.datetime64("NaT")
+        return out
+
+
+def _ticket_days(raw: Sequence[Any]) -> np.ndarray:
+    # Local import: ticket_scheduler imports TERMINAL_STATUSES from this module.
+    from app.services.ticket_scheduler import critical_path_days
+
+    # Cases share a handful of ticket sets; each distinct JSON text is compiled once.
+    makespans: Dict[Any, int] = {}
+    out = np.full(len(raw), NO_IT, dtype=np.int32)
+    for i, tickets in enumerate(raw):
+        if not tickets:
+            continue
+        if tickets not in makespans:
+            try:
+                parsed = json.loads(tickets) if isinstance(tickets, str) else tickets
+                makespans[tickets] = critical_path_days(parsed)[0] if parsed else NO_IT
+            except ValueError:
+                makespans[tickets] = NO_IT  # unusable set: the IT agent can't schedule it either
+        out[i] = makespans[tickets]
+    return out
+
+
+def build_inputs(rows: Sequence[Tuple[Any, ...]]) -> RiskInputs:
+    """rows: (case_id, startDate, visaWeeks, deliveryDays, itDeliveryDays, riskStatus, itTicketsJson)."""
+    case_ids = [r[0] for r in rows]
+    start = _parse_start_dates([r[1] for r in rows])
+    visa = np.fromiter(((r[2] or 0) for r in rows), dtype=np.int32, count=len(rows)) * 7
+    delivery = np.fromiter(((r[3] or 0) for r in rows), dtype=np.int32, count=len(rows))
+    it_delivery = np.fromiter((NO_IT if r[4] is None else r[4] for r in rows), dtype=np.int32, count=len(rows))
+    at_risk_now = np.fromiter((r[5] == AT_RISK for r in rows), dtype=bool, count=len(rows))
+    ticket_days = _ticket_days([r[6] for r in rows])
+    return RiskInputs(case_ids, start, visa, delivery, it_delivery, at_risk_now, ticket_days)
+
+
+def compute_slack(inputs: RiskInputs, today: date) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vectorised form of the date checks in detect_conflicts() and the IT SLA rules:
+      visa_days > days            -> VISA_BEFORE_START_RISK
+      delivery > days             -> DEVICE_AFTER_START_RISK
+      it_delivery >= max(0, days-1) -> DEVICE_TIGHT_SLA / DEVICE_AFTER_START (IT)
+      ticket makespan > days        -> TICKETS_AFTER_START (IT)
+    Each rule is rewritten as "slack < 0" so a case is at risk when min(slack) < 0.
+    Returns (days_to_start, slack, valid) where valid masks out unparseable start dates.
+    """
+    valid = ~np.isnat(inputs.start)
+    days = (inputs.start - np.datetime64(today, "D")).astype("timedelta64[D]")
+    days = np.where(valid, days.astype(np.int64, copy=False), 0)
+
+    slack = np.minimum(days - inputs.visa_days, days - inputs.delivery_days)
+    # it_delivery >= max(0, days - 1)  <=>  days - 2 - it_delivery < 0 (for it_delivery >= 0)
+    it_slack = np.where(inputs.it_delivery_days == NO_IT, np.iinfo(np.int64).max, days - 2 - inputs.it_delivery_days)
+    slack = np.minimum(slack, it_slack)
+    # schedule_tickets is feasible while makespan <= days
+    ticket_slack = np.where(inputs.ticket_days == NO_IT, np.iinfo(np.int64).max, days - inputs.ticket_days)
+    slack = np.minimum(slack, ticket_slack)
+    return days, slack, valid
+
+
+def forecast(inputs: RiskInputs, today: date) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns (at_risk, changed) boolean arrays for the whole population."""
+    _, slack, valid = compute_slack(inputs, today)
+    at_risk = np.where(valid, slack < 0, inputs.at_risk_now)
+    return at_risk, at_risk != inputs.at_risk_now
+
+
+def first_at_risk_dates(inputs: RiskInputs, today: date) -> np.ndarray:
+    """
+    Day each case's slack first goes negative (datetime64[D]); NaT for unparseable start dates.
+    Slack only shrinks as the calendar moves, so this is the single future GREEN -> AT_RISK crossing.
+    Already-negative slack maps to `today`.
+    """
+    _, slack, valid = compute_slack(inputs, today)
+    offset = np.clip(slack + 1, 0, None).astype("timedelta64[D]")
+    return np.where(valid, np.datetime64(today, "D") + offset, np.datetime64("NaT"))
+
+
+def load_inputs(case_ids: Optional[Sequence[str]] = None) -> RiskInputs:
+    """All active orchestrated cases, or just `case_ids` (chunked IN lists)."""
+    with engine.connect() as conn:
+        if case_ids is None:
+            rows = conn.execute(text(_LOAD_SQL)).fetchall()
+        else:
+            rows = []
+            ids = list(case_ids)
+            for start in range(0, len(ids), 500):
+                params = {f"c{i}": cid for i, cid in enumerate(ids[start:start + 500])}
+                in_list = ", ".join(":" + k for k in params)
+                rows.extend(conn.execute(text(f"{_LOAD_SQL} AND case_id IN ({in_list})"), params).fetchall())
+    return build_inputs(rows)
+
+
+def write_back(changes: List[Tuple[str, str]]) -> None:
+    # In-memory cases go through CaseStore (event + persist); the rest are patched in place.
+    cold: List[Dict[str, str]] = []
+    for case_id, risk_status in changes:
+        if case_id in case_store.cases:
+            case_store.set_risk_status(case_id, risk_status)
+        else:
+            cold.append({"cid": case_id, "rs": risk_status})
+    if cold:
+        now = time.strftime("%Y-%m-%dT%H:%M:%S")  # CaseStore's updatedAt format
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    "UPDATE case_states SET state = json_set(state, '$.riskStatus', :rs, '$.updatedAt', :now), "
+                    "updated_at = :ts WHERE case_id = :cid"
+                ),
+                [{**c, "now": now, "ts": datetime.utcnow()} for c in cold],
+            )
+        case_stats.update_many([(c["cid"], {"risk_status": c["rs"]}) for c in cold])
+        case_summary.refresh_many([c["cid"] for c in cold])
+
+
+def run_forecast(today: Optional[date] = None, dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Re-evaluate riskStatus for every active, orchestrated case and write back only the
+    cases whose status flipped.
+    """
+    today = today or datetime.utcnow().date()
+
+    t0 = time.perf_counter()
+    inputs = load_inputs()
+    t1 = time.perf_counter()
+    at_risk, changed = forecast(inputs, today)
+    idx = np.flatnonzero(changed)
+    changes = [(inputs.case_ids[i], AT_RISK if at_risk[i] else GREEN) for i in idx.tolist()]
+    t2 = time.perf_counter()
+    if not dry_run:
+        write_back(changes)
+    t3 = time.perf_counter()
+
+    to_risk = sum(1 for _, rs in changes if rs == AT_RISK)
+    return {
+        "today": today.isoformat(),
+        "evaluated": len(inputs.case_ids),
+        "atRisk": int(at_risk.sum()),
+        "changed": len(changes),
+        "toAtRisk": to_risk,
+        "toGreen": len(changes) - to_risk,
+        "dryRun": dry_run,
+        "timingsMs": {
+            "load": round((t1 - t0) * 1000, 2),
+            "compute": round((t2 - t1) * 1000, 2),
+            "write": round((t3 - t2) * 1000, 2),
+        },
+    }
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import logging
+import os
+import threading
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.risk_forecast import AT_RISK, GREEN, first_at_risk_dates, forecast, load_inputs, write_back
+
+logger = logging.getLogger(__name__)
+
+RISK_SWEEPER_ENABLED = os.getenv("RISK_SWEEPER_ENABLED", "1") == "1"
+MAX_SLEEP_SECONDS = float(os.getenv("RISK_SWEEPER_MAX_SLEEP_SECONDS", "3600"))
+RETRY_SECONDS = float(os.getenv("RISK_SWEEPER_RETRY_SECONDS", "60"))
+
+
+class RiskSweeper:
+    """
+    Min-heap of (first AT_RISK day, case_id) for GREEN cases.
+
+    Slack only shrinks as days pass, so a GREEN case crosses into AT_RISK exactly once
+    unless its inputs change. The sweeper sleeps until the earliest crossing day, pops
+    only the due cases, re-checks them against current state and writes the flips, so
+    daily work is proportional to transitions, not to the number of cases.
+
+    Rescheduling is lazy: `_due` holds each case's current crossing day and heap entries
+    that no longer match it are discarded when popped.
+    """
+
+    def __init__(self) -> None:
+        self._heap: List[Tuple[date, str]] = []
+        self._due: Dict[str, date] = {}
+        self._lock = threading.Lock()
+        self._wake: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self.last_sweep: Optional[str] = None
+        self.transitions = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+        self.last_error_at: Optional[str] = None
+
+    # ---------- scheduling ----------
+    def _push_many(self, case_ids: List[str], due: np.ndarray, at_risk: np.ndarray) -> None:
+        with self._lock:
+            for case_id, d, risky in zip(case_ids, due.tolist(), at_risk.tolist()):
+                if risky or d is None:
+                    # AT_RISK (or undated) cases have no clock-driven transition left.
+                    self._due.pop(case_id, None)
+                    continue
+                self._due[case_id] = d
+                heapq.heappush(self._heap, (d, case_id))
+
+    def rebuild(self, today: Optional[date] = None) -> int:
+        today = today or datetime.utcnow().date()
+        inputs = load_inputs()
+        at_risk, _ = forecast(inputs, today)
+        due = first_at_risk_dates(inputs, today)
+        with self._lock:
+            self._heap, self._due = [], {}
+        self._push_many(inputs.case_ids, due, at_risk)
+        self._notify()
+        return len(self._due)
+
+    def schedule(self, case_id: str, today: Optional[date] = None) -> None:
+        """(Re)compute one case's crossing day, e.g. after the orchestrator changed its inputs."""
+        today = today or datetime.utcnow().date()
+        inputs = load_inputs([case_id])
+        if not inputs.case_ids:
+            self.unschedule(case_id)
+            return
+        # The orchestrator just wrote riskStatus, so the stored value is the current state.
+        self._push_many(inputs.case_ids, first_at_risk_dates(inputs, today), inputs.at_risk_now)
+        self._notify()
+
+    def unschedule(self, case_id: str) -> None:
+        with self._lock:
+            self._due.pop(case_id, None)
+
+    def next_due(self) -> Optional[date]:
+        with self._lock:
+            while self._heap and self._due.get(self._heap[0][1]) != self._heap[0][0]:
+                heapq.heappop(self._heap)
+            return self._heap[0][0] if self._heap else None
+
+    # ---------- sweeping ----------
+    def sweep(self, today: Optional[date] = None) -> int:
+        """Flip every case whose crossing day has arrived. Returns the number of riskStatus changes."""
+        today = today or datetime.utcnow().date()
+        popped: List[str] = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= today:
+                d, case_id = heapq.heappop(self._heap)
+                if self._due.get(case_id) == d:
+                    del self._due[case_id]
+                    popped.append(case_id)
+        if not popped:
+            return 0
+
+        # Re-check against current state: inputs may have changed since scheduling.
+        inputs = load_inputs(popped)
+        at_risk, changed = forecast(inputs, today)
+        changes = [(inputs.case_ids[i], AT_RISK if at_risk[i] else GREEN) for i in np.flatnonzero(changed).tolist()]
+        write_back(changes)
+        self._push_many(inputs.case_ids, first_at_risk_dates(inputs, today), at_risk)
+
+        self.transitions += len(changes)
+        self.last_sweep = datetime.utcnow().isoformat(timespec="seconds")
+        if changes:
+            logger.info("Risk sweep %s: %d case(s) crossed into AT_RISK", today.isoformat(), len(changes))
+        return len(changes)
+
+    # ---------- background task ----------
+    def _notify(self) -> None:
+        if self._loop is not None and self._wake is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    def _seconds_until(self, due: Optional[date]) -> float:
+        if due is None:
+            return MAX_SLEEP_SECONDS
+        wake_at = datetime.combine(due, datetime.min.time())
+        return max(0.0, min(MAX_SLEEP_SECONDS, (wake_at - datetime.utcnow()).total_seconds()))
+
+    async def _run(self) -> None:
+        built = False
+        while True:
+            try:
+                if not built:
+                    await asyncio.to_thread(self.rebuild)
+                    built = True
+                await asyncio.to_thread(self.sweep)
+                timeout = self._seconds_until(self.next_due())
+            except Exception as e:
+                # Keep the task alive and retry; a failed sweep may have popped cases without
+                # rescheduling them, so the retry rebuilds the heap from scratch.
+                logger.exception("Risk sweeper failed; retrying in %.0f s", RETRY_SECONDS)
+                self.failures += 1
+                self.last_error = str(e)
+                self.last_error_at = datetime.utcnow().isoformat(timespec="seconds")
+                built = False
+                timeout = RETRY_SECONDS
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._task = self._loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task, self._loop, self._wake = None, None, None
+
+    def stats(self) -> Dict[str, Any]:
+        due = self.next_due()
+        return {
+            "running": self._task is not None,
+            "scheduled": len(self._due),
+            "nextDue": due.isoformat() if due else None,
+            "lastSweep": self.last_sweep,
+            "transitions": self.transitions,
+            "failures": self.failures,
+            "lastError": self.last_error,
+            "lastErrorAt": self.last_error_at,
+        }
+
+
+risk_sweeper = RiskSweeper()
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import os
+import re
+import threading
+import time
+import uuid
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+# Opt-in: SQL_PROFILER=1 enables the middleware + /debug/requests.
+SQL_PROFILER_ENABLED = os.getenv("SQL_PROFILER", "").strip().lower() in {"1", "true", "yes", "on"}
+N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_PROFILER_N_PLUS_ONE_THRESHOLD", "5"))
+RING_BUFFER_SIZE = int(os.getenv("SQL_PROFILER_BUFFER", "200"))
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*\?\s*,?)+\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    """
+    Collapse a SQL statement to its "shape": literals and bind params become `?`,
+    IN-lists collapse to a single placeholder, whitespace is squashed.
+    """
+    s = _STRING_LITERAL.sub("?", statement)
+    s = _NUMBER_LITERAL.sub("?", s)
+    s = _IN_LIST.sub("IN (?)", s)
+    return _WHITESPACE.sub(" ", s).strip()
+
+
+@dataclass
+class _StatementStats:
+    count: int = 0
+    total_ms: float = 0.0
+
+
+@dataclass
+class RequestProfile:
+    method: str
+    path: str
+    started: float = field(default_factory=time.perf_counter)
+    statements: Dict[str, _StatementStats] = field(default_factory=dict)
+    query_count: int = 0
+    sql_ms: float = 0.0
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        shape = normalize_statement(statement)
+        st = self.statements.get(shape)
+        if st is None:
+            st = self.statements[shape] = _StatementStats()
+        st.count += 1
+        st.total_ms += elapsed_ms
+        self.query_count += 1
+        self.sql_ms += elapsed_ms
+
+    def n_plus_one(self, threshold: int) -> List[Dict[str, Any]]:
+        return [
+            {"statement": shape, "count": st.count, "totalMs": round(st.total_ms, 3)}
+            for shape, st in sorted(self.statements.items(), key=lambda kv: -kv[1].count)
+            if st.count > threshold
+        ]
+
+
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("sql_profile", default=None)
+
+_recent: Deque[Dict[str, Any]] = deque(maxlen=RING_BUFFER_SIZE)
+_recent_lock = threading.Lock()
+_instrumented: set[int] = set()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _current_profile.get() is None:
+        return
+    conn.info.setdefault("sql_profiler_t0", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    profile = _current_profile.get()
+    if profile is None:
+        return
+    starts = conn.info.get("sql_profiler_t0")
+    if not starts:
+        return
+    elapsed_ms = (time.perf_counter() - starts.pop()) * 1000.0
+    profile.record(statement, elapsed_ms)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Attach cursor hooks once per engine. Hooks are no-ops outside a profiled request.
+    """
+    if id(engine) in _instrumented:
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    _instrumented.add(id(engine))
+
+
+def recent_requests() -> List[Dict[str, Any]]:
+    with _recent_lock:
+        return list(_recent)
+
+
+class SQLProfilerMiddleware(BaseHTTPMiddleware):
+    """
+    Per-request SQL counter/timer with N+1 detection.
+    Adds X-SQL-* debug headers and records a summary into the /debug/requests ring buffer.
+    """
+
+    def __init__(self, app, threshold: int = N_PLUS_ONE_THRESHOLD) -> None:
+        super().__init__(app)
+        self.threshold = threshold
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        if request.url.path.startswith("/debug/"):
+            return await call_next(request)
+
+        profile = RequestProfile(method=request.method, path=request.url.path)
+        token = _current_profile.set(profile)
+        try:
+            response = await call_next(request)
+        finally:
+            _current_profile.reset(token)
+
+        total_ms = (time.perf_counter() - profile.started) * 1000.0
+        suspects = profile.n_plus_one(self.threshold)
+        request_id = uuid.uuid4().hex[:12]
+
+        response.headers["X-Request-Id"] = request_id
+        response.headers["X-SQL-Queries"] = str(profile.query_count)
+        response.headers["X-SQL-Time-Ms"] = f"{profile.sql_ms:.2f}"
+        if suspects:
+            response.headers["X-SQL-N-Plus-One"] = ";".join(
+                f"{s['count']}x {s['statement'][:120]}" for s in suspects
+            )
+
+        entry = {
+            "requestId": request_id,
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "method": profile.method,
+            "path": profile.path,
+            "status": response.status_code,
+            "durationMs": round(total_ms, 3),
+            "queryCount": profile.query_count,
+            "sqlMs": round(profile.sql_ms, 3),
+            "nPlusOne": suspects,
+            "statements": [
+                {"statement": shape, "count": st.count, "totalMs": round(st.total_ms, 3)}
+                for shape, st in profile.statements.items()
+            ],
+        }
+        with _recent_lock:
+            _recent.append(entry)
+        return response
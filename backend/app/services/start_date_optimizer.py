@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import os
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.tools.compliance_tools import estimate_visa_timeline_weeks
+from app.services.ticket_scheduler import critical_path_days
+from app.tools.it_tools import it_delivery_days_for_location
+from app.tools.logistics_tools import delivery_days, facilities_seating_eta_days
+
+HORIZON_DAYS = int(os.getenv("WHAT_IF_HORIZON_DAYS", "180"))
+
+ONSITE = "ONSITE"
+REMOTE = "REMOTE"
+WORK_MODES = (ONSITE, REMOTE)
+
+# Constraints each work mode must satisfy before Day-1.
+# A remote start skips the visa and seating; device and IT tickets are always needed.
+_MODE_CONSTRAINTS = {
+    ONSITE: ("VISA", "DEVICE_DELIVERY", "IT_DEVICE_SLA", "SEATING", "IT_TICKETS"),
+    REMOTE: ("DEVICE_DELIVERY", "IT_DEVICE_SLA", "IT_TICKETS"),
+}
+
+
+def _parse_date(date_str: Optional[str]) -> Optional[date]:
+    if not date_str:
+        return None
+    for fmt in ("%Y-%m-%d", "%Y/%m/%d", "%Y-%m-%dT%H:%M:%S"):
+        try:
+            return datetime.strptime(date_str, fmt).date()
+        except Exception:
+            continue
+    return None
+
+
+def _agent_data(case: Dict[str, Any], agent: str) -> Dict[str, Any]:
+    return ((case.get("agentOutputs") or {}).get(agent) or {}).get("data") or {}
+
+
+def case_lead_days(case: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    Lead time (days from today) each constraint needs, taken from the agents' outputs when the
+    orchestrator has run and from the same tools otherwise. Each lead is the smallest
+    days-to-start that does not trigger the matching detect_conflicts / IT SLA rule.
+    """
+    seed = case.get("seed", {}) or {}
+    nationality = seed.get("nationality") or ""
+    location = seed.get("workLocation") or ""
+    compliance, logistics, it = _agent_data(case, "compliance"), _agent_data(case, "logistics"), _agent_data(case, "it")
+
+    visa_weeks = compliance.get("visaTimelineWeeks")
+    if visa_weeks is None:
+        visa_weeks = estimate_visa_timeline_weeks(nationality, location)
+    delivery = logistics.get("deliveryDays")
+    if delivery is None:
+        delivery = delivery_days(location)
+    seating = logistics.get("seatingEtaDays")
+    if seating is None:
+        seating = facilities_seating_eta_days(location)
+    it_delivery = (it.get("deviceRequest") or {}).get("deliveryDays")
+    if it_delivery is None:
+        it_delivery = it_delivery_days_for_location(location)
+    tickets, chain = critical_path_days(it.get("tickets"))
+
+    return {
+        # visa_days > days_to_start is a conflict -> need days >= visa_days
+        "VISA": {"leadDays": int(visa_weeks) * 7, "detail": f"Visa estimate {int(visa_weeks)} weeks"},
+        # delivery > days_to_start is a conflict -> need days >= delivery
+        "DEVICE_DELIVERY": {"leadDays": int(delivery), "detail": f"Device delivery {int(delivery)} days"},
+        # IT flags delivery >= max(0, days - 1) as tight -> need days >= delivery + 2
+        "IT_DEVICE_SLA": {"leadDays": int(it_delivery) + 2, "detail": f"IT device SLA {int(it_delivery)} days + 1 day buffer"},
+        "SEATING": {"leadDays": int(seating), "detail": f"Seating ETA {int(seating)} days"},
+        "IT_TICKETS": {"leadDays": tickets, "detail": f"IT ticket critical path {' -> '.join(chain)} ({tickets} days)"},
+    }
+
+
+def evaluate_start_dates(
+    leads: Dict[str, Dict[str, Any]],
+    today: date,
+    current_start: Optional[date] = None,
+    modes: Sequence[str] = WORK_MODES,
+    horizon_days: int = HORIZON_DAYS,
+    business_days_only: bool = True,
+) -> List[Dict[str, Any]]:
+    """
+    Evaluate every candidate start date in [today, today + horizon] for every work mode in one
+    (modes x dates x constraints) array comparison. Returns one option per mode with the
+    earliest feasible date and the constraints on its critical path.
+    """
+    modes = [m for m in modes if m in _MODE_CONSTRAINTS]
+    keys = sorted({k for m in modes for k in _MODE_CONSTRAINTS[m]})
+    # lead[m, k]; constraints a mode doesn't need get lead 0 (always satisfied).
+    lead = np.zeros((len(modes), len(keys)), dtype=np.int32)
+    for i, mode in enumerate(modes):
+        for j, key in enumerate(keys):
+            if key in _MODE_CONSTRAINTS[mode]:
+                lead[i, j] = leads[key]["leadDays"]
+
+    offsets = np.arange(horizon_days + 1, dtype=np.int32)
+    dates = np.datetime64(today, "D") + offsets
+    feasible = (offsets[None, :, None] >= lead[:, None, :]).all(axis=2)
+    if business_days_only:
+        feasible &= np.is_busday(dates)[None, :]
+
+    first = feasible.argmax(axis=1)
+    has_any = feasible.any(axis=1)
+    required = lead.max(axis=1)
+
+    current_offset = (current_start - today).days if current_start else None
+    options: List[Dict[str, Any]] = []
+    for i, mode in enumerate(modes):
+        earliest = (today + timedelta(days=int(first[i]))) if has_any[i] else None
+        path = sorted(
+            (
+                {
+                    "constraint": key,
+                    "leadDays": int(lead[i, j]),
+                    "readyBy": (today + timedelta(days=int(lead[i, j]))).isoformat(),
+                    "detail": leads[key]["detail"],
+                    "binding": bool(lead[i, j] == required[i]),
+                }
+                for j, key in enumerate(keys)
+                if key in _MODE_CONSTRAINTS[mode]
+            ),
+            key=lambda c: -c["leadDays"],
+        )
+        feasible_now = None
+        if current_offset is not None:
+            feasible_now = bool(current_offset >= required[i])
+        options.append({
+            "workMode": mode,
+            "earliestStartDate": earliest.isoformat() if earliest else None,
+            "daysFromToday": int(first[i]) if has_any[i] else None,
+            "delayDays": max(0, (earliest - current_start).days) if earliest and current_start else None,
+            "feasibleOnCurrentStart": feasible_now,
+            "criticalPath": path,
+        })
+    return options
+
+
+def start_date_options(
+    case: Dict[str, Any],
+    today: Optional[date] = None,
+    modes: Sequence[str] = WORK_MODES,
+    horizon_days: int = HORIZON_DAYS,
+    business_days_only: bool = True,
+) -> Dict[str, Any]:
+    """What-if for one case: earliest feasible start date per work mode."""
+    today = today or datetime.utcnow().date()
+    seed = case.get("seed", {}) or {}
+    current_start = _parse_date(seed.get("startDate"))
+    options = evaluate_start_dates(case_lead_days(case), today, current_start, modes, horizon_days, business_days_only)
+    onsite = next((o for o in options if o["workMode"] == ONSITE), None)
+    return {
+        "caseId": case.get("caseId"),
+        "today": today.isoformat(),
+        "currentStartDate": current_start.isoformat() if current_start else None,
+        "suggestedStartDate": onsite["earliestStartDate"] if onsite else None,
+        "options": options,
+    }
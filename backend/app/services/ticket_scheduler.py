@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import text
+
+from app.db.database import engine
+from app.services.risk_forecast import TERMINAL_STATUSES
+from app.tools.it_tools import ticket_templates
+
+IT_DAILY_TICKET_CAPACITY = int(os.getenv("IT_DAILY_TICKET_CAPACITY", "40"))
+
+# (key, sla_days, depends_on) per ticket; hashable so compiled graphs can be cached per template set.
+TemplateSignature = Tuple[Tuple[str, int, Tuple[str, ...]], ...]
+
+# Open cases with IT tickets; tickets are grouped by their JSON text so each distinct set is parsed once.
+_LOAD_SQL = f"""
+SELECT case_id,
+       json_extract(state, '$.seed.startDate'),
+       json_extract(state, '$.agentOutputs.it.data.tickets')
+FROM case_states
+WHERE COALESCE(json_extract(state, '$.status'), '') NOT IN ({', '.join(repr(s) for s in sorted(TERMINAL_STATUSES))})
+  AND json_array_length(state, '$.agentOutputs.it.data.tickets') > 0
+"""
+
+
+@dataclass(frozen=True)
+class TicketGraph:
+    """A template set compiled once: topological order plus the CPM offsets that don't depend on the case."""
+    keys: Tuple[str, ...]  # topological order
+    duration: np.ndarray  # int32, sla_days per ticket in `keys` order
+    preds: Tuple[Tuple[int, ...], ...]
+    es: np.ndarray  # earliest start offset from kick-off
+    ef: np.ndarray  # earliest finish offset
+    tail: np.ndarray  # longest path from a ticket's start to the end of the graph (incl. its own SLA)
+    makespan: int
+
+
+def _default_depends() -> Dict[str, Tuple[str, ...]]:
+    return {str(t["key"]): tuple(t.get("depends_on") or ()) for t in ticket_templates()}
+
+
+def signature_for(tickets: Sequence[Dict[str, Any]]) -> TemplateSignature:
+    # Tickets persisted before templates declared depends_on pick up today's defaults by key.
+    defaults = _default_depends()
+    return tuple(
+        (
+            str(t["key"]),
+            int(t.get("sla_days") or 0),
+            tuple(t["depends_on"]) if "depends_on" in t else defaults.get(str(t["key"]), ()),
+        )
+        for t in tickets
+    )
+
+
+@lru_cache(maxsize=64)
+def compile_graph(signature: TemplateSignature) -> TicketGraph:
+    """Kahn's algorithm + forward/backward passes; raises ValueError on unknown dependencies or cycles."""
+    keys = [k for k, _, _ in signature]
+    if len(set(keys)) != len(keys):
+        raise ValueError("Duplicate ticket keys in template set")
+    deps = {k: d for k, _, d in signature}
+    sla = {k: s for k, s, _ in signature}
+    for k, d in deps.items():
+        missing = [p for p in d if p not in deps]
+        if missing:
+            raise ValueError(f"Ticket {k} depends on unknown ticket(s): {', '.join(missing)}")
+
+    indegree = {k: len(deps[k]) for k in keys}
+    succs: Dict[str, List[str]] = {k: [] for k in keys}
+    for k in keys:
+        for p in deps[k]:
+            succs[p].append(k)
+    ready = [k for k in keys if indegree[k] == 0]
+    order: List[str] = []
+    while ready:
+        k = ready.pop(0)
+        order.append(k)
+        for s in succs[k]:
+            indegree[s] -= 1
+            if indegree[s] == 0:
+                ready.append(s)
+    if len(order) != len(keys):
+        raise ValueError("Ticket dependencies contain a cycle: " + ", ".join(k for k in keys if indegree[k] > 0))
+
+    index = {k: i for i, k in enumerate(order)}
+    duration = np.array([sla[k] for k in order], dtype=np.int32)
+    preds = tuple(tuple(index[p] for p in deps[k]) for k in order)
+    es = np.zeros(len(order), dtype=np.int32)
+    for i, ps in enumerate(preds):
+        if ps:
+            es[i] = max(es[p] + duration[p] for p in ps)
+    ef = es + duration
+    tail = duration.copy()
+    for i in range(len(order) - 1, -1, -1):
+        for s in succs[order[i]]:
+            tail[i] = max(tail[i], duration[i] + tail[index[s]])
+    return TicketGraph(tuple(order), duration, preds, es, ef, tail, int(ef.max()) if len(order) else 0)
+
+
+def graph_for(tickets: Sequence[Dict[str, Any]]) -> TicketGraph:
+    return compile_graph(signature_for(tickets))
+
+
+def critical_path_days(tickets: Optional[Sequence[Dict[str, Any]]] = None) -> Tuple[int, List[str]]:
+    """Length and ticket keys of the longest dependency chain (current templates by default)."""
+    graph = graph_for(tickets or ticket_templates())
+    return graph.makespan, _critical_chain(graph)
+
+
+def _critical_chain(graph: TicketGraph) -> List[str]:
+    # Walk back from the ticket that finishes last through the predecessor that finishes latest.
+    if not graph.keys:
+        return []
+    i = int(graph.ef.argmax())
+    chain = [i]
+    while graph.preds[i]:
+        i = max(graph.preds[i], key=lambda p: graph.ef[p])
+        chain.append(i)
+    return [graph.keys[j] for j in reversed(chain)]
+
+
+def _parse_date(date_str: Optional[str]) -> Optional[date]:
+    if not date_str:
+        return None
+    for fmt in ("%Y-%m-%d", "%Y/%m/%d", "%Y-%m-%dT%H:%M:%S"):
+        try:
+            return datetime.strptime(date_str, fmt).date()
+        except Exception:
+            continue
+    return None
+
+
+def schedule_tickets(
+    tickets: Sequence[Dict[str, Any]],
+    start_date: Optional[str],
+    today: Optional[date] = None,
+) -> Dict[str, Any]:
+    """
+    Critical-path schedule for one case's tickets, kicked off today. Latest dates are measured
+    back from the start date (every ticket done by Day-1); without a start date they are measured
+    from the makespan, so slack is relative to the chain itself.
+    """
+    today = today or datetime.utcnow().date()
+    graph = graph_for(tickets)
+    start = _parse_date(start_date)
+    deadline = (start - today).days if start else graph.makespan
+    ls = deadline - graph.tail
+    slack = ls - graph.es
+    min_slack = int(slack.min()) if len(slack) else 0
+    by_key = {str(t["key"]): t for t in tickets}
+
+    def _d(offset: Any) -> str:
+        return (today + timedelta(days=int(offset))).isoformat()
+
+    rows = [
+        {
+            "key": key,
+            "title": by_key[key].get("title"),
+            "slaDays": int(graph.duration[i]),
+            "dependsOn": [graph.keys[p] for p in graph.preds[i]],
+            "earliestStart": _d(graph.es[i]),
+            "earliestFinish": _d(graph.ef[i]),
+            "latestStart": _d(ls[i]),
+            "latestFinish": _d(ls[i] + graph.duration[i]),
+            "slackDays": int(slack[i]),
+            "critical": bool(slack[i] == min_slack),
+        }
+        for i, key in enumerate(graph.keys)
+    ]
+    return {
+        "kickoff": today.isoformat(),
+        "startDate": start.isoformat() if start else None,
+        "makespanDays": graph.makespan,
+        "readyBy": _d(graph.makespan),
+        "feasible": start is None or graph.makespan <= deadline,
+        "criticalPath": _critical_chain(graph),
+        "tickets": rows,
+    }
+
+
+def _load_open_cases() -> List[Tuple[str, Optional[str], str]]:
+    with engine.connect() as conn:
+        return [tuple(r) for r in conn.execute(text(_LOAD_SQL)).fetchall()]
+
+
+def capacity_report(
+    today: Optional[date] = None,
+    horizon_days: int = 30,
+    capacity: int = IT_DAILY_TICKET_CAPACITY,
+) -> Dict[str, Any]:
+    """
+    Schedule every open case's tickets and add up the IT work in progress per day, under two
+    policies: ASAP (everything kicks off today) and ALAP (each ticket starts at its latest start
+    for the case's Day-1, clipped to today). Days whose load exceeds `capacity` are bottlenecks.
+    Cases sharing a template set share one compiled graph, so per-case work is a vector add.
+    """
+    today = today or datetime.utcnow().date()
+    t0 = time.perf_counter()
+    rows = _load_open_cases()
+    t1 = time.perf_counter()
+
+    groups: Dict[str, List[Optional[str]]] = {}
+    for _, start_date, tickets_json in rows:
+        groups.setdefault(tickets_json, []).append(start_date)
+
+    span = horizon_days + 1
+    asap = np.zeros(span + 1, dtype=np.int64)
+    alap = np.zeros(span + 1, dtype=np.int64)
+    late = 0
+    for tickets_json, start_dates in groups.items():
+        graph = graph_for(json.loads(tickets_json))
+        n = len(start_dates)
+        # ASAP is identical for every case in the group.
+        np.add.at(asap, np.clip(graph.es, 0, span), n)
+        np.add.at(asap, np.clip(graph.ef, 0, span), -n)
+
+        cleaned = [(s or "")[:10].replace("/", "-") or "NaT" for s in start_dates]
+        try:
+            starts = np.array(cleaned, dtype="datetime64[D]")
+        except ValueError:
+            starts = np.array([_parse_date(s) or "NaT" for s in start_dates], dtype="datetime64[D]")
+        valid = ~np.isnat(starts)
+        deadline = (starts[valid] - np.datetime64(today, "D")).astype(np.int64)
+        late += int((deadline < graph.makespan).sum())
+        # ALAP start per (case, ticket); tickets already behind schedule start today.
+        ls = np.clip(deadline[:, None] - graph.tail[None, :], 0, None)
+        lf = ls + graph.duration[None, :]
+        np.add.at(alap, np.clip(ls, 0, span).ravel(), 1)
+        np.add.at(alap, np.clip(lf, 0, span).ravel(), -1)
+        # Cases without a start date have no deadline: schedule them ASAP.
+        missing = int((~valid).sum())
+        if missing:
+            np.add.at(alap, np.clip(graph.es, 0, span), missing)
+            np.add.at(alap, np.clip(graph.ef, 0, span), -missing)
+
+    asap_load = np.cumsum(asap)[:span]
+    alap_load = np.cumsum(alap)[:span]
+    t2 = time.perf_counter()
+
+    days = [
+        {"date": (today + timedelta(days=i)).isoformat(), "asap": int(asap_load[i]), "alap": int(alap_load[i])}
+        for i in range(span)
+    ]
+    return {
+        "today": today.isoformat(),
+        "capacity": capacity,
+        "evaluated": len(rows),
+        "templateSets": len(groups),
+        "lateCases": late,
+        "peak": {"asap": int(asap_load.max()) if span else 0, "alap": int(alap_load.max()) if span else 0},
+        "bottlenecks": [d for d in days if d["alap"] > capacity],
+        "days": days,
+        "timingsMs": {"load": round((t1 - t0) * 1000, 2), "compute": round((t2 - t1) * 1000, 2)},
+    }
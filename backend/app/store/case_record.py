@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import sys
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, Mapping
+
+# Fixed top-level fields live in slots; everything else (steps, completedSteps, seed,
+# agentOutputs, and any key added later) stays in `extra`. Iteration order matches the
+# dict CaseStore used to build: head fields, variable parts, then timestamps.
+_HEAD = ("caseId", "applicationNumber", "candidateName", "status", "riskStatus", "currentStepIndex")
+_TAIL = ("createdAt", "updatedAt")
+_FIXED = frozenset(_HEAD + _TAIL)
+# Small closed vocabularies: one shared str object per value across all resident cases.
+_INTERNED = frozenset({"status", "riskStatus"})
+
+_UNSET: Any = object()
+
+
+class CaseRecord(MutableMapping):
+    """
+    One resident case in CaseStore. Behaves like the case dict it replaces (agents, routes and
+    JSON encoding read it through the mapping interface) but stores the fixed fields in slots
+    instead of a per-case hash table with repeated keys.
+    """
+
+    __slots__ = _HEAD + _TAIL + ("extra",)
+
+    def __init__(self, data: Mapping[str, Any] = ()) -> None:
+        for key in _HEAD + _TAIL:
+            object.__setattr__(self, key, _UNSET)
+        self.extra: Dict[str, Any] = {}
+        for key, value in dict(data).items():
+            self[key] = value
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "CaseRecord":
+        return data if isinstance(data, CaseRecord) else cls(data)
+
+    # ---------- mapping interface ----------
+    def __getitem__(self, key: str) -> Any:
+        if key in _FIXED:
+            value = getattr(self, key)
+            if value is _UNSET:
+                raise KeyError(key)
+            return value
+        return self.extra[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in _FIXED:
+            if key in _INTERNED and type(value) is str:
+                value = sys.intern(value)
+            object.__setattr__(self, key, value)
+        else:
+            # Keys parsed from JSON are fresh str objects per case; share one per name.
+            self.extra[sys.intern(key)] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key in _FIXED:
+            if getattr(self, key) is _UNSET:
+                raise KeyError(key)
+            object.__setattr__(self, key, _UNSET)
+        else:
+            del self.extra[key]
+
+    def __contains__(self, key: object) -> bool:
+        if key in _FIXED:
+            return getattr(self, key) is not _UNSET  # type: ignore[arg-type]
+        return key in self.extra
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in _FIXED:
+            value = getattr(self, key)
+            return default if value is _UNSET else value
+        return self.extra.get(key, default)
+
+    def __iter__(self) -> Iterator[str]:
+        for key in _HEAD:
+            if getattr(self, key) is not _UNSET:
+                yield key
+        yield from self.extra
+        for key in _TAIL:
+            if getattr(self, key) is not _UNSET:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for key in _FIXED if getattr(self, key) is not _UNSET) + len(self.extra)
+
+    def __repr__(self) -> str:
+        return f"CaseRecord({self.to_dict()!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Shallow plain-dict view (nested values are shared), e.g. for JSON encoding."""
+        return {key: self[key] for key in self}
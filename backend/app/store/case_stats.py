@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.db.database import Base, engine
+from app.db.models import CaseStatCounter, CaseStatEntry
+from app.tools.workplace_tools import cohort_week
+
+# Dashboard dimension -> case_stat_entries column.
+DIMENSIONS: Dict[str, str] = {
+    "status": "status",
+    "riskStatus": "risk_status",
+    "location": "location",
+    "startWeek": "start_week",
+}
+
+# Values a brand-new case is counted under until it says otherwise (CaseStore's initial state).
+_DEFAULTS: Dict[str, str] = {"status": "DRAFT", "riskStatus": "GREEN", "location": "UNKNOWN", "startWeek": "UNSCHEDULED"}
+
+# The same precedence the HR views use: wizard state (case_states) wins over the HR row (cases).
+# Every case has a cases row; case_states rows without one are leftovers of a delete, not cases.
+_SOURCE_SQL = """
+SELECT c.id,
+       COALESCE(json_extract(s.state, '$.status'), c.status),
+       json_extract(s.state, '$.riskStatus'),
+       COALESCE(json_extract(s.state, '$.seed.workLocation'), c.work_location),
+       COALESCE(json_extract(s.state, '$.seed.startDate'), c.start_date)
+FROM cases c LEFT JOIN case_states s ON s.case_id = c.id
+{case_filter}
+"""
+
+_Deltas = Dict[Tuple[str, str], int]
+
+
+def location_bucket(work_location: Optional[str]) -> str:
+    return (work_location or "").strip().upper() or _DEFAULTS["location"]
+
+
+def week_bucket(start_date: Optional[str]) -> str:
+    return cohort_week(start_date) or _DEFAULTS["startWeek"]
+
+
+def _values(
+    status: Optional[str] = None,
+    risk_status: Optional[str] = None,
+    work_location: Optional[str] = None,
+    start_date: Optional[str] = None,
+) -> Dict[str, str]:
+    """Only the dimensions that were given; None means "leave as is"."""
+    out: Dict[str, str] = {}
+    if status is not None:
+        out["status"] = status or _DEFAULTS["status"]
+    if risk_status is not None:
+        out["riskStatus"] = risk_status or _DEFAULTS["riskStatus"]
+    if work_location is not None:
+        out["location"] = location_bucket(work_location)
+    if start_date is not None:
+        out["startWeek"] = week_bucket(start_date)
+    return out
+
+
+class CaseStats:
+    """
+    HR dashboard counts (cases per status / riskStatus / location / start week), maintained
+    incrementally. Each case's current values live in `case_stat_entries`; a change rewrites the
+    entry and applies +1/-1 deltas to `case_stat_counters` in the same transaction, then applies
+    the same deltas to the in-memory copy. Reads never touch the DB.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts: Optional[Dict[str, Dict[str, int]]] = None
+
+    # ---------- cache ----------
+    def _cache(self) -> Dict[str, Dict[str, int]]:
+        if self._counts is None:
+            with engine.connect() as conn:
+                rows = conn.execute(text("SELECT dimension, value, count FROM case_stat_counters WHERE count > 0")).fetchall()
+            counts: Dict[str, Dict[str, int]] = {dim: {} for dim in DIMENSIONS}
+            for dim, value, count in rows:
+                counts.setdefault(dim, {})[value] = count
+            self._counts = counts
+        return self._counts
+
+    def refresh(self) -> None:
+        with self._lock:
+            self._counts = None
+            self._cache()
+
+    def _write(self, fn, *args: Any) -> Any:
+        """Run fn(conn, deltas, *args) in one transaction, then apply the counter deltas in memory."""
+        with self._lock:
+            counts = self._cache()  # load before writing, or the deltas would be counted twice
+            deltas: _Deltas = {}
+            with engine.begin() as conn:
+                result = fn(conn, deltas, *args)
+                self._apply_deltas(conn, deltas)
+            for (dim, value), d in deltas.items():
+                n = counts.setdefault(dim, {}).get(value, 0) + d
+                if n > 0:
+                    counts[dim][value] = n
+                else:
+                    counts[dim].pop(value, None)
+            return result
+
+    # ---------- transactional steps ----------
+    @staticmethod
+    def _apply_deltas(conn: Connection, deltas: _Deltas) -> None:
+        changed = [{"d": dim, "v": value, "n": n} for (dim, value), n in deltas.items() if n]
+        if not changed:
+            return
+        conn.execute(
+            text(
+                "INSERT INTO case_stat_counters (dimension, value, count) VALUES (:d, :v, :n) "
+                "ON CONFLICT(dimension, value) DO UPDATE SET count = count + excluded.count"
+            ),
+            changed,
+        )
+        conn.execute(text("DELETE FROM case_stat_counters WHERE count <= 0"))
+
+    @staticmethod
+    def _entry(conn: Connection, case_id: str) -> Optional[Dict[str, str]]:
+        row = conn.execute(
+            text("SELECT status, risk_status, location, start_week FROM case_stat_entries WHERE case_id = :c"),
+            {"c": case_id},
+        ).fetchone()
+        return dict(zip(DIMENSIONS, row)) if row else None
+
+    def _set(self, conn: Connection, deltas: _Deltas, case_id: str, values: Dict[str, str]) -> None:
+        old = self._entry(conn, case_id)
+        new = {**(old or _DEFAULTS), **values}
+        if old == new:
+            return
+        conn.execute(
+            text(
+                "INSERT INTO case_stat_entries (case_id, status, risk_status, location, start_week) "
+                "VALUES (:c, :status, :riskStatus, :location, :startWeek) "
+                "ON CONFLICT(case_id) DO UPDATE SET status = excluded.status, risk_status = excluded.risk_status, "
+                "location = excluded.location, start_week = excluded.start_week"
+            ),
+            {"c": case_id, **new},
+        )
+        for dim in DIMENSIONS:
+            if old is not None and old[dim] == new[dim]:
+                continue
+            if old is not None:
+                deltas[(dim, old[dim])] = deltas.get((dim, old[dim]), 0) - 1
+            deltas[(dim, new[dim])] = deltas.get((dim, new[dim]), 0) + 1
+
+    def _set_many(self, conn: Connection, deltas: _Deltas, items: Sequence[Tuple[str, Dict[str, str]]]) -> None:
+        for case_id, values in items:
+            self._set(conn, deltas, case_id, values)
+
+    def _remove(self, conn: Connection, deltas: _Deltas, case_id: str) -> bool:
+        old = self._entry(conn, case_id)
+        if old is None:
+            return False
+        conn.execute(text("DELETE FROM case_stat_entries WHERE case_id = :c"), {"c": case_id})
+        for dim in DIMENSIONS:
+            deltas[(dim, old[dim])] = deltas.get((dim, old[dim]), 0) - 1
+        return True
+
+    @staticmethod
+    def _source_rows(conn: Connection, case_id: Optional[str] = None) -> List[Tuple[str, Dict[str, str]]]:
+        if case_id is None:
+            sql, params = _SOURCE_SQL.format(case_filter=""), {}
+        else:
+            sql, params = _SOURCE_SQL.format(case_filter="WHERE c.id = :c"), {"c": case_id}
+        out = []
+        for cid, status, risk_status, work_location, start_date in conn.execute(text(sql), params).fetchall():
+            out.append((cid, {**_DEFAULTS, **_values(status or "", risk_status or "", work_location or "", start_date or "")}))
+        return out
+
+    def _sync(self, conn: Connection, deltas: _Deltas, case_id: str) -> None:
+        rows = self._source_rows(conn, case_id)
+        if rows:
+            self._set(conn, deltas, case_id, rows[0][1])
+        else:
+            self._remove(conn, deltas, case_id)
+
+    # ---------- public API ----------
+    def update(
+        self,
+        case_id: str,
+        status: Optional[str] = None,
+        risk_status: Optional[str] = None,
+        work_location: Optional[str] = None,
+        start_date: Optional[str] = None,
+    ) -> None:
+        """Record new values for the given dimensions (None = unchanged). Unknown cases start from the defaults."""
+        self._write(self._set, case_id, _values(status, risk_status, work_location, start_date))
+
+    def update_many(self, items: Sequence[Tuple[str, Dict[str, Optional[str]]]]) -> None:
+        """items: (case_id, {"status"/"risk_status"/"work_location"/"start_date": value}); one transaction."""
+        self._write(self._set_many, [(cid, _values(**fields)) for cid, fields in items])
+
+    def sync(self, case_id: str) -> None:
+        """Re-read one case from cases/case_states (HR edits that bypass CaseStore)."""
+        self._write(self._sync, case_id)
+
+    def remove(self, case_id: str) -> bool:
+        return self._write(self._remove, case_id)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = self._cache()
+            return {
+                "total": sum(counts.get("status", {}).values()),
+                "byStatus": dict(counts.get("status", {})),
+                "byRiskStatus": dict(counts.get("riskStatus", {})),
+                "byLocation": dict(counts.get("location", {})),
+                "byStartWeek": dict(sorted(counts.get("startWeek", {}).items())),
+            }
+
+    def rebuild(self) -> Dict[str, Any]:
+        """
+        Recount every case from cases/case_states and replace both tables. Returns the
+        (dimension, value) pairs where the maintained counters had drifted.
+        """
+        with self._lock:
+            with engine.begin() as conn:
+                before = {
+                    (dim, value): count
+                    for dim, value, count in conn.execute(text("SELECT dimension, value, count FROM case_stat_counters")).fetchall()
+                }
+                rows = self._source_rows(conn)
+                after: Dict[Tuple[str, str], int] = {}
+                for _, values in rows:
+                    for dim in DIMENSIONS:
+                        after[(dim, values[dim])] = after.get((dim, values[dim]), 0) + 1
+
+                conn.execute(text("DELETE FROM case_stat_entries"))
+                conn.execute(text("DELETE FROM case_stat_counters"))
+                if rows:
+                    conn.execute(
+                        text(
+                            "INSERT INTO case_stat_entries (case_id, status, risk_status, location, start_week) "
+                            "VALUES (:c, :status, :riskStatus, :location, :startWeek)"
+                        ),
+                        [{"c": cid, **values} for cid, values in rows],
+                    )
+                if after:
+                    conn.execute(
+                        text("INSERT INTO case_stat_counters (dimension, value, count) VALUES (:d, :v, :n)"),
+                        [{"d": dim, "v": value, "n": n} for (dim, value), n in after.items()],
+                    )
+            self._counts = None
+            self._cache()
+
+        drift = [
+            {"dimension": dim, "value": value, "counted": before.get((dim, value), 0), "actual": after.get((dim, value), 0)}
+            for dim, value in sorted(set(before) | set(after))
+            if before.get((dim, value), 0) != after.get((dim, value), 0)
+        ]
+        return {"cases": len(rows), "drift": drift}
+
+    def ensure_built(self) -> bool:
+        """First start after upgrading: build the counters if there are cases but no entries yet."""
+        with engine.connect() as conn:
+            has_entries = conn.execute(text("SELECT 1 FROM case_stat_entries LIMIT 1")).fetchone()
+            has_cases = conn.execute(text("SELECT 1 FROM cases LIMIT 1")).fetchone()
+        if has_entries or not has_cases:
+            return False
+        self.rebuild()
+        return True
+
+
+case_stats = CaseStats()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="HR dashboard counters.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("rebuild", help="recount every case from scratch and report drift")
+    sub.add_parser("show", help="print the current counters")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine, tables=[CaseStatEntry.__table__, CaseStatCounter.__table__])
+    if args.cmd == "rebuild":
+        result = case_stats.rebuild()
+        print(f"recounted {result['cases']} cases, {len(result['drift'])} drifted counters")
+        for d in result["drift"]:
+            print(f"  {d['dimension']:<10} {d['value']:<24} counted={d['counted']:<6} actual={d['actual']}")
+    else:
+        print(json.dumps(case_stats.snapshot(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,37 +1,156 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import json
+import os
 import time
 import uuid
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from datetime import datetime
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional, Set, Tuple
 
-from app.db.database import SessionLocal
+from sqlalchemy import text
+
+from app.db.database import SessionLocal, engine
 from app.db.models import CaseState
+from app.store.case_record import CaseRecord
+from app.store.case_stats import case_stats
+from app.store.case_summary import case_summary
 
 
 def _now_iso() -> str:
     return time.strftime("%Y-%m-%dT%H:%M:%S")
 
 
-def _deepcopy_jsonable(obj: Any) -> Any:
-    # Avoid pulling in heavy deps; case JSON is already dict/list/str.
-    if isinstance(obj, dict):
-        return {k: _deepcopy_jsonable(v) for k, v in obj.items()}
-    if isinstance(obj, list):
-        return [_deepcopy_jsonable(v) for v in obj]
-    return obj
+# Versions start from the process start time (epoch seconds * 1e6), so a version handed out
+# before a restart is always lower than any handed out after it and never aliases a newer state.
+_VERSION_BASE = int(time.time()) * 1_000_000
+CASE_CHANGE_LOG = int(os.getenv("CASE_CHANGE_LOG", "16"))  # versions of changed-key history kept per case
+
+# Top-level keys each mutator changes (shared, so change-log entries are just (version, ref)).
+_SEED_KEYS = frozenset({"seed", "candidateName", "updatedAt"})
+_STEP_KEYS = frozenset({"steps", "completedSteps", "currentStepIndex", "updatedAt"})
+_AGENT_KEYS = frozenset({"agentOutputs", "updatedAt"})
+_STATUS_KEYS = frozenset({"status", "updatedAt"})
+_RISK_KEYS = frozenset({"riskStatus", "updatedAt"})
+_CURRENT_STEP_KEYS = frozenset({"currentStepIndex", "updatedAt"})
+
+
+class CaseSnapshot(NamedTuple):
+    version: int
+    body: bytes  # JSON, encoded the way FastAPI's JSONResponse would
+    etag: Optional[str]  # strong: hash of body, so it stays valid across restarts; None until first read
+
+
+def _record_default(obj: Any) -> Any:
+    if isinstance(obj, CaseRecord):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _encode(doc: Any) -> bytes:
+    return json.dumps(
+        doc, ensure_ascii=False, allow_nan=False, separators=(",", ":"), default=_record_default
+    ).encode("utf-8")
+
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
+
+def serialise(doc: Any) -> Tuple[bytes, str]:
+    """JSON bytes (as FastAPI's JSONResponse would encode them) and a strong ETag for them."""
+    body = _encode(doc)
+    return body, _etag(body)
 
 
 @dataclass
 class CaseStore:
-    cases: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    cases: Dict[str, CaseRecord] = field(default_factory=dict)
     appnum_to_caseid: Dict[str, str] = field(default_factory=dict)
 
+    # per-case version, bumped by every mutation below, and the serialised body for that version
+    versions: Dict[str, int] = field(default_factory=dict)
+    _snapshots: Dict[str, CaseSnapshot] = field(default_factory=dict)
+    # per-case [(version, keys changed by it)], newest last; a case's first entry is its floor
+    _changes: Dict[str, List[Tuple[int, Optional[FrozenSet[str]]]]] = field(default_factory=dict)
+
     # per-case subscribers (websocket queues)
     subscribers: Dict[str, List[asyncio.Queue]] = field(default_factory=dict)
     recent_events: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
 
+    # ---------- versions / snapshots ----------
+    def _touch(self, case_id: str, keys: Optional[FrozenSet[str]] = None) -> None:
+        """
+        Call after changing a case dict in memory; drops its cached snapshot. `keys` are the
+        top-level keys changed; None (a new or reloaded case) means everything.
+        """
+        version = self.versions.get(case_id, _VERSION_BASE) + 1
+        self.versions[case_id] = version
+        self._snapshots.pop(case_id, None)
+        if keys is None:
+            self._changes[case_id] = [(version, None)]
+            return
+        log = self._changes.setdefault(case_id, [])
+        log.append((version, keys))
+        if len(log) > CASE_CHANGE_LOG:
+            # The oldest kept entry becomes the floor: deltas from before it aren't known.
+            del log[: len(log) - CASE_CHANGE_LOG]
+            log[0] = (log[0][0], None)
+
+    def _forget(self, case_id: str) -> None:
+        self.versions.pop(case_id, None)
+        self._snapshots.pop(case_id, None)
+        self._changes.pop(case_id, None)
+
+    def changed_keys(self, case_id: str, since_version: int) -> Optional[Set[str]]:
+        """
+        Top-level keys changed after `since_version`, or None if that isn't known (a version
+        from before a restart or reload, or older than the kept history) and the client needs
+        the whole case.
+        """
+        current = self.versions.get(case_id)
+        if current is None or since_version > current:
+            return None
+        changed: Set[str] = set()
+        for version, keys in reversed(self._changes.get(case_id, [])):
+            if version <= since_version:
+                return changed
+            if keys is None:
+                return None
+            changed |= keys
+        # Log is empty only for cases touched before history existed; be safe.
+        return changed if since_version == current else None
+
+    def snapshot(self, case_id: str) -> Optional[CaseSnapshot]:
+        """
+        Serialised case for GET /api/case/{id}: built by persist_case or the first read after a
+        change, then served from memory until the next mutation. Always carries its ETag.
+        """
+        snap = self._cached_body(case_id)
+        if snap is None or snap.etag is not None:
+            return snap
+        snap = snap._replace(etag=_etag(snap.body))
+        if self.versions.get(case_id, 0) == snap.version:
+            self._snapshots[case_id] = snap
+        return snap
+
+    def _cached_body(self, case_id: str) -> Optional[CaseSnapshot]:
+        """Current snapshot, encoding and caching it if needed; the ETag is left to snapshot()."""
+        snap = self._snapshots.get(case_id)
+        version = self.versions.get(case_id, 0)
+        if snap is not None and snap.version == version:
+            return snap
+        c = self.cases.get(case_id)
+        if c is None:
+            return None
+        snap = CaseSnapshot(version, _encode(c), None)
+        # Only cache if nothing changed the case while it was being encoded.
+        if self.versions.get(case_id, 0) == version:
+            self._snapshots[case_id] = snap
+        return snap
+
     # ---------- persistence ----------
     def persist_case(self, case_id: str) -> None:
         """
@@ -42,17 +161,18 @@ class CaseStore:
         if not c:
             return
 
-        payload = _deepcopy_jsonable(c)
-        db = SessionLocal()
-        try:
-            existing = db.query(CaseState).filter(CaseState.case_id == case_id).first()
-            if existing:
-                existing.state = payload
-            else:
-                db.add(CaseState(case_id=case_id, state=payload))
-            db.commit()
-        finally:
-            db.close()
+        # Encoded once from the live case (no deep copy) and cached as the current snapshot, so
+        # the GET that usually follows a write serves these same bytes (hashing them only then).
+        body = self._cached_body(case_id).body
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    "INSERT INTO case_states (case_id, state, updated_at) VALUES (:c, :s, :t) "
+                    "ON CONFLICT(case_id) DO UPDATE SET state = excluded.state, updated_at = excluded.updated_at"
+                ),
+                {"c": case_id, "s": body.decode("utf-8"), "t": datetime.utcnow()},
+            )
+        case_summary.refresh(case_id)
 
     def load_persisted_case(self, case_id: str) -> Optional[Dict[str, Any]]:
         db = SessionLocal()
@@ -70,14 +190,17 @@ class CaseStore:
         application_number: str,
         seed: Dict[str, Any] | None = None,
         case_id: str | None = None,
-    ) -> Dict[str, Any]:
+    ) -> CaseRecord:
         if application_number in self.appnum_to_caseid:
             cid = self.appnum_to_caseid[application_number]
             existing = self.cases.get(cid)
             if existing is None:
                 del self.appnum_to_caseid[application_number]
             else:
+                # Page reloads re-send the same seed; only write when something actually changed.
+                changed = migrated = False
                 if case_id and case_id != cid:
+                    changed = migrated = True
                     # migrate to stable case_id
                     if case_id in self.cases and self.cases[case_id] is not existing:
                         existing = self.cases[case_id]
@@ -86,22 +209,34 @@ class CaseStore:
                         del self.cases[cid]
                     self.appnum_to_caseid[application_number] = case_id
                     existing["caseId"] = case_id
+                    self._forget(cid)
                     if cid in self.subscribers:
                         self.subscribers[case_id] = self.subscribers.pop(cid)
                     if cid in self.recent_events:
                         self.recent_events[case_id] = self.recent_events.pop(cid)
 
-                if seed:
+                if seed and seed != existing.get("seed"):
+                    changed = True
                     existing["seed"] = seed
                     if seed.get("candidateName"):
                         existing["candidateName"] = seed["candidateName"]
 
+                if not changed:
+                    return existing
+
                 existing["updatedAt"] = _now_iso()
+                self._touch(existing["caseId"], None if migrated else _SEED_KEYS)
                 self.persist_case(existing["caseId"])
+                if seed:
+                    case_stats.update(
+                        existing["caseId"],
+                        work_location=seed.get("workLocation") or "",
+                        start_date=seed.get("startDate") or "",
+                    )
                 return existing
 
         cid = case_id or f"CASE-{uuid.uuid4().hex[:8].upper()}"
-        case = {
+        case = CaseRecord({
             "caseId": cid,
             "applicationNumber": application_number,
             "candidateName": (seed or {}).get("candidateName") or "Candidate",
@@ -114,23 +249,32 @@ class CaseStore:
             "agentOutputs": {},
             "createdAt": _now_iso(),
             "updatedAt": _now_iso(),
-        }
+        })
         self.cases[cid] = case
+        self._touch(cid)
         self.appnum_to_caseid[application_number] = cid
         self.subscribers[cid] = []
         self.recent_events[cid] = []
         self.emit(cid, "system.case_created", {"caseId": cid, "applicationNumber": application_number})
         self.persist_case(cid)
+        case_stats.update(
+            cid,
+            status=case["status"],
+            risk_status=case["riskStatus"],
+            work_location=case["seed"].get("workLocation") or "",
+            start_date=case["seed"].get("startDate") or "",
+        )
         return case
 
-    def set_case_direct(self, case_id: str, case_payload: Dict[str, Any]) -> Dict[str, Any]:
+    def set_case_direct(self, case_id: str, case_payload: Dict[str, Any]) -> CaseRecord:
         """
         Load a persisted case directly into memory.
         """
-        case_payload = case_payload or {}
+        case_payload = CaseRecord.from_dict(case_payload or {})
         case_payload["caseId"] = case_id
         case_payload.setdefault("updatedAt", _now_iso())
         self.cases[case_id] = case_payload
+        self._touch(case_id)
 
         appnum = case_payload.get("applicationNumber")
         if appnum:
@@ -140,10 +284,30 @@ class CaseStore:
         self.recent_events.setdefault(case_id, [])
         return case_payload
 
-    def get_case(self, case_id: str) -> Optional[Dict[str, Any]]:
+    def load_if_absent(self, case_id: str, case_payload: Dict[str, Any]) -> bool:
+        """
+        Like set_case_direct, but never replaces a case that is already in memory (it may have
+        been changed since the snapshot was read). Returns True if the payload was loaded.
+        """
+        case_payload = CaseRecord.from_dict(case_payload)
+        case_payload["caseId"] = case_id
+        case_payload.setdefault("updatedAt", _now_iso())
+        if self.cases.setdefault(case_id, case_payload) is not case_payload:
+            return False
+        self._touch(case_id)
+
+        appnum = case_payload.get("applicationNumber")
+        if appnum:
+            self.appnum_to_caseid.setdefault(appnum, case_id)
+
+        self.subscribers.setdefault(case_id, [])
+        self.recent_events.setdefault(case_id, [])
+        return True
+
+    def get_case(self, case_id: str) -> Optional[CaseRecord]:
         return self.cases.get(case_id)
 
-    def save_step(self, case_id: str, step_key: str, payload: Dict[str, Any], next_step_index: int | None) -> Optional[Dict[str, Any]]:
+    def save_step(self, case_id: str, step_key: str, payload: Dict[str, Any], next_step_index: int | None) -> Optional[CaseRecord]:
         c = self.cases.get(case_id)
         if not c:
             return None
@@ -155,6 +319,7 @@ class CaseStore:
             c["currentStepIndex"] = next_step_index
 
         c["updatedAt"] = _now_iso()
+        self._touch(case_id, _STEP_KEYS)
         self.emit(case_id, "ui.step_saved", {"stepKey": step_key})
         self.persist_case(case_id)
         return c
@@ -165,6 +330,7 @@ class CaseStore:
             return
         c["agentOutputs"][agent_name] = output
         c["updatedAt"] = _now_iso()
+        self._touch(case_id, _AGENT_KEYS)
         self.persist_case(case_id)
 
     def set_status(self, case_id: str, status: str) -> None:
@@ -173,8 +339,10 @@ class CaseStore:
             return
         c["status"] = status
         c["updatedAt"] = _now_iso()
+        self._touch(case_id, _STATUS_KEYS)
         self.emit(case_id, "system.status_changed", {"status": status})
         self.persist_case(case_id)
+        case_stats.update(case_id, status=status)
 
     def set_risk_status(self, case_id: str, risk_status: str) -> None:
         c = self.cases.get(case_id)
@@ -182,8 +350,20 @@ class CaseStore:
             return
         c["riskStatus"] = risk_status
         c["updatedAt"] = _now_iso()
+        self._touch(case_id, _RISK_KEYS)
         self.emit(case_id, "system.risk_changed", {"riskStatus": risk_status})
         self.persist_case(case_id)
+        case_stats.update(case_id, risk_status=risk_status)
+
+    def set_current_step(self, case_id: str, step_index: int) -> Optional[CaseRecord]:
+        c = self.cases.get(case_id)
+        if not c:
+            return None
+        c["currentStepIndex"] = step_index
+        c["updatedAt"] = _now_iso()
+        self._touch(case_id, _CURRENT_STEP_KEYS)
+        self.persist_case(case_id)
+        return c
 
     def delete_case(self, case_id: str) -> bool:
         c = self.cases.get(case_id)
@@ -200,6 +380,7 @@ class CaseStore:
             del self.subscribers[case_id]
         if case_id in self.recent_events:
             del self.recent_events[case_id]
+        self._forget(case_id)
 
         # Also remove persisted state if present
         db = SessionLocal()
@@ -209,6 +390,8 @@ class CaseStore:
         finally:
             db.close()
 
+        case_stats.remove(case_id)
+        case_summary.remove(case_id)
         return True
 
     # ---------- events / websockets ----------
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection
+
+from app.db.database import Base, engine
+from app.db.models import ApplicationCode, Case, CaseState, CaseSummary, EmployeeRecord, WorkplaceAssignment
+
+CONFIRMED_STATUSES = {
+    "ONBOARDING_IN_PROGRESS",
+    "SUBMITTED",
+    "ONBOARDING_COMPLETE",
+    "READY_DAY1",
+    "HRIS_COMPLETED",
+    # keep AT_RISK here for safety if any older cases still have it stored as status
+    "AT_RISK",
+}
+
+_IN_CHUNK = 500  # stay well under SQLite's bound-parameter limit
+
+_active_code = (
+    select(ApplicationCode.code)
+    .where(ApplicationCode.case_id == Case.id, ApplicationCode.active == True)  # noqa: E712
+    .limit(1)
+    .scalar_subquery()
+)
+
+# Everything the dashboard/employee views read, in one pass over the source tables.
+# Only the small parts of the case JSON are extracted; agentOutputs never leaves SQLite.
+_SOURCE = (
+    select(
+        Case.id,
+        Case.candidate_name,
+        Case.role,
+        Case.nationality,
+        Case.work_location,
+        Case.start_date,
+        Case.salary,
+        Case.benefits,
+        Case.prior_notes,
+        Case.status,
+        Case.created_at,
+        func.json_extract(CaseState.state, "$.status"),
+        func.json_extract(CaseState.state, "$.riskStatus"),
+        func.json_extract(CaseState.state, "$.steps"),
+        _active_code,
+        EmployeeRecord.employee_id,
+        EmployeeRecord.full_name,
+        EmployeeRecord.email,
+        EmployeeRecord.department,
+        WorkplaceAssignment.seat_id,
+        WorkplaceAssignment.device_model,
+        WorkplaceAssignment.seating,
+        WorkplaceAssignment.asset_id,
+    )
+    .select_from(Case)
+    .outerjoin(CaseState, CaseState.case_id == Case.id)
+    .outerjoin(EmployeeRecord, EmployeeRecord.case_id == Case.id)
+    .outerjoin(WorkplaceAssignment, WorkplaceAssignment.case_id == Case.id)
+)
+
+
+def _as_dict(v: Any) -> Dict[str, Any]:
+    return v if isinstance(v, dict) else {}
+
+
+def _summary_row(r: Sequence[Any], now: datetime) -> Dict[str, Any]:
+    (
+        case_id, candidate_name, role, nationality, work_location, start_date, salary, benefits,
+        prior_notes, case_status, created_at, wizard_status, risk_status, steps_json, code,
+        employee_id, full_name, email, department, seat_id, device_model, seating, asset_id,
+    ) = r
+    steps = _as_dict(json.loads(steps_json)) if steps_json else {}
+    offer = _as_dict(steps.get("offer"))
+    seating = _as_dict(seating)
+    status = wizard_status or case_status or "UNKNOWN"
+    return {
+        "case_id": case_id,
+        "candidate_name": candidate_name,
+        "role": role,
+        "nationality": nationality,
+        "work_location": work_location,
+        "start_date": start_date,
+        "salary": salary,
+        "benefits": benefits,
+        "prior_notes": prior_notes,
+        "case_status": case_status,
+        "status": status,
+        "risk_status": risk_status or "GREEN",
+        "application_code": code,
+        "employee_id": employee_id,
+        "full_name": full_name,
+        "email": email,
+        "department": department,
+        "offer_decision": offer.get("decision"),
+        "offer_concerns": offer.get("concerns"),
+        "salary_appeal": offer.get("salaryAppeal"),
+        "seat_location": (seating.get("location") or seating.get("seat") or seat_id) if seating else seat_id,
+        "device_model": device_model,
+        "asset_id": asset_id,
+        "steps": steps,
+        "confirmed": bool(employee_id) and status in CONFIRMED_STATUSES,
+        "created_at": created_at,
+        "updated_at": now,
+    }
+
+
+def _upsert(conn: Connection, rows: List[Dict[str, Any]]) -> None:
+    # ON CONFLICT DO UPDATE (not OR REPLACE) keeps the rowid stable and fires UPDATE triggers,
+    # which the search index (app/store/search_index.py) relies on.
+    if rows:
+        stmt = sqlite_insert(CaseSummary.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CaseSummary.case_id],
+            set_={c.name: stmt.excluded[c.name] for c in CaseSummary.__table__.columns if c.name != "case_id"},
+        )
+        conn.execute(stmt, rows)
+
+
+class CaseSummaryProjector:
+    """
+    Keeps `case_summary` in step with its source tables. Every writer (CaseStore.persist_case,
+    the HR routes, bulk agent writes) calls refresh/refresh_many after its own commit; the row is
+    recomputed from the sources, so refreshes are idempotent and order-independent.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+
+    def _refresh(self, conn: Connection, case_ids: Sequence[str]) -> int:
+        ids = list(dict.fromkeys(case_ids))
+        now = datetime.utcnow()
+        found: List[Dict[str, Any]] = []
+        for start in range(0, len(ids), _IN_CHUNK):
+            chunk = ids[start:start + _IN_CHUNK]
+            found.extend(_summary_row(r, now) for r in conn.execute(_SOURCE.where(Case.id.in_(chunk))).fetchall())
+        _upsert(conn, found)
+        # Cases that no longer exist drop out of the read model.
+        gone = set(ids) - {row["case_id"] for row in found}
+        if gone:
+            conn.execute(CaseSummary.__table__.delete().where(CaseSummary.case_id.in_(list(gone))))
+        return len(found)
+
+    def refresh(self, case_id: str) -> None:
+        self.refresh_many([case_id])
+
+    def refresh_many(self, case_ids: Sequence[str]) -> int:
+        if not case_ids:
+            return 0
+        with self._lock, engine.begin() as conn:
+            return self._refresh(conn, case_ids)
+
+    def remove(self, case_id: str) -> None:
+        with self._lock, engine.begin() as conn:
+            conn.execute(CaseSummary.__table__.delete().where(CaseSummary.case_id == case_id))
+
+    def backfill(self) -> int:
+        """Rebuild the whole table from the source tables in one transaction."""
+        now = datetime.utcnow()
+        with self._lock, engine.begin() as conn:
+            rows = [_summary_row(r, now) for r in conn.execute(_SOURCE).fetchall()]
+            conn.execute(CaseSummary.__table__.delete())
+            _upsert(conn, rows)
+        return len(rows)
+
+    def ensure_built(self) -> bool:
+        """First start after upgrading: backfill if there are cases but no summary rows yet."""
+        with engine.connect() as conn:
+            has_rows = conn.execute(text("SELECT 1 FROM case_summary LIMIT 1")).fetchone()
+            has_cases = conn.execute(text("SELECT 1 FROM cases LIMIT 1")).fetchone()
+        if has_rows or not has_cases:
+            return False
+        self.backfill()
+        return True
+
+
+case_summary = CaseSummaryProjector()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="HR case_summary read model.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("backfill", help="rebuild case_summary from cases, codes, employees, workplace and case state")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine, tables=[CaseSummary.__table__])
+    if args.cmd == "backfill":
+        print(f"case_summary rebuilt: {case_summary.backfill()} cases")
+
+
+if __name__ == "__main__":
+    main()
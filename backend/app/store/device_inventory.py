@@ -0,0 +1,403 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.db.database import Base, engine
+from app.db.models import DeviceReservation, DeviceStock
+from app.store.seat_inventory import normalize_location
+
+LOW_STOCK_THRESHOLD = int(os.getenv("DEVICE_LOW_STOCK_THRESHOLD", "5"))
+
+# Opening stock for a (model, location) pair the first time it is seen.
+# Unknown models start at 0 (backordered) until a replenishment import adds units.
+DEFAULT_STOCK: Dict[str, int] = {
+    "Dell Latitude 5440": 60,
+    "Dell Latitude 7440": 20,
+    "Dell XPS 13": 3,
+    "MacBook Pro 14": 10,
+    "Standard ThinkPad": 40,
+    "Lenovo ThinkPad T14": 30,
+    "Apple MacBook Air (M2)": 15,
+    "HP EliteBook 840": 40,
+}
+
+RESERVED = "RESERVED"
+COMMITTED = "COMMITTED"
+BACKORDERED = "BACKORDERED"
+
+IN_STOCK = "IN_STOCK"
+LOW_STOCK = "LOW_STOCK"
+OUT_OF_STOCK = "OUT_OF_STOCK"
+
+_Key = Tuple[str, str]
+_IN_CHUNK = 500  # stay well under SQLite's bound-parameter limit
+
+# updated_at doubles as the backorder queue position (_replenish promotes oldest first), so a
+# case that is re-reserved while still backordered for the same key keeps its original place.
+_UPSERT_RESERVATION = (
+    "INSERT INTO device_reservations (case_id, model, location, state, stock_status, updated_at) "
+    "VALUES (:cid, :m, :l, :s, :st, :now) "
+    "ON CONFLICT(case_id) DO UPDATE SET model = excluded.model, location = excluded.location, "
+    "state = excluded.state, stock_status = excluded.stock_status, "
+    f"updated_at = CASE WHEN device_reservations.state = '{BACKORDERED}' AND excluded.state = '{BACKORDERED}' "
+    "AND device_reservations.model = excluded.model AND device_reservations.location = excluded.location "
+    "THEN device_reservations.updated_at ELSE excluded.updated_at END"
+)
+
+
+def stock_status(available: int) -> str:
+    if available <= 0:
+        return OUT_OF_STOCK
+    if available <= LOW_STOCK_THRESHOLD:
+        return LOW_STOCK
+    return IN_STOCK
+
+
+def _view(case_id: str, model: str, location: str, state: str, status: str) -> Dict[str, str]:
+    return {"caseId": case_id, "model": model, "location": location, "state": state, "stockStatus": status}
+
+
+class DeviceInventory:
+    """
+    Device stock backed by `device_stock` counters and one `device_reservations` row per case.
+
+    Every write is a conditional UPDATE on the counters (`... WHERE on_hand - reserved > 0`),
+    so concurrent orchestrations can never over-allocate. Reads (`availability`) come from an
+    in-memory copy of the counters that is refreshed from the DB for every key a write touched.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stock: Optional[Dict[_Key, Tuple[int, int, int]]] = None  # (on_hand, reserved, committed)
+
+    # ---------- cache ----------
+    def _cache(self) -> Dict[_Key, Tuple[int, int, int]]:
+        if self._stock is None:
+            with engine.connect() as conn:
+                rows = conn.execute(text("SELECT model, location, on_hand, reserved, committed FROM device_stock")).fetchall()
+            self._stock = {(m, l): (on_hand, reserved, committed) for m, l, on_hand, reserved, committed in rows}
+        return self._stock
+
+    def refresh(self) -> None:
+        with self._lock:
+            self._stock = None
+            self._cache()
+
+    def _ensure_row(self, conn: Connection, key: _Key) -> None:
+        if key in self._cache():
+            return
+        conn.execute(
+            text(
+                "INSERT OR IGNORE INTO device_stock (model, location, on_hand, reserved, committed, updated_at) "
+                "VALUES (:m, :l, :q, 0, 0, :now)"
+            ),
+            {"m": key[0], "l": key[1], "q": DEFAULT_STOCK.get(key[0], 0), "now": datetime.utcnow()},
+        )
+
+    @staticmethod
+    def _read_keys(conn: Connection, keys: Iterable[_Key]) -> Dict[_Key, Tuple[int, int, int]]:
+        out: Dict[_Key, Tuple[int, int, int]] = {}
+        for model, location in keys:
+            row = conn.execute(
+                text("SELECT on_hand, reserved, committed FROM device_stock WHERE model = :m AND location = :l"),
+                {"m": model, "l": location},
+            ).fetchone()
+            if row:
+                out[(model, location)] = (row[0], row[1], row[2])
+        return out
+
+    def _write(self, fn, *args: Any) -> Any:
+        """Run fn(conn, touched, *args) in one transaction, then sync touched keys into the cache."""
+        with self._lock:
+            touched: Set[_Key] = set()
+            with engine.begin() as conn:
+                result = fn(conn, touched, *args)
+                fresh = self._read_keys(conn, touched)
+            self._cache().update(fresh)
+            return result
+
+    # ---------- transactional steps ----------
+    def _hold(self, conn: Connection, touched: Set[_Key], key: _Key) -> Optional[str]:
+        """Take one unit of `key` if available. Returns the stock status after the hold, or None."""
+        self._ensure_row(conn, key)
+        touched.add(key)
+        row = conn.execute(
+            text(
+                "UPDATE device_stock SET reserved = reserved + 1, updated_at = :now "
+                "WHERE model = :m AND location = :l AND on_hand - reserved > 0 "
+                "RETURNING on_hand - reserved"
+            ),
+            {"m": key[0], "l": key[1], "now": datetime.utcnow()},
+        ).fetchone()
+        return stock_status(row[0]) if row else None
+
+    @staticmethod
+    def _unhold(conn: Connection, touched: Set[_Key], key: _Key) -> None:
+        touched.add(key)
+        conn.execute(
+            text(
+                "UPDATE device_stock SET reserved = reserved - 1, updated_at = :now "
+                "WHERE model = :m AND location = :l AND reserved > 0"
+            ),
+            {"m": key[0], "l": key[1], "now": datetime.utcnow()},
+        )
+
+    def _reserve_one(self, conn: Connection, touched: Set[_Key], case_id: str, model: str, location: str) -> Dict[str, str]:
+        key = (model, location)
+        row = conn.execute(
+            text("SELECT model, location, state, stock_status FROM device_reservations WHERE case_id = :cid"),
+            {"cid": case_id},
+        ).fetchone()
+        if row:
+            held_key, state = (row[0], row[1]), row[2]
+            if state == COMMITTED or (state == RESERVED and held_key == key):
+                return _view(case_id, row[0], row[1], state, row[3])
+            if state == RESERVED:
+                # Model or location changed (e.g. Workplace overrode the fallback): swap the hold.
+                self._unhold(conn, touched, held_key)
+
+        status = self._hold(conn, touched, key)
+        state = RESERVED if status else BACKORDERED
+        status = status or OUT_OF_STOCK
+        conn.execute(
+            text(_UPSERT_RESERVATION),
+            {"cid": case_id, "m": model, "l": location, "s": state, "st": status, "now": datetime.utcnow()},
+        )
+        return _view(case_id, model, location, state, status)
+
+    def _reserve_many(self, conn: Connection, touched: Set[_Key], items: Sequence[Tuple[str, str, str]]) -> Dict[str, Dict[str, str]]:
+        out: Dict[str, Dict[str, str]] = {}
+        if len({case_id for case_id, _, _ in items}) != len(items):
+            # Repeated case ids: replay in order so later entries see earlier holds.
+            for case_id, model, location in items:
+                out[case_id] = self._reserve_one(conn, touched, case_id, model, location)
+            return out
+
+        held: Dict[str, Tuple[str, str, str, str]] = {}
+        ids = [case_id for case_id, _, _ in items]
+        for start in range(0, len(ids), _IN_CHUNK):
+            chunk = ids[start:start + _IN_CHUNK]
+            params = {f"c{i}": cid for i, cid in enumerate(chunk)}
+            rows = conn.execute(
+                text(
+                    "SELECT case_id, model, location, state, stock_status FROM device_reservations "
+                    f"WHERE case_id IN ({', '.join(':' + k for k in params)})"
+                ),
+                params,
+            ).fetchall()
+            held.update({r[0]: (r[1], r[2], r[3], r[4]) for r in rows})
+
+        # New holds grouped per key (input order kept inside each group).
+        wanted: Dict[_Key, List[str]] = {}
+        for case_id, model, location in items:
+            key = (model, location)
+            row = held.get(case_id)
+            if row:
+                if row[2] == COMMITTED or (row[2] == RESERVED and (row[0], row[1]) == key):
+                    out[case_id] = _view(case_id, row[0], row[1], row[2], row[3])
+                    continue
+                if row[2] == RESERVED:
+                    self._unhold(conn, touched, (row[0], row[1]))
+            wanted.setdefault(key, []).append(case_id)
+
+        now = datetime.utcnow()
+        upserts: List[Dict[str, Any]] = []
+        for key, case_ids in wanted.items():
+            self._ensure_row(conn, key)
+            touched.add(key)
+            before = conn.execute(
+                text("SELECT on_hand - reserved FROM device_stock WHERE model = :m AND location = :l"),
+                {"m": key[0], "l": key[1]},
+            ).scalar() or 0
+            take = min(len(case_ids), max(before, 0))
+            if take:
+                # Same guard as _hold, for `take` units at once.
+                ok = conn.execute(
+                    text(
+                        "UPDATE device_stock SET reserved = reserved + :k, updated_at = :now "
+                        "WHERE model = :m AND location = :l AND on_hand - reserved >= :k RETURNING 1"
+                    ),
+                    {"k": take, "m": key[0], "l": key[1], "now": now},
+                ).fetchone()
+                if ok is None:
+                    # Counters moved under us (another process); fall back to one hold at a time.
+                    for case_id in case_ids:
+                        out[case_id] = self._reserve_one(conn, touched, case_id, key[0], key[1])
+                    continue
+            for i, case_id in enumerate(case_ids):
+                state, status = (RESERVED, stock_status(before - i - 1)) if i < take else (BACKORDERED, OUT_OF_STOCK)
+                out[case_id] = _view(case_id, key[0], key[1], state, status)
+                upserts.append({"cid": case_id, "m": key[0], "l": key[1], "s": state, "st": status, "now": now})
+
+        if upserts:
+            conn.execute(text(_UPSERT_RESERVATION), upserts)
+        return out
+
+    def _commit(self, conn: Connection, touched: Set[_Key], case_id: str) -> Optional[Dict[str, str]]:
+        row = conn.execute(
+            text("SELECT model, location, state, stock_status FROM device_reservations WHERE case_id = :cid"),
+            {"cid": case_id},
+        ).fetchone()
+        if not row:
+            return None
+        if row[2] != RESERVED:
+            return _view(case_id, row[0], row[1], row[2], row[3])
+        touched.add((row[0], row[1]))
+        conn.execute(
+            text(
+                "UPDATE device_stock SET on_hand = on_hand - 1, reserved = reserved - 1, committed = committed + 1, "
+                "updated_at = :now WHERE model = :m AND location = :l AND reserved > 0 AND on_hand > 0"
+            ),
+            {"m": row[0], "l": row[1], "now": datetime.utcnow()},
+        )
+        conn.execute(
+            text("UPDATE device_reservations SET state = :s, updated_at = :now WHERE case_id = :cid"),
+            {"s": COMMITTED, "cid": case_id, "now": datetime.utcnow()},
+        )
+        return _view(case_id, row[0], row[1], COMMITTED, row[3])
+
+    def _release(self, conn: Connection, touched: Set[_Key], case_id: str) -> Optional[Dict[str, str]]:
+        row = conn.execute(
+            text("SELECT model, location, state, stock_status FROM device_reservations WHERE case_id = :cid"),
+            {"cid": case_id},
+        ).fetchone()
+        if not row:
+            return None
+        if row[2] == RESERVED:
+            self._unhold(conn, touched, (row[0], row[1]))
+        conn.execute(text("DELETE FROM device_reservations WHERE case_id = :cid"), {"cid": case_id})
+        return _view(case_id, row[0], row[1], row[2], row[3])
+
+    def _replenish(self, conn: Connection, touched: Set[_Key], rows: Sequence[Dict[str, Any]]) -> Dict[str, int]:
+        now = datetime.utcnow()
+        conn.execute(
+            text(
+                "INSERT INTO device_stock (model, location, on_hand, reserved, committed, updated_at) "
+                "VALUES (:m, :l, :q, 0, 0, :now) "
+                "ON CONFLICT(model, location) DO UPDATE SET on_hand = on_hand + excluded.on_hand, "
+                "updated_at = excluded.updated_at"
+            ),
+            [{**r, "now": now} for r in rows],
+        )
+        keys = {(r["m"], r["l"]) for r in rows}
+        touched |= keys
+
+        # New units go to backordered cases first, oldest hold first.
+        promoted = 0
+        for model, location in keys:
+            waiting = conn.execute(
+                text(
+                    "SELECT case_id FROM device_reservations WHERE model = :m AND location = :l AND state = :s "
+                    "ORDER BY updated_at, case_id"
+                ),
+                {"m": model, "l": location, "s": BACKORDERED},
+            ).fetchall()
+            for (case_id,) in waiting:
+                status = self._hold(conn, touched, (model, location))
+                if status is None:
+                    break  # out of units again; the rest keep their place in the queue
+                conn.execute(
+                    text("UPDATE device_reservations SET state = :s, stock_status = :st, updated_at = :now WHERE case_id = :cid"),
+                    {"s": RESERVED, "st": status, "cid": case_id, "now": now},
+                )
+                promoted += 1
+        return {"rows": len(rows), "promoted": promoted}
+
+    # ---------- public API ----------
+    def availability(self, model: str, work_location: Optional[str]) -> Dict[str, Any]:
+        """
+        Cached stock level for (model, location); no reservation is made and nothing is written.
+        A key never reserved or replenished reports its DEFAULT_STOCK opening level.
+        """
+        key = (model, normalize_location(work_location))
+        on_hand, reserved, _ = self._cache().get(key, (DEFAULT_STOCK.get(model, 0), 0, 0))
+        available = on_hand - reserved
+        return {"model": model, "location": key[1], "available": available, "status": stock_status(available)}
+
+    def reserve(self, case_id: str, model: str, work_location: Optional[str]) -> Dict[str, str]:
+        """
+        Hold one `model` unit at the location for `case_id` (idempotent per case).
+        A different model/location for the same case moves the hold; a committed device is never moved.
+        """
+        return self._write(self._reserve_one, case_id, model, normalize_location(work_location))
+
+    def reserve_many(self, items: Sequence[Tuple[str, str, Optional[str]]]) -> Dict[str, Dict[str, str]]:
+        """Batch reserve for (case_id, model, work_location) triples in one transaction."""
+        normalized = [(cid, model, normalize_location(loc)) for cid, model, loc in items]
+        return self._write(self._reserve_many, normalized)
+
+    def commit(self, case_id: str) -> Optional[Dict[str, str]]:
+        """Device issued: move the case's unit from reserved to committed."""
+        return self._write(self._commit, case_id)
+
+    def release(self, case_id: str) -> Optional[Dict[str, str]]:
+        """Drop the case's hold (returns a reserved unit to stock)."""
+        return self._write(self._release, case_id)
+
+    def replenish(self, items: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Bulk import of {"model", "location", "quantity"} rows (quantities are added to on_hand).
+        Backordered cases for the replenished keys are promoted to RESERVED while units last.
+        """
+        rows = []
+        for item in items:
+            model = str(item.get("model") or "").strip()
+            quantity = int(item.get("quantity") or 0)
+            if not model or quantity <= 0:
+                raise ValueError(f"Replenishment rows need a model and a positive quantity: {item!r}")
+            rows.append({"m": model, "l": normalize_location(item.get("location")), "q": quantity})
+        if not rows:
+            return {"rows": 0, "promoted": 0}
+        return self._write(self._replenish, rows)
+
+    def stats(self, work_location: Optional[str] = None) -> List[Dict[str, Any]]:
+        loc = normalize_location(work_location) if work_location else None
+        out = []
+        for (model, location), (on_hand, reserved, committed) in sorted(self._cache().items()):
+            if loc and location != loc:
+                continue
+            out.append({
+                "model": model,
+                "location": location,
+                "onHand": on_hand,
+                "reserved": reserved,
+                "committed": committed,
+                "available": on_hand - reserved,
+                "status": stock_status(on_hand - reserved),
+            })
+        return out
+
+
+device_inventory = DeviceInventory()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Device stock maintenance.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    rep = sub.add_parser("replenish", help="add stock from a CSV with columns model,location,quantity")
+    rep.add_argument("csv_path")
+    show = sub.add_parser("stats", help="print current stock levels")
+    show.add_argument("--location", default=None)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine, tables=[DeviceStock.__table__, DeviceReservation.__table__])
+    if args.cmd == "replenish":
+        with open(args.csv_path, newline="", encoding="utf-8") as f:
+            result = device_inventory.replenish(csv.DictReader(f))
+        print(f"replenished {result['rows']} rows, promoted {result['promoted']} backorders")
+    else:
+        for row in device_inventory.stats(args.location):
+            print(f"{row['location']:<8} {row['model']:<24} on_hand={row['onHand']:<5} reserved={row['reserved']:<5} "
+                  f"committed={row['committed']:<5} {row['status']}")
+
+
+if __name__ == "__main__":
+    main()
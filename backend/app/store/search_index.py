@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import argparse
+import re
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+
+from app.db.database import Base, engine
+from app.db.models import CaseSummary
+
+# Columns indexed from case_summary (the FTS table is external-content: it stores only the index).
+SEARCH_COLUMNS = (
+    "candidate_name",
+    "role",
+    "work_location",
+    "employee_id",
+    "email",
+    "seat_location",
+    "asset_id",
+    "case_id",
+)
+
+# bm25 weights, same order as SEARCH_COLUMNS: names and identifiers outrank role/location hits.
+_WEIGHTS = (10.0, 2.0, 1.0, 8.0, 5.0, 3.0, 8.0, 8.0)
+
+_COLS = ", ".join(SEARCH_COLUMNS)
+_NEW = ", ".join(f"new.{c}" for c in SEARCH_COLUMNS)
+_OLD = ", ".join(f"old.{c}" for c in SEARCH_COLUMNS)
+_CHANGED = " OR ".join(f"old.{c} IS NOT new.{c}" for c in SEARCH_COLUMNS)
+
+# '-' is a token character so ids and tags ("EMP-CASE-1A2B", "LAP-0042", "HQ-3A-41") prefix-match as a whole;
+# emails split on '.'/'@' so they don't add one unique token per row for name prefixes to expand over.
+# prefix='2 3' keeps 2-3 character typeahead queries off the full term scan.
+_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS case_search USING fts5(
+        {_COLS},
+        content='case_summary', content_rowid='rowid',
+        tokenize="unicode61 remove_diacritics 2 tokenchars '-'", prefix='2 3'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS case_summary_search_ai AFTER INSERT ON case_summary BEGIN
+        INSERT INTO case_search(rowid, {_COLS}) VALUES (new.rowid, {_NEW});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS case_summary_search_ad AFTER DELETE ON case_summary BEGIN
+        INSERT INTO case_search(case_search, rowid, {_COLS}) VALUES ('delete', old.rowid, {_OLD});
+    END""",
+    # Most summary refreshes touch status/steps only; skip the index unless a searchable column changed.
+    f"""CREATE TRIGGER IF NOT EXISTS case_summary_search_au AFTER UPDATE ON case_summary WHEN {_CHANGED} BEGIN
+        INSERT INTO case_search(case_search, rowid, {_COLS}) VALUES ('delete', old.rowid, {_OLD});
+        INSERT INTO case_search(rowid, {_COLS}) VALUES (new.rowid, {_NEW});
+    END""",
+]
+
+_TERM = re.compile(r"[\w@.\-]+", re.UNICODE)
+MAX_TERMS = 8
+
+# bm25 has to score every match before it can sort, so only queries with at most this many
+# matches are ranked; broader ones (a 2-letter prefix over a million rows) page newest-first.
+RANK_CAP = 500
+
+
+def ensure_search_index() -> bool:
+    """Create the FTS table and sync triggers; index existing summary rows the first time. Returns True if built."""
+    with engine.begin() as conn:
+        existed = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'case_search'")
+        ).fetchone()
+        for stmt in _DDL:
+            conn.execute(text(stmt))
+        if not existed:
+            conn.execute(text("INSERT INTO case_search(case_search) VALUES ('rebuild')"))
+    return not existed
+
+
+def rebuild_search_index() -> None:
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO case_search(case_search) VALUES ('rebuild')"))
+
+
+def match_expression(query: str) -> Optional[str]:
+    """
+    User input -> FTS5 MATCH expression: every term must match as a prefix ("soft eng" finds
+    "Software Engineer"). Terms are quoted, so FTS operators in the input are treated as text.
+    """
+    terms = [t.strip(".-@") for t in _TERM.findall(query or "")]
+    terms = [t for t in terms if t][:MAX_TERMS]
+    if not terms:
+        return None
+    return " ".join(f'"{t}"*' for t in terms)
+
+
+_SELECT = """
+    SELECT s.case_id, s.candidate_name, s.role, s.work_location, s.status, s.risk_status,
+           s.employee_id, s.email, s.seat_location, s.asset_id, {score} AS score
+    FROM case_search
+    JOIN case_summary s ON s.rowid = case_search.rowid
+    WHERE case_search MATCH :q {scope}
+    ORDER BY {order}
+    LIMIT :limit OFFSET :offset
+"""
+
+
+def search(query: str, limit: int = 20, offset: int = 0, employees_only: bool = False) -> Dict[str, Any]:
+    """
+    Page of case_summary rows matching `query`: bm25-ranked when the match set is at most
+    RANK_CAP rows, newest-first otherwise. hasMore instead of a full count.
+    """
+    expr = match_expression(query)
+    if not expr:
+        return {"query": query, "results": [], "limit": limit, "offset": offset, "hasMore": False, "ranked": False}
+
+    scope = "AND s.confirmed = 1" if employees_only else ""
+    params = {"q": expr, "limit": limit + 1, "offset": offset}
+    with engine.connect() as conn:
+        # Cheap probe: FTS walks doclists in rowid order and stops at the cap.
+        probe = conn.execute(
+            text("SELECT count(*) FROM (SELECT rowid FROM case_search WHERE case_search MATCH :q LIMIT :cap)"),
+            {"q": expr, "cap": RANK_CAP + 1},
+        ).scalar()
+        ranked = probe <= RANK_CAP
+        if ranked:
+            score = f"bm25(case_search, {', '.join(str(w) for w in _WEIGHTS)})"
+            sql = _SELECT.format(score=score, scope=scope, order="score, case_search.rowid DESC")
+        else:
+            sql = _SELECT.format(score="0.0", scope=scope, order="case_search.rowid DESC")
+        rows = conn.execute(text(sql), params).fetchall()
+
+    results: List[Dict[str, Any]] = [
+        {
+            "caseId": r[0],
+            "candidateName": r[1],
+            "role": r[2],
+            "workLocation": r[3],
+            "status": r[4],
+            "riskStatus": r[5],
+            "employeeId": r[6],
+            "email": r[7],
+            "seat": r[8],
+            "assetId": r[9],
+            "score": round(-float(r[10]), 4),  # bm25 is lower-is-better; expose higher-is-better
+        }
+        for r in rows[:limit]
+    ]
+    return {
+        "query": query,
+        "results": results,
+        "limit": limit,
+        "offset": offset,
+        "hasMore": len(rows) > limit,
+        "ranked": ranked,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="case_search FTS index maintenance.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("rebuild", help="re-index every case_summary row")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine, tables=[CaseSummary.__table__])
+    ensure_search_index()
+    if args.cmd == "rebuild":
+        rebuild_search_index()
+        print("case_search rebuilt")
+
+
+if __name__ == "__main__":
+    main()
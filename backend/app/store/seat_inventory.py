@@ -0,0 +1,430 @@
+from __future__ import annotations
+
+import heapq
+import threading
+import zlib
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+
+from app.db.database import SessionLocal, engine
+from app.db.models import Seat
+
+# Default floor plan for any location without an explicit layout.
+# Matches the historic seat id shape: {LOC}-{floor}{zone}-{desk}.
+DEFAULT_LAYOUT = {"floors": [2, 3, 4, 5, 6], "zones": ["A", "B", "C", "D"], "desks": list(range(10, 100))}
+LOCATION_LAYOUTS: Dict[str, Dict[str, List]] = {}
+
+
+class SeatConflict(Exception):
+    """Seat exists in inventory but is held by another case."""
+
+
+def normalize_location(work_location: Optional[str]) -> str:
+    return (work_location or "HQ").strip().upper()
+
+
+def seat_id_for(location: str, floor: int, zone: str, desk: int) -> str:
+    return f"{location}-{floor}{zone}-{desk}"
+
+
+@dataclass
+class _ZoneIndex:
+    floor: int
+    zone: str
+    # Min-heap of free desk numbers with lazy deletion: `free` is the source of truth, the heap
+    # may hold stale entries (desks taken by a pinned override) that pop() skips.
+    heap: List[int] = field(default_factory=list)
+    free: Set[int] = field(default_factory=set)
+
+    @property
+    def key(self) -> str:
+        return f"{self.floor}{self.zone}"
+
+    def push(self, desk: int) -> None:
+        if desk not in self.free:
+            self.free.add(desk)
+            heapq.heappush(self.heap, desk)
+
+    def pop(self) -> Optional[int]:
+        while self.heap:
+            desk = heapq.heappop(self.heap)
+            if desk in self.free:
+                self.free.discard(desk)
+                return desk
+        return None
+
+    def take(self, desk: int) -> bool:
+        """Claim a specific desk in O(1); its heap entry is dropped lazily."""
+        if desk not in self.free:
+            return False
+        self.free.discard(desk)
+        return True
+
+
+@dataclass
+class _LocationIndex:
+    location: str
+    zones: List[_ZoneIndex]
+    by_key: Dict[str, _ZoneIndex]
+    seat_of_case: Dict[str, str]
+    case_of_seat: Dict[str, str]
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def free_count(self) -> int:
+        return sum(len(z.free) for z in self.zones)
+
+
+class SeatInventory:
+    """
+    Seat allocation backed by the `seats` table.
+
+    Each location keeps an in-memory index: one min-heap of free desks per
+    zone, plus case<->seat maps. Allocation pops a heap (O(log n)) under the
+    location lock, then claims the row with a conditional UPDATE
+    (`... WHERE case_id IS NULL`), so the DB stays the arbiter even if the
+    index is stale.
+    """
+
+    def __init__(self) -> None:
+        self._locations: Dict[str, _LocationIndex] = {}
+        self._global_lock = threading.Lock()
+
+    # ---------- index ----------
+    def _layout(self, location: str) -> Dict[str, List]:
+        return LOCATION_LAYOUTS.get(location, DEFAULT_LAYOUT)
+
+    def _seed_location(self, location: str) -> None:
+        layout = self._layout(location)
+        rows = [
+            {"seat_id": seat_id_for(location, f, z, d), "location": location, "floor": f, "zone": z, "desk": d}
+            for f in layout["floors"]
+            for z in layout["zones"]
+            for d in layout["desks"]
+        ]
+        with engine.begin() as conn:
+            conn.execute(Seat.__table__.insert().prefix_with("OR IGNORE"), rows)
+
+    def _load(self, location: str) -> _LocationIndex:
+        idx = self._locations.get(location)
+        if idx is not None:
+            return idx
+        with self._global_lock:
+            idx = self._locations.get(location)
+            if idx is not None:
+                return idx
+
+            with engine.connect() as conn:
+                rows = conn.execute(
+                    text("SELECT seat_id, floor, zone, desk, case_id FROM seats WHERE location = :loc"),
+                    {"loc": location},
+                ).fetchall()
+            if not rows:
+                self._seed_location(location)
+                with engine.connect() as conn:
+                    rows = conn.execute(
+                        text("SELECT seat_id, floor, zone, desk, case_id FROM seats WHERE location = :loc"),
+                        {"loc": location},
+                    ).fetchall()
+
+            by_key: Dict[str, _ZoneIndex] = {}
+            seat_of_case: Dict[str, str] = {}
+            case_of_seat: Dict[str, str] = {}
+            for seat_id, floor, zone, desk, case_id in rows:
+                key = f"{floor}{zone}"
+                z = by_key.get(key)
+                if z is None:
+                    z = by_key[key] = _ZoneIndex(floor=floor, zone=zone)
+                if case_id:
+                    seat_of_case[case_id] = seat_id
+                    case_of_seat[seat_id] = case_id
+                else:
+                    z.free.add(desk)
+            for z in by_key.values():
+                z.heap = sorted(z.free)
+
+            zones = sorted(by_key.values(), key=lambda z: (z.floor, z.zone))
+            idx = _LocationIndex(location, zones, by_key, seat_of_case, case_of_seat)
+            self._locations[location] = idx
+            return idx
+
+    def invalidate(self, location: Optional[str] = None) -> None:
+        with self._global_lock:
+            if location is None:
+                self._locations.clear()
+            else:
+                self._locations.pop(normalize_location(location), None)
+
+    # ---------- helpers ----------
+    @staticmethod
+    def _zone_order(idx: _LocationIndex, preference: str) -> Iterable[_ZoneIndex]:
+        # Stable per-preference starting zone (no global RNG), then walk neighbours.
+        n = len(idx.zones)
+        start = zlib.crc32(preference.encode("utf-8")) % n if preference and n else 0
+        for i in range(n):
+            yield idx.zones[(start + i) % n]
+
+    @staticmethod
+    def _parse_seat(location: str, seat_id: str) -> Optional[Tuple[str, int]]:
+        prefix = f"{location}-"
+        if not seat_id.startswith(prefix):
+            return None
+        try:
+            zone_key, desk = seat_id[len(prefix):].rsplit("-", 1)
+            return zone_key, int(desk)
+        except ValueError:
+            return None
+
+    def _describe(self, idx: _LocationIndex, seat_id: str) -> Dict[str, object]:
+        parsed = self._parse_seat(idx.location, seat_id)
+        z = idx.by_key.get(parsed[0]) if parsed else None
+        return {
+            "seatId": seat_id,
+            "building": idx.location,
+            "floor": z.floor if z else None,
+            "zone": z.zone if z else None,
+        }
+
+    def _claim_rows(self, claims: Sequence[Tuple[str, str]]) -> List[bool]:
+        """Conditionally claim (seat_id, case_id) pairs in one transaction."""
+        now = datetime.utcnow()
+        ok: List[bool] = []
+        db = SessionLocal()
+        try:
+            for seat_id, case_id in claims:
+                res = db.execute(
+                    text(
+                        "UPDATE seats SET case_id = :cid, assigned_at = :now "
+                        "WHERE seat_id = :sid AND case_id IS NULL"
+                    ),
+                    {"cid": case_id, "now": now, "sid": seat_id},
+                )
+                ok.append(res.rowcount == 1)
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+        return ok
+
+    def _held_in_db(self, case_id: str) -> Optional[str]:
+        with engine.connect() as conn:
+            row = conn.execute(text("SELECT seat_id FROM seats WHERE case_id = :cid"), {"cid": case_id}).fetchone()
+        return row[0] if row else None
+
+    # ---------- public API ----------
+    def seat_for_case(self, location: str, case_id: str) -> Optional[str]:
+        return self._load(normalize_location(location)).seat_of_case.get(case_id)
+
+    def allocate(self, work_location: Optional[str], case_id: str, preference: str = "") -> Optional[Dict[str, object]]:
+        """
+        Give `case_id` a seat at the location (idempotent). `preference` (e.g. role family)
+        picks the starting zone so similar hires cluster. Returns None when the location is full.
+        """
+        result = self.allocate_many(work_location, [(case_id, preference)])
+        return result.get(case_id)
+
+    def allocate_many(
+        self,
+        work_location: Optional[str],
+        requests: Sequence[Tuple[str, str]],
+        zone_plan: Optional[Dict[str, str]] = None,
+        _attempt: int = 0,
+    ) -> Dict[str, Optional[Dict[str, object]]]:
+        """
+        Allocate seats for many (case_id, preference) pairs under one lock and one transaction.
+        `zone_plan` optionally pins case_id -> zone key (e.g. "3B"); pinned cases fall back to
+        the preference walk if that zone is full.
+        """
+        location = normalize_location(work_location)
+        idx = self._load(location)
+        out: Dict[str, Optional[Dict[str, object]]] = {}
+        retry: List[Tuple[str, str]] = []
+        stale_index = False
+
+        with idx.lock:
+            pending: List[Tuple[str, str, str, _ZoneIndex, int]] = []
+            for case_id, preference in requests:
+                if case_id in out:
+                    continue
+                held = idx.seat_of_case.get(case_id)
+                if held:
+                    out[case_id] = self._describe(idx, held)
+                    continue
+                zones: Iterable[_ZoneIndex] = self._zone_order(idx, preference)
+                pinned = (zone_plan or {}).get(case_id)
+                if pinned and pinned in idx.by_key:
+                    zones = [idx.by_key[pinned], *zones]
+                chosen = next((z for z in zones if z.free), None)
+                if chosen is None:
+                    out[case_id] = None
+                    continue
+                desk = chosen.pop()
+                seat_id = seat_id_for(location, chosen.floor, chosen.zone, desk)
+                pending.append((case_id, preference, seat_id, chosen, desk))
+                out[case_id] = None  # placeholder; also dedupes repeated case ids
+
+            if pending:
+                try:
+                    claimed = self._claim_rows([(seat_id, case_id) for case_id, _, seat_id, _, _ in pending])
+                except IntegrityError:
+                    # A case already holds a seat in the DB (stale index, or it moved location).
+                    for _, _, _, zone, desk in pending:
+                        zone.push(desk)
+                    claimed = None
+                    stale_index = True
+
+                for i, (case_id, preference, seat_id, _, _) in enumerate(pending):
+                    if claimed is None or not claimed[i]:
+                        # Seat taken outside this index: it stays off the free list; try another.
+                        retry.append((case_id, preference))
+                        continue
+                    idx.seat_of_case[case_id] = seat_id
+                    idx.case_of_seat[seat_id] = case_id
+                    out[case_id] = self._describe(idx, seat_id)
+
+        if stale_index:
+            for case_id, _ in retry:
+                held = self._held_in_db(case_id)
+                if held and not held.startswith(f"{location}-"):
+                    self.release(case_id)
+            self.invalidate(location)
+        if retry and _attempt < 3:
+            out.update(self.allocate_many(location, retry, zone_plan, _attempt + 1))
+        return out
+
+    def _known(self, location: str) -> Optional[_LocationIndex]:
+        """Index for a location that already has seats; never seeds a new layout."""
+        idx = self._locations.get(location)
+        if idx is not None:
+            return idx
+        with engine.connect() as conn:
+            exists = conn.execute(text("SELECT 1 FROM seats WHERE location = :loc LIMIT 1"), {"loc": location}).fetchone()
+        return self._load(location) if exists else None
+
+    def _resolve(
+        self, seat_id: str, work_location: Optional[str]
+    ) -> Optional[Tuple[str, _LocationIndex, _ZoneIndex, int]]:
+        """(canonical seat id, index, zone, desk) for a desk of an existing location, else None."""
+        seat_id = seat_id.strip().upper()
+        if work_location:
+            location = normalize_location(work_location)
+        else:
+            parts = seat_id.rsplit("-", 2)
+            location = parts[0].strip() if len(parts) == 3 else ""
+        idx = self._known(location) if location else None
+        parsed = self._parse_seat(location, seat_id) if idx is not None else None
+        zone = idx.by_key.get(parsed[0]) if parsed else None
+        if zone is None or (parsed[1] not in zone.free and seat_id not in idx.case_of_seat):
+            # Not a desk of this layout (or a desk the index doesn't know): free text.
+            return None
+        return seat_id, idx, zone, parsed[1]
+
+    def resolve_seat(self, seat_id: str, work_location: Optional[str] = None) -> Optional[str]:
+        """Canonical id of an inventory seat (as assign_seat would store it), or None for free text."""
+        resolved = self._resolve(seat_id, work_location)
+        return resolved[0] if resolved else None
+
+    def assign_seat(self, case_id: str, seat_id: str, work_location: Optional[str] = None) -> Optional[str]:
+        """
+        Pin a specific seat (HR manual override). Releases the case's previous seat.
+        Returns the canonical seat id, or None if `seat_id` is not a seat of an existing inventory
+        location (free text; the old seat is still released). Raises SeatConflict if it is taken.
+        """
+        resolved = self._resolve(seat_id, work_location)
+        if resolved is None:
+            self.release(case_id)
+            return None
+        seat_id, idx, zone, desk = resolved
+
+        with idx.lock:
+            holder = idx.case_of_seat.get(seat_id)
+            if holder == case_id:
+                return seat_id
+            if holder is not None:
+                raise SeatConflict(f"Seat {seat_id} is assigned to {holder}")
+            if not zone.take(desk):
+                raise SeatConflict(f"Seat {seat_id} is not available")
+            # The case keeps its old seat unless the new one is actually claimed.
+            previous = self._move_row(case_id, seat_id)
+            if previous is False:
+                raise SeatConflict(f"Seat {seat_id} was taken concurrently")
+            idx.seat_of_case[case_id] = seat_id
+            idx.case_of_seat[seat_id] = case_id
+        if previous:
+            self._unindex(case_id, previous)
+        return seat_id
+
+    def _move_row(self, case_id: str, seat_id: str) -> Union[Optional[str], bool]:
+        """
+        In one transaction, free the case's current seat and claim `seat_id` (if still free).
+        Returns the freed seat id (None if the case had none), or False if the claim lost a race;
+        nothing is changed then.
+        """
+        db = SessionLocal()
+        try:
+            previous = db.execute(text("SELECT seat_id FROM seats WHERE case_id = :cid"), {"cid": case_id}).scalar()
+            if previous:
+                db.execute(
+                    text("UPDATE seats SET case_id = NULL, assigned_at = NULL WHERE seat_id = :sid AND case_id = :cid"),
+                    {"sid": previous, "cid": case_id},
+                )
+            res = db.execute(
+                text("UPDATE seats SET case_id = :cid, assigned_at = :now WHERE seat_id = :sid AND case_id IS NULL"),
+                {"cid": case_id, "now": datetime.utcnow(), "sid": seat_id},
+            )
+            if res.rowcount != 1:
+                db.rollback()
+                return False
+            db.commit()
+            return previous
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _unindex(self, case_id: str, held: str) -> None:
+        """Return a seat the DB no longer assigns to `case_id` to its location's free list."""
+        location = held.rsplit("-", 2)[0]
+        idx = self._locations.get(location)
+        if idx is None:
+            return
+        with idx.lock:
+            if idx.case_of_seat.get(held) == case_id:
+                del idx.case_of_seat[held]
+            if idx.seat_of_case.get(case_id) == held:
+                del idx.seat_of_case[case_id]
+            parsed = self._parse_seat(location, held)
+            zone = idx.by_key.get(parsed[0]) if parsed else None
+            if zone is not None:
+                zone.push(parsed[1])
+
+    def release(self, case_id: str) -> Optional[str]:
+        """Free whatever seat `case_id` holds (any location). Returns the released seat id."""
+        held = self._held_in_db(case_id)
+        if not held:
+            return None
+        with engine.begin() as conn:
+            conn.execute(
+                text("UPDATE seats SET case_id = NULL, assigned_at = NULL WHERE seat_id = :sid AND case_id = :cid"),
+                {"sid": held, "cid": case_id},
+            )
+        self._unindex(case_id, held)
+        return held
+
+    def stats(self, work_location: Optional[str]) -> Dict[str, object]:
+        idx = self._load(normalize_location(work_location))
+        return {
+            "location": idx.location,
+            "zones": {z.key: len(z.free) for z in idx.zones},
+            "free": idx.free_count(),
+            "occupied": len(idx.seat_of_case),
+        }
+
+
+seat_inventory = SeatInventory()
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import itertools
+import json
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Pattern, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLICY_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "policies", "compliance_policy.json")
+POLICY_PATH = os.getenv("COMPLIANCE_POLICY_PATH", DEFAULT_POLICY_PATH)
+RELOAD_CHECK_SECONDS = float(os.getenv("COMPLIANCE_POLICY_RELOAD_SECONDS", "2"))
+
+ANY = "*"
+
+
+@dataclass(frozen=True)
+class PolicyEntry:
+    docs: Mapping[str, str]
+    visa_weeks: int
+    risks: Tuple[str, ...]
+
+
+class CompiledPolicy:
+    """
+    Immutable, precompiled view of the compliance policy file.
+
+    Every (nationality, location, role-class set) combination the policy can
+    distinguish is expanded into `table` at load time; unknown nationalities
+    and locations fall back to the "*" rows, so a lookup is one dict get.
+    """
+
+    def __init__(self, raw: Dict[str, Any], source: str = "", mtime_ns: int = 0) -> None:
+        self.version = str(raw.get("version") or "")
+        self.source = source
+        self.mtime_ns = mtime_ns
+
+        self._aliases = {str(k).strip().upper(): str(v).strip().upper() for k, v in (raw.get("locationAliases") or {}).items()}
+
+        self._role_classes: List[Tuple[str, Pattern[str]]] = []
+        for rc in raw.get("roleClasses") or []:
+            keywords = [k for k in (rc.get("keywords") or []) if k]
+            if not rc.get("name") or not keywords:
+                raise ValueError(f"roleClasses entry needs name + keywords: {rc!r}")
+            pattern = re.compile("|".join(re.escape(k) for k in keywords), re.IGNORECASE)
+            self._role_classes.append((str(rc["name"]), pattern))
+
+        documents = raw.get("documents") or {}
+        visa = raw.get("visaWeeks") or {}
+        rules: List[Tuple[Dict[str, Any], str]] = []
+        for rule in raw.get("riskRules") or []:
+            when = dict(rule.get("when") or {})
+            if "location" in when:
+                when["location"] = self._canonical_loc(when["location"])
+            if "nationality" in when:
+                when["nationality"] = self._nat(when["nationality"])
+            rules.append((when, str(rule["message"])))
+
+        docs_base = dict(documents.get("base") or {})
+        docs_by_nat = {self._nat(k): dict(v) for k, v in (documents.get("byNationality") or {}).items()}
+        docs_by_loc = {self._canonical_loc(k): dict(v) for k, v in (documents.get("byLocation") or {}).items()}
+        docs_by_class = {str(k): dict(v) for k, v in (documents.get("byRoleClass") or {}).items()}
+
+        visa_default = int(visa.get("default", 0))
+        visa_by_nat = {self._nat(k): int(v) for k, v in (visa.get("byNationality") or {}).items()}
+        visa_by_loc: Dict[str, Tuple[Optional[int], Dict[str, int]]] = {}
+        for loc, spec in (visa.get("byLocation") or {}).items():
+            default = spec.get("default")
+            visa_by_loc[self._canonical_loc(loc)] = (
+                int(default) if default is not None else None,
+                {self._nat(k): int(v) for k, v in (spec.get("byNationality") or {}).items()},
+            )
+
+        nationalities = set(docs_by_nat) | set(visa_by_nat)
+        for _, by_nat in visa_by_loc.values():
+            nationalities |= set(by_nat)
+        locations = set(docs_by_loc) | set(visa_by_loc)
+        for when, _ in rules:
+            if when.get("location"):
+                locations.add(when["location"])
+            if when.get("nationality"):
+                nationalities.add(when["nationality"])
+
+        self._nationalities = frozenset(nationalities)
+        self._locations = frozenset(locations)
+
+        class_names = [name for name, _ in self._role_classes]
+        class_sets = [
+            combo
+            for n in range(len(class_names) + 1)
+            for combo in itertools.combinations(class_names, n)
+        ]
+
+        table: Dict[Tuple[str, str, Tuple[str, ...]], PolicyEntry] = {}
+        for nat in itertools.chain(self._nationalities, [ANY]):
+            for loc in itertools.chain(self._locations, [ANY]):
+                loc_default, loc_by_nat = visa_by_loc.get(loc, (None, {}))
+                if nat in loc_by_nat:
+                    weeks = loc_by_nat[nat]
+                elif loc_default is not None:
+                    weeks = loc_default
+                else:
+                    weeks = visa_by_nat.get(nat, visa_default)
+
+                for classes in class_sets:
+                    # Document order: base -> nationality -> location -> role classes.
+                    docs = dict(docs_base)
+                    docs.update(docs_by_nat.get(nat, {}))
+                    docs.update(docs_by_loc.get(loc, {}))
+                    for rc in classes:
+                        docs.update(docs_by_class.get(rc, {}))
+
+                    risks = tuple(
+                        message for when, message in rules if self._rule_matches(when, nat, loc, classes, weeks)
+                    )
+                    table[(nat, loc, classes)] = PolicyEntry(MappingProxyType(docs), weeks, risks)
+        self.table = table
+
+        # Bounded memo for free-text normalisation (role strings, raw codes).
+        self.classify_role = lru_cache(maxsize=4096)(self._classify_role)
+        self._nat_key = lru_cache(maxsize=1024)(self._nat_key_uncached)
+        self._loc_key = lru_cache(maxsize=1024)(self._loc_key_uncached)
+
+    # ---------- compile helpers ----------
+    @staticmethod
+    def _nat(value: str) -> str:
+        return str(value or "").strip().upper()
+
+    def _canonical_loc(self, value: str) -> str:
+        loc = str(value or "").strip().upper()
+        return self._aliases.get(loc, loc)
+
+    @staticmethod
+    def _rule_matches(when: Dict[str, Any], nat: str, loc: str, classes: Tuple[str, ...], weeks: int) -> bool:
+        if "minVisaWeeks" in when and weeks < int(when["minVisaWeeks"]):
+            return False
+        if "roleClass" in when and when["roleClass"] not in classes:
+            return False
+        if "location" in when and loc != when["location"]:
+            return False
+        if "nationality" in when and nat != when["nationality"]:
+            return False
+        return True
+
+    # ---------- lookups ----------
+    def _classify_role(self, role: str) -> Tuple[str, ...]:
+        if not role:
+            return ()
+        return tuple(name for name, pattern in self._role_classes if pattern.search(role))
+
+    def _nat_key_uncached(self, nationality: str) -> str:
+        nat = self._nat(nationality)
+        return nat if nat in self._nationalities else ANY
+
+    def _loc_key_uncached(self, work_location: str) -> str:
+        loc = self._canonical_loc(work_location)
+        return loc if loc in self._locations else ANY
+
+    def lookup(self, nationality: str, work_location: str, role: str = "") -> PolicyEntry:
+        return self.table[(self._nat_key(nationality or ""), self._loc_key(work_location or ""), self.classify_role(role or ""))]
+
+
+def load_policy(path: str) -> CompiledPolicy:
+    st = os.stat(path)
+    with open(path, encoding="utf-8") as f:
+        raw = json.load(f)
+    return CompiledPolicy(raw, source=path, mtime_ns=st.st_mtime_ns)
+
+
+class PolicyHolder:
+    """
+    Holds the active CompiledPolicy and swaps it when the file changes.
+    Readers grab a reference once; a reload replaces the reference atomically,
+    so in-flight evaluations finish on the policy they started with.
+    """
+
+    def __init__(self, path: str, check_every: float = RELOAD_CHECK_SECONDS) -> None:
+        self.path = path
+        self.check_every = check_every
+        self._lock = threading.Lock()
+        self._active = load_policy(path)
+        self._seen_mtime_ns = self._active.mtime_ns
+        self._next_check = time.monotonic() + check_every
+
+    def get(self) -> CompiledPolicy:
+        if time.monotonic() >= self._next_check:
+            self._maybe_reload()
+        return self._active
+
+    def _maybe_reload(self) -> None:
+        if not self._lock.acquire(blocking=False):
+            return  # another thread is already checking/compiling
+        try:
+            self._next_check = time.monotonic() + self.check_every
+            try:
+                mtime_ns = os.stat(self.path).st_mtime_ns
+            except OSError:
+                return
+            if mtime_ns == self._seen_mtime_ns:
+                return
+            # Remember this mtime even if compiling fails, so a broken file isn't retried every check.
+            self._seen_mtime_ns = mtime_ns
+            try:
+                compiled = load_policy(self.path)
+            except Exception:
+                logger.exception("Compliance policy reload failed; keeping version %s", self._active.version)
+                return
+            self._active = compiled
+            logger.info("Compliance policy reloaded: version %s", compiled.version)
+        finally:
+            self._lock.release()
+
+    def reload(self) -> CompiledPolicy:
+        with self._lock:
+            self._active = load_policy(self.path)
+            self._seen_mtime_ns = self._active.mtime_ns
+            self._next_check = time.monotonic() + self.check_every
+            return self._active
+
+
+policy_holder = PolicyHolder(POLICY_PATH)
+
+
+def get_policy() -> CompiledPolicy:
+    return policy_holder.get()
@@ -2,45 +2,20 @@ from __future__ import annotations
 
 from typing import Dict, Tuple
 
+from app.tools.compliance_policy import get_policy
 
-# Deterministic mock rules (demo-safe)
-# You can replace these with real policy tables later.
-def required_docs(nationality: str, work_location: str, role: str) -> Dict[str, str]:
-    docs = {
-        "passport": "Required for all hires",
-        "photo": "Required for badge/ID",
-        "address_proof": "Required for payroll/bank KYC",
-    }
-
-    if work_location.upper() in {"AE", "UAE"}:
-        docs["visa_page"] = "Required (residency/work permit processing)"
-        docs["emirates_id"] = "Required post-issuance (can be pending for Day 1)"
 
-    # Role-based
-    if "nurse" in (role or "").lower() or "doctor" in (role or "").lower():
-        docs["license"] = "Required for clinical roles (DHA/MOH/DOH as applicable)"
-        docs["certificates"] = "Required (clinical qualification verification)"
-
-    return docs
+# Rules live in app/policies/compliance_policy.json (hot-reloaded on change).
+# Each call is one lookup in the compiled (nationality, location, role class) table.
+def required_docs(nationality: str, work_location: str, role: str) -> Dict[str, str]:
+    return dict(get_policy().lookup(nationality, work_location, role).docs)
 
 
 def estimate_visa_timeline_weeks(nationality: str, work_location: str) -> int:
-    # Simplified: some nationalities take longer in demo to create conflicts
-    nat = (nationality or "").upper()
-    loc = (work_location or "").upper()
-    if loc in {"AE", "UAE"}:
-        if nat in {"PK", "BD", "NP"}:
-            return 8
-        return 4
-    return 2
+    return get_policy().lookup(nationality, work_location).visa_weeks
 
 
 def compliance_risk_flags(nationality: str, work_location: str, role: str, start_date: str | None) -> Tuple[list[str], str]:
-    risks = []
-    weeks = estimate_visa_timeline_weeks(nationality, work_location)
-    if weeks >= 8:
-        risks.append("Visa processing likely >= 8 weeks; start date may be at risk.")
-    if role and ("intern" in role.lower()) and (work_location or "").upper() in {"AE", "UAE"}:
-        risks.append("Intern visas may have additional constraints; verify eligibility.")
-    summary = f"Estimated visa timeline: {weeks} weeks."
-    return risks, summary
+    entry = get_policy().lookup(nationality, work_location, role)
+    summary = f"Estimated visa timeline: {entry.visa_weeks} weeks."
+    return list(entry.risks), summary
@@ -4,45 +4,46 @@ from dataclasses import dataclass
 from typing import Dict, List
 
 from app.tools.logistics_tools import delivery_days
+from app.tools.role_classifier import classify_role
+
+
+# IT fallback bundles per role family (Workplace's deviceModel wins when present).
+_IT_BUNDLES: Dict[str, Dict[str, object]] = {
+    "engineering": {
+        "model": "Dell Latitude 5440",
+        "accessories": ["USB-C Dock", "Noise-cancelling Headset", "Laptop Sleeve"],
+    },
+    "data": {
+        "model": "Lenovo ThinkPad T14",
+        "accessories": ["USB-C Dock", "External Monitor (24\")"],
+    },
+    "leadership": {
+        "model": "Apple MacBook Air (M2)",
+        "accessories": ["USB-C Hub", "External Monitor (27\")"],
+    },
+}
+_DEFAULT_IT_BUNDLE: Dict[str, object] = {
+    "model": "HP EliteBook 840",
+    "accessories": ["USB-C Dock"],
+}
+
+# Access groups are additive across every family a role matches.
+_ACCESS_GROUPS: Dict[str, List[str]] = {
+    "engineering": ["ENG-ALL", "GIT-ACCESS", "JIRA-ACCESS"],
+    "data": ["DATA-ALL", "BI-ACCESS"],
+    "leadership": ["MGMT-ALL", "FINANCE-READONLY"],
+}
 
 
 def equipment_bundle_by_role(role: str) -> Dict[str, object]:
-    r = (role or "").strip().lower()
-
-    if "engineer" in r or "developer" in r or "software" in r:
-        return {
-            "model": "Dell Latitude 5440",
-            "accessories": ["USB-C Dock", "Noise-cancelling Headset", "Laptop Sleeve"],
-        }
-    if "data" in r or "analyst" in r:
-        return {
-            "model": "Lenovo ThinkPad T14",
-            "accessories": ["USB-C Dock", "External Monitor (24\")"],
-        }
-    if "manager" in r or "lead" in r:
-        return {
-            "model": "Apple MacBook Air (M2)",
-            "accessories": ["USB-C Hub", "External Monitor (27\")"],
-        }
-
-    # Default bundle
-    return {
-        "model": "HP EliteBook 840",
-        "accessories": ["USB-C Dock"],
-    }
+    bundle = classify_role(role).pick(_IT_BUNDLES, _DEFAULT_IT_BUNDLE)
+    return {"model": bundle["model"], "accessories": list(bundle["accessories"])}
 
 
 def access_groups_by_role(role: str) -> List[str]:
-    r = (role or "").strip().lower()
     groups = ["BASELINE-EMPLOYEE"]
-
-    if "engineer" in r or "developer" in r or "software" in r:
-        groups += ["ENG-ALL", "GIT-ACCESS", "JIRA-ACCESS"]
-    if "data" in r or "analyst" in r:
-        groups += ["DATA-ALL", "BI-ACCESS"]
-    if "manager" in r or "lead" in r:
-        groups += ["MGMT-ALL", "FINANCE-READONLY"]
-
+    for family in classify_role(role).families:
+        groups += _ACCESS_GROUPS.get(family, [])
     return sorted(set(groups))
 
 
@@ -53,9 +54,10 @@ def it_delivery_days_for_location(work_location: str) -> int:
 
 def ticket_templates() -> List[Dict[str, object]]:
     # SLA days are hackathon-friendly defaults.
+    # depends_on: tickets that must be finished first (identity gates mailbox, access and device enrolment).
     return [
-        {"key": "IT-AD", "title": "Create corporate identity (AD/SSO)", "owner": "IT", "sla_days": 1},
-        {"key": "IT-EMAIL", "title": "Provision corporate mailbox", "owner": "IT", "sla_days": 1},
-        {"key": "IT-DEVICE", "title": "Provision laptop and accessories", "owner": "IT", "sla_days": 3},
-        {"key": "IT-ACCESS", "title": "Assign role-based access groups", "owner": "IT", "sla_days": 1},
+        {"key": "IT-AD", "title": "Create corporate identity (AD/SSO)", "owner": "IT", "sla_days": 1, "depends_on": []},
+        {"key": "IT-EMAIL", "title": "Provision corporate mailbox", "owner": "IT", "sla_days": 1, "depends_on": ["IT-AD"]},
+        {"key": "IT-DEVICE", "title": "Provision laptop and accessories", "owner": "IT", "sla_days": 3, "depends_on": ["IT-AD"]},
+        {"key": "IT-ACCESS", "title": "Assign role-based access groups", "owner": "IT", "sla_days": 1, "depends_on": ["IT-AD"]},
     ]
@@ -1,16 +1,22 @@
 from __future__ import annotations
 
-from typing import Dict
+from typing import Any, Dict
 
+from app.store.device_inventory import device_inventory
+from app.tools.role_classifier import classify_role
 
-def laptop_stock(role: str) -> Dict[str, str]:
-    # Deterministic stock rules (demo-safe)
-    r = (role or "").lower()
-    if "engineer" in r or "developer" in r:
-        return {"model": "Dell XPS 13", "status": "LOW_STOCK"}
-    if "designer" in r:
-        return {"model": "MacBook Pro 14", "status": "AVAILABLE"}
-    return {"model": "Standard ThinkPad", "status": "AVAILABLE"}
+_MODEL_BY_FAMILY = {
+    "engineering": "Dell XPS 13",
+    "design": "MacBook Pro 14",
+}
+_STANDARD_MODEL = "Standard ThinkPad"
+
+
+def laptop_stock(role: str, work_location: str = "") -> Dict[str, Any]:
+    # Role -> model is fixed; the status is the live (cached) stock level at the location.
+    model = classify_role(role).pick(_MODEL_BY_FAMILY, _STANDARD_MODEL)
+    level = device_inventory.availability(model, work_location)
+    return {"model": model, "status": level["status"], "available": level["available"]}
 
 
 def delivery_days(work_location: str) -> int:
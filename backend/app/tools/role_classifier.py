@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import FrozenSet, List, Mapping, Tuple, TypeVar
+
+# Single source of truth for role keywords used by IT, Workplace and Logistics.
+# Order = priority when a role matches several families ("Data Engineer" -> engineering).
+# Keywords match at a word start ("engineer" also hits "engineering");
+# entries ending in "$" must be whole words ("ai", "ml", "head").
+ROLE_FAMILY_RULES: List[Tuple[str, List[str]]] = [
+    ("engineering", ["engineer", "developer", "software", "devops", "sre$"]),
+    ("data", ["data", "analyst", "scientist", "ai$", "ml$", "machine learning"]),
+    ("leadership", ["manager", "director", "lead", "head$", "chief", "vp$"]),
+    ("design", ["designer"]),
+]
+
+GENERAL = "general"
+
+V = TypeVar("V")
+
+
+@dataclass(frozen=True)
+class RoleClass:
+    family: str  # primary family, or "general"
+    families: FrozenSet[str]  # every family the role matched (e.g. engineering + leadership)
+
+    def has(self, family: str) -> bool:
+        return family in self.families
+
+    def pick(self, by_family: Mapping[str, V], default: V) -> V:
+        """
+        Value for the highest-priority matched family that `by_family` has an entry for, so a
+        "Lead Designer" still gets the design entry from a table without a leadership one.
+        """
+        for family in _PRIORITY:
+            if family in self.families and family in by_family:
+                return by_family[family]
+        return default
+
+
+def _compile(rules: List[Tuple[str, List[str]]]) -> re.Pattern[str]:
+    parts = []
+    for family, keywords in rules:
+        alts = []
+        for kw in keywords:
+            if kw.endswith("$"):
+                alts.append(re.escape(kw[:-1]) + r"\b")
+            else:
+                alts.append(re.escape(kw))
+        parts.append(rf"(?P<{family}>\b(?:{'|'.join(alts)}))")
+    return re.compile("|".join(parts), re.IGNORECASE)
+
+
+_PATTERN = _compile(ROLE_FAMILY_RULES)
+_PRIORITY = [family for family, _ in ROLE_FAMILY_RULES]
+
+
+@lru_cache(maxsize=4096)
+def classify_role(role: str) -> RoleClass:
+    """
+    Map a free-text role to its RoleClass in one regex pass; memoised per distinct string.
+    """
+    matched = frozenset(m.lastgroup for m in _PATTERN.finditer(role or "") if m.lastgroup)
+    family = next((f for f in _PRIORITY if f in matched), GENERAL)
+    return RoleClass(family=family, families=matched)
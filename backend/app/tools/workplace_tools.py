@@ -1,7 +1,35 @@
 from __future__ import annotations
 
-import random
-from typing import Any, Dict
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.store.seat_inventory import normalize_location, seat_inventory
+from app.tools.role_classifier import classify_role
+
+
+_POWER_USER_BUNDLE = {
+    "bundleName": "Power User (Dev/Data)",
+    "deviceModel": "Dell Latitude 5440",
+    "monitor": "27-inch monitor",
+    "accessories": ["Dock", "Keyboard", "Mouse", "Headset"],
+}
+_LEADER_BUNDLE = {
+    "bundleName": "Leader Bundle",
+    "deviceModel": "Dell Latitude 7440",
+    "monitor": "34-inch ultrawide",
+    "accessories": ["Dock", "Keyboard", "Mouse", "Noise-cancel headset"],
+}
+_STANDARD_BUNDLE = {
+    "bundleName": "Standard Bundle",
+    "deviceModel": "Dell Latitude 5440",
+    "monitor": "24-inch monitor",
+    "accessories": ["Dock", "Keyboard", "Mouse"],
+}
+_BUNDLES_BY_FAMILY = {
+    "engineering": _POWER_USER_BUNDLE,
+    "data": _POWER_USER_BUNDLE,
+    "leadership": _LEADER_BUNDLE,
+}
 
 
 def equipment_bundle_by_role(role: str) -> Dict[str, Any]:
@@ -9,38 +37,21 @@ def equipment_bundle_by_role(role: str) -> Dict[str, Any]:
     Workplace-managed equipment bundles. Keep deterministic for demo.
     IMPORTANT: includes a concrete `deviceModel` so Logistics/IT can align.
     """
-    r = (role or "").lower()
-
-    # Pick concrete models for demo consistency (avoid "either/or" strings)
-    if any(k in r for k in ["developer", "engineer", "data", "ai", "ml"]):
-        return {
-            "bundleName": "Power User (Dev/Data)",
-            "deviceModel": "Dell Latitude 5440",
-            "monitor": "27-inch monitor",
-            "accessories": ["Dock", "Keyboard", "Mouse", "Headset"],
-        }
+    bundle = classify_role(role).pick(_BUNDLES_BY_FAMILY, _STANDARD_BUNDLE)
+    return {**bundle, "accessories": list(bundle["accessories"])}
 
-    if any(k in r for k in ["manager", "director", "lead", "head"]):
-        return {
-            "bundleName": "Leader Bundle",
-            "deviceModel": "Dell Latitude 7440",
-            "monitor": "34-inch ultrawide",
-            "accessories": ["Dock", "Keyboard", "Mouse", "Noise-cancel headset"],
-        }
 
-    return {
-        "bundleName": "Standard Bundle",
-        "deviceModel": "Dell Latitude 5440",
-        "monitor": "24-inch monitor",
-        "accessories": ["Dock", "Keyboard", "Mouse"],
-    }
-
-
-def seating_plan_for_location(work_location: str, role: str = "", work_mode: str = "ONSITE") -> Dict[str, Any]:
+def seating_plan_for_location(
+    work_location: str,
+    role: str = "",
+    work_mode: str = "ONSITE",
+    case_id: Optional[str] = None,
+) -> Dict[str, Any]:
     """
-    Simple seat allocator for demo. In a real build you’d check inventory.
+    Seat allocation from the seat inventory (app/store/seat_inventory.py).
+    Idempotent per case_id; hires of the same role family start in the same zone.
     """
-    loc = (work_location or "HQ").strip().upper()
+    loc = normalize_location(work_location)
     mode = (work_mode or "ONSITE").strip().upper()
 
     if mode in {"REMOTE", "HYBRID_REMOTE"}:
@@ -52,16 +63,90 @@ def seating_plan_for_location(work_location: str, role: str = "", work_mode: str
             "notes": "Remote work mode; no permanent seat allocated.",
         }
 
-    # Deterministic-ish seat id for demo
-    random.seed(f"{loc}:{role}")
-    floor = random.choice([2, 3, 4, 5, 6])
-    zone = random.choice(["A", "B", "C", "D"])
-    desk = random.randint(10, 99)
-
-    return {
-        "seatId": f"{loc}-{floor}{zone}-{desk}",
-        "building": loc,
-        "floor": floor,
-        "zone": zone,
-        "notes": "Auto-assigned demo seat. Replace with real facilities inventory later.",
-    }
+    if not case_id:
+        return {
+            "seatId": None,
+            "building": loc,
+            "floor": None,
+            "zone": None,
+            "notes": "No caseId; seat not reserved.",
+        }
+
+    seat = seat_inventory.allocate(loc, case_id, preference=classify_role(role).family)
+    if not seat:
+        return {
+            "seatId": None,
+            "building": loc,
+            "floor": None,
+            "zone": None,
+            "notes": f"No free seats at {loc}; facilities follow-up required.",
+        }
+
+    return {**seat, "notes": "Allocated from seat inventory."}
+
+
+def cohort_week(start_date: Optional[str]) -> Optional[str]:
+    """ISO week of a start date ("2026-W47"); None when the date can't be parsed."""
+    try:
+        year, week, _ = date.fromisoformat((start_date or "")[:10]).isocalendar()
+    except ValueError:
+        return None
+    return f"{year}-W{week:02d}"
+
+
+def cohort_week_range(week: str) -> Optional[Tuple[str, str]]:
+    """First and last ISO date of a cohort week ("2026-W47"); None when it can't be parsed."""
+    try:
+        year, num = week.split("-W")
+        monday = date.fromisocalendar(int(year), int(num), 1)
+    except (AttributeError, ValueError):
+        return None
+    return monday.isoformat(), (monday + timedelta(days=6)).isoformat()
+
+
+def plan_cohort_zones(team_sizes: Dict[str, int], zone_free: List[Tuple[str, int]]) -> Dict[str, List[Tuple[str, int]]]:
+    """
+    Greedy cohort placement. Zones are given in physical order (floor, zone), so
+    neighbours in the list are adjacent on the floor plan.
+
+    Teams are taken family by family, largest first. A team that fits in one zone
+    goes to the zone with room nearest the fill cursor (smallest leftover on ties);
+    larger teams fill consecutive zones from the cursor. Returns team -> [(zone, n)];
+    seats that don't fit anywhere are simply left out of the plan.
+    """
+    remaining = [free for _, free in zone_free]
+    order = sorted(team_sizes, key=lambda t: (classify_role(t).family, -team_sizes[t], t))
+    plan: Dict[str, List[Tuple[str, int]]] = {}
+    cursor = 0
+
+    for team in order:
+        need = team_sizes[team]
+        fits = [i for i, free in enumerate(remaining) if free >= need]
+        if fits:
+            i = min(fits, key=lambda j: (abs(j - cursor), remaining[j]))
+            remaining[i] -= need
+            plan[team] = [(zone_free[i][0], need)]
+            cursor = i
+            continue
+
+        spans: List[Tuple[str, int]] = []
+        i = cursor
+        while need > 0 and i < len(remaining):
+            take = min(need, remaining[i])
+            if take:
+                spans.append((zone_free[i][0], take))
+                remaining[i] -= take
+                need -= take
+                cursor = i
+            i += 1
+        # Wrap to zones before the cursor if the tail of the building is full.
+        i = 0
+        while need > 0 and i < len(remaining):
+            take = min(need, remaining[i])
+            if take:
+                spans.append((zone_free[i][0], take))
+                remaining[i] -= take
+                need -= take
+            i += 1
+        plan[team] = spans
+    return plan
@@ -0,0 +1 @@
+# Benchmark suite for the HR Automator backend (run from backend/: python -m benchmarks.<name>).
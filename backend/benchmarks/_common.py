@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+
+def use_temp_database(db_path: Optional[str] = None) -> str:
+    """
+    Point app.db.database at a throwaway SQLite file.
+    Must run BEFORE anything imports `app.*` (the engine is created at import time).
+    """
+    if "app.db.database" in sys.modules:
+        raise RuntimeError("use_temp_database() must be called before importing app modules")
+    if not db_path:
+        db_path = os.path.join(tempfile.mkdtemp(prefix="hr-bench-"), "bench.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    return db_path
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile over an already-sorted sequence."""
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, math.ceil(pct * len(sorted_values) / 100.0) - 1))
+    return float(sorted_values[k])
+
+
+def latency_summary(latencies_ms: List[float], wall_s: float, errors: int = 0) -> Dict[str, Any]:
+    lat = sorted(latencies_ms)
+    n = len(lat)
+    return {
+        "requests": n,
+        "errors": errors,
+        "throughput_rps": round(n / wall_s, 2) if wall_s > 0 else 0.0,
+        "mean_ms": round(sum(lat) / n, 3) if n else 0.0,
+        "p50_ms": round(percentile(lat, 50), 3),
+        "p95_ms": round(percentile(lat, 95), 3),
+        "p99_ms": round(percentile(lat, 99), 3),
+        "max_ms": round(lat[-1], 3) if n else 0.0,
+    }
+
+
+def build_report(benchmark: str, params: Dict[str, Any], metrics: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "benchmark": benchmark,
+        "createdAt": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "env": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "params": params,
+        "metrics": metrics,
+    }
+
+
+def write_report(report: Dict[str, Any], out_path: Optional[str]) -> None:
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if out_path:
+        with open(out_path, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
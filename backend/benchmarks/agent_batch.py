@@ -0,0 +1,121 @@
+"""
+run_batch() vs per-case run() for the stateless agents (Compliance, Logistics, IT).
+
+    cd backend
+    python -m benchmarks.agent_batch --cases 20000 --out agents.json
+
+Cases are drawn from the synthetic_data distributions, so there are many
+repeated (role, location, nationality) tuples as in a real intake. Batch
+results are checked against the loop before timing is reported. Logistics
+and IT hold devices per case, so the run uses a temp database and device
+holds are reset before every timed pass.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, List
+
+from benchmarks._common import build_report, use_temp_database, write_report
+from benchmarks.synthetic_data import LOCATIONS, NATIONALITIES, ROLES, _Weighted
+
+
+def _cases(n: int, seed: int) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    nat_w, loc_w, role_w = _Weighted(NATIONALITIES), _Weighted(LOCATIONS), _Weighted(ROLES)
+    today = date.today()
+    out: List[Dict[str, Any]] = []
+    for i in range(n):
+        agent_outputs: Dict[str, Any] = {}
+        if rng.random() < 0.8:
+            agent_outputs["hris"] = {"data": {"employeeId": f"EMP-{i}"}}
+        if rng.random() < 0.5:
+            agent_outputs["workplace"] = {"data": {"equipment": {"deviceModel": rng.choice(["Dell Latitude 5440", "Dell Latitude 7440"])}}}
+        out.append({
+            "caseId": f"CASE-{i:08X}",
+            "seed": {
+                "role": role_w.pick(rng),
+                "workLocation": loc_w.pick(rng),
+                "nationality": nat_w.pick(rng),
+                "startDate": (today + timedelta(days=rng.randint(-10, 120))).isoformat(),
+            },
+            "agentOutputs": agent_outputs,
+        })
+    return out
+
+
+def _reset_devices() -> None:
+    from sqlalchemy import text
+
+    from app.db.database import engine
+    from app.store.device_inventory import device_inventory
+
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM device_reservations"))
+        conn.execute(text("UPDATE device_stock SET reserved = 0"))
+    device_inventory.refresh()
+
+
+async def _time_loop(agent, cases: List[Dict[str, Any]]):
+    _reset_devices()
+    t0 = time.perf_counter()
+    results = [await agent.run(c) for c in cases]
+    return results, time.perf_counter() - t0
+
+
+async def _time_batch(agent, cases: List[Dict[str, Any]]):
+    _reset_devices()
+    t0 = time.perf_counter()
+    results = await agent.run_batch(cases)
+    return results, time.perf_counter() - t0
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Dict[str, Any]]:
+    from app.agents.compliance_agent import ComplianceAgent
+    from app.agents.it_agent import ITProvisioningAgent
+    from app.agents.logistics_agent import LogisticsAgent
+    from app.db.database import Base, engine
+
+    Base.metadata.create_all(bind=engine)
+
+    cases = _cases(args.cases, args.seed)
+    metrics: Dict[str, Dict[str, Any]] = {}
+    for agent in (ComplianceAgent(), LogisticsAgent(), ITProvisioningAgent()):
+        best_loop = best_batch = float("inf")
+        for _ in range(args.repeat):
+            loop_res, loop_s = await _time_loop(agent, cases)
+            batch_res, batch_s = await _time_batch(agent, cases)
+            best_loop, best_batch = min(best_loop, loop_s), min(best_batch, batch_s)
+        if loop_res != batch_res:
+            raise SystemExit(f"{agent.name}: run_batch results differ from per-case run()")
+        metrics[agent.name] = {
+            "loop_cases_per_s": round(len(cases) / best_loop, 1),
+            "batch_cases_per_s": round(len(cases) / best_batch, 1),
+            "loop_ms": round(best_loop * 1000, 2),
+            "batch_ms": round(best_batch * 1000, 2),
+            "speedup": round(best_loop / best_batch, 2) if best_batch > 0 else 0.0,
+        }
+    return metrics
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark agent run_batch() against a per-case loop.")
+    parser.add_argument("--cases", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=3, help="best-of-N timing")
+    parser.add_argument("--out", default=None, help="write JSON report here")
+    parser.add_argument("--db", default=None, help="SQLite file to use (default: temp file)")
+    args = parser.parse_args()
+
+    use_temp_database(args.db)
+
+    metrics = asyncio.run(run(args))
+    params = {k: v for k, v in vars(args).items() if k not in ("out", "db")}
+    write_report(build_report("agent_batch", params, metrics), args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Resident memory per case in CaseStore: plain dicts (as json.loads returns them from
+case_states, which is how restarts and the warm-up load cases) vs CaseRecord.
+
+    cd backend
+    python -m benchmarks.case_memory --cases 100000 --out case_memory.json
+
+Builds --cases case payloads shaped like CaseStore's (statuses from the real vocabularies,
+offer/profile steps, agent outputs of roughly --agent-bytes), encodes each to JSON, then
+measures with tracemalloc the bytes retained by loading all of them both ways. The JSON text
+is built before tracing starts, so only the resident objects are counted.
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import random
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from benchmarks._common import build_report, write_report
+
+STATUSES = ["DRAFT", "NEGOTIATION_PENDING", "ON_HOLD_HR", "ONBOARDING_IN_PROGRESS", "SUBMITTED", "READY_DAY1"]
+RISK = ["GREEN", "AT_RISK"]
+
+
+def _payload(i: int, rng: random.Random, agent_bytes: int) -> Dict[str, Any]:
+    per_agent = max(0, agent_bytes // 5)
+    agents = (
+        {
+            name: {"summary": f"{name} done", "risks": [], "actions": [], "data": {"blob": "x" * per_agent}}
+            for name in ("compliance", "logistics", "hris", "workplace", "it")
+        }
+        if agent_bytes
+        else {}
+    )
+    return {
+        "caseId": f"CASE-{i:08X}",
+        "applicationNumber": f"APP-{i:06X}",
+        "candidateName": f"Candidate {i}",
+        "status": rng.choice(STATUSES),
+        "riskStatus": rng.choice(RISK),
+        "currentStepIndex": rng.randint(0, 5),
+        "completedSteps": ["offer", "profile"][: rng.randint(0, 2)],
+        "steps": {"offer": {"decision": "ACCEPT"}, "profile": {"fullName": f"Candidate {i}"}},
+        "seed": {"candidateName": f"Candidate {i}", "role": "Software Engineer", "workLocation": "UAE", "startDate": "2026-12-01"},
+        "agentOutputs": agents,
+        "createdAt": "2026-10-19T09:00:00",
+        "updatedAt": "2026-10-19T09:00:00",
+    }
+
+
+def _retained(texts: List[str], load: Callable[[str], Any]) -> Dict[str, Any]:
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    t0 = time.perf_counter()
+    resident = [load(t) for t in texts]
+    load_s = time.perf_counter() - t0
+    gc.collect()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    n = len(resident)
+    del resident
+    return {
+        "cases": n,
+        "total_mb": round((after - before) / 1e6, 2),
+        "bytes_per_case": round((after - before) / max(1, n)),
+        "load_us_per_case": round(load_s / max(1, n) * 1e6, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bytes per resident case: dict vs CaseRecord.")
+    parser.add_argument("--cases", type=int, default=100_000)
+    parser.add_argument("--agent-bytes", type=int, nargs="*", default=[0, 2048], help="agentOutputs payload sizes to run")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", default=None, help="write JSON report here")
+    args = parser.parse_args()
+
+    from app.store.case_record import CaseRecord
+
+    metrics: Dict[str, Dict[str, Any]] = {}
+    for agent_bytes in args.agent_bytes:
+        rng = random.Random(args.seed)
+        texts = [json.dumps(_payload(i, rng, agent_bytes)) for i in range(args.cases)]
+        before = _retained(texts, json.loads)
+        after = _retained(texts, lambda t: CaseRecord(json.loads(t)))
+        saved = before["bytes_per_case"] - after["bytes_per_case"]
+        metrics[f"agent_{agent_bytes}b"] = {
+            "dict": before,
+            "record": after,
+            "saved_bytes_per_case": saved,
+            "saved_pct": round(100.0 * saved / max(1, before["bytes_per_case"]), 1),
+        }
+
+    params = {k: v for k, v in vars(args).items() if k != "out"}
+    write_report(build_report("case_memory", params, metrics), args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+Micro-benchmarks for CaseStore hot operations (emit fan-out, persist, JSON encode,
+save_step, init_or_get_case) across case sizes and subscriber counts.
+
+    cd backend
+    python -m benchmarks.case_store_micro --out store.json
+    python -m benchmarks.compare store_baseline.json store.json --tolerance 0.2
+
+Timing runs without tracemalloc; a second, shorter pass per scenario records
+peak and retained allocations per operation.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import itertools
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+from benchmarks._common import build_report, percentile, use_temp_database, write_report
+
+Scenario = Tuple[str, Callable[[], Callable[[int], Any]], int]
+
+
+def _agent_outputs(size_bytes: int) -> Dict[str, Any]:
+    # Spread payload across agents/lists like real outputs do.
+    per_agent = max(1, size_bytes // 5)
+    chunk = "x" * 100
+    return {
+        name: {
+            "summary": f"{name} done",
+            "risks": [],
+            "actions": [{"type": "NOTE", "text": chunk} for _ in range(max(1, per_agent // 120))],
+            "data": {"blob": "y" * (per_agent % 120)},
+        }
+        for name in ("compliance", "logistics", "hris", "workplace", "it")
+    }
+
+
+def _measure(op: Callable[[int], Any], iterations: int, alloc_iterations: int) -> Dict[str, Any]:
+    op(0)  # warm-up
+
+    gc.collect()
+    gc.disable()
+    samples: List[float] = []
+    try:
+        t_start = time.perf_counter()
+        for i in range(1, iterations + 1):
+            t0 = time.perf_counter()
+            op(i)
+            samples.append((time.perf_counter() - t0) * 1e6)
+        wall = time.perf_counter() - t_start
+    finally:
+        gc.enable()
+
+    tracemalloc.start()
+    peaks: List[int] = []
+    before, _ = tracemalloc.get_traced_memory()
+    for i in range(iterations + 1, iterations + 1 + alloc_iterations):
+        tracemalloc.reset_peak()
+        cur, _ = tracemalloc.get_traced_memory()
+        op(i)
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - cur)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    samples.sort()
+    return {
+        "iterations": iterations,
+        "ops_per_s": round(iterations / wall, 1) if wall > 0 else 0.0,
+        "mean_us": round(sum(samples) / len(samples), 2),
+        "p50_us": round(percentile(samples, 50), 2),
+        "p95_us": round(percentile(samples, 95), 2),
+        "p99_us": round(percentile(samples, 99), 2),
+        "alloc_peak_bytes": int(sum(peaks) / len(peaks)) if peaks else 0,
+        "alloc_retained_bytes": int((after - before) / max(1, alloc_iterations)),
+    }
+
+
+def _scenarios(args: argparse.Namespace) -> List[Scenario]:
+    from app.db.database import engine
+    from app.db.models import Base
+    from app.store.case_store import CaseStore, _encode
+
+    Base.metadata.create_all(bind=engine)
+    counter = itertools.count()
+
+    def fresh_store_with_case(agent_bytes: int) -> Tuple[CaseStore, str]:
+        store = CaseStore()
+        case = store.init_or_get_case(f"APP-BENCH-{next(counter)}", seed={"candidateName": "Bench", "role": "Engineer"})
+        case["agentOutputs"] = _agent_outputs(agent_bytes)
+        return store, case["caseId"]
+
+    out: List[Scenario] = []
+
+    for subs in args.subscribers:
+        def setup_emit(subs: int = subs) -> Callable[[int], Any]:
+            store, cid = fresh_store_with_case(1024)
+            queues = [store.subscribe(cid) for _ in range(subs)]
+
+            def op(i: int) -> None:
+                store.emit(cid, "bench.event", {"i": i})
+                # Drain so queues don't grow without bound between iterations.
+                for q in queues:
+                    q.get_nowait()
+            return op
+        out.append((f"emit_fanout_{subs}", setup_emit, args.iterations))
+
+    for size in args.sizes:
+        label = _size_label(size)
+
+        # What persist_case does per write in place of the old deep copy.
+        def setup_encode(size: int = size) -> Callable[[int], Any]:
+            store, cid = fresh_store_with_case(size)
+            case = store.get_case(cid)
+            return lambda i: _encode(case)
+        out.append((f"encode_{label}", setup_encode, args.iterations))
+
+        def setup_persist(size: int = size) -> Callable[[int], Any]:
+            store, cid = fresh_store_with_case(size)
+            return lambda i: store.persist_case(cid)
+        out.append((f"persist_{label}", setup_persist, args.db_iterations))
+
+        def setup_save_step(size: int = size) -> Callable[[int], Any]:
+            store, cid = fresh_store_with_case(size)
+            return lambda i: store.save_step(cid, "profile", {"fullName": f"Bench {i}"}, 2)
+        out.append((f"save_step_{label}", setup_save_step, args.db_iterations))
+
+    def setup_init_existing() -> Callable[[int], Any]:
+        store = CaseStore()
+        store.init_or_get_case("APP-BENCH-EXISTING", seed={"candidateName": "Bench"})
+        return lambda i: store.init_or_get_case("APP-BENCH-EXISTING", seed={"candidateName": "Bench"})
+    out.append(("init_or_get_existing", setup_init_existing, args.db_iterations))
+
+    def setup_init_new() -> Callable[[int], Any]:
+        store = CaseStore()
+        return lambda i: store.init_or_get_case(f"APP-BENCH-NEW-{next(counter)}", seed={"candidateName": "Bench"})
+    out.append(("init_or_get_new", setup_init_new, args.db_iterations))
+
+    return out
+
+
+def _size_label(size: int) -> str:
+    return f"{size // 1024}kb" if size >= 1024 else f"{size}b"
+
+
+def _parse_size(text: str) -> int:
+    t = text.strip().lower()
+    if t.endswith("kb"):
+        return int(float(t[:-2]) * 1024)
+    if t.endswith("mb"):
+        return int(float(t[:-2]) * 1024 * 1024)
+    return int(t)
+
+
+def run(args: argparse.Namespace) -> Dict[str, Dict[str, Any]]:
+    # asyncio.Queue needs an event loop in the current thread.
+    asyncio.set_event_loop(asyncio.new_event_loop())
+
+    metrics: Dict[str, Dict[str, Any]] = {}
+    for name, setup, iterations in _scenarios(args):
+        if args.only and not any(name.startswith(p) for p in args.only):
+            continue
+        metrics[name] = _measure(setup(), iterations, max(1, min(iterations, args.alloc_iterations)))
+    return metrics
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for CaseStore hot paths.")
+    parser.add_argument("--iterations", type=int, default=2000, help="iterations for in-memory ops")
+    parser.add_argument("--db-iterations", type=int, default=200, help="iterations for ops that hit SQLite")
+    parser.add_argument("--alloc-iterations", type=int, default=50, help="iterations traced by tracemalloc")
+    parser.add_argument("--subscribers", type=int, nargs="*", default=[1, 100, 1000])
+    parser.add_argument("--sizes", type=_parse_size, nargs="*", default=[1024, 500 * 1024], help="agentOutputs sizes, e.g. 1kb 500kb")
+    parser.add_argument("--only", nargs="*", help="scenario name prefixes (e.g. emit persist)")
+    parser.add_argument("--db", default=None, help="SQLite file to use (default: fresh temp file)")
+    parser.add_argument("--out", default=None, help="write JSON report here")
+    args = parser.parse_args()
+
+    db_path = use_temp_database(args.db)
+    metrics = run(args)
+    params = {k: v for k, v in vars(args).items() if k not in {"out", "db"}}
+    params["db"] = db_path
+    write_report(build_report("case_store_micro", params, metrics), args.out)
+
+
+if __name__ == "__main__":
+    main()
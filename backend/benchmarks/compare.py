@@ -0,0 +1,94 @@
+"""
+Compare a benchmark report against a stored baseline and fail on regressions.
+
+    python -m benchmarks.compare baseline.json current.json --tolerance 0.15
+
+Metric direction is inferred from the name: throughput-style metrics
+(`*_rps`, `*_per_s`, `*ops*`, `speedup`) must not drop, everything else (`*_ms`,
+`*_bytes`, `errors`, ...) must not grow, by more than the tolerance.
+Exit status is 1 when any metric regresses.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+_HIGHER_IS_BETTER = ("_rps", "_per_s", "ops", "speedup")
+_IGNORED = {"requests", "deliveries", "subscribers", "iterations", "count", "n"}
+
+
+def _higher_is_better(metric: str) -> bool:
+    return any(tag in metric for tag in _HIGHER_IS_BETTER)
+
+
+def _flatten(metrics: Dict[str, Any], prefix: str = "") -> Iterator[Tuple[str, float]]:
+    for k, v in metrics.items():
+        key = f"{prefix}.{k}" if prefix else k
+        if isinstance(v, dict):
+            yield from _flatten(v, key)
+        elif isinstance(v, (int, float)) and not isinstance(v, bool):
+            yield key, float(v)
+
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    tolerance: float,
+    only: Optional[List[str]] = None,
+    noise_floor: float = 0.0,
+) -> List[Dict[str, Any]]:
+    base = dict(_flatten(baseline.get("metrics") or {}))
+    cur = dict(_flatten(current.get("metrics") or {}))
+
+    rows: List[Dict[str, Any]] = []
+    for key in sorted(base):
+        metric = key.rsplit(".", 1)[-1]
+        if metric in _IGNORED or key not in cur:
+            continue
+        if only and metric not in only:
+            continue
+        b, c = base[key], cur[key]
+        higher = _higher_is_better(metric)
+        if b == 0:
+            change = 0.0 if c == 0 else float("inf")
+        else:
+            change = (c - b) / abs(b)
+        worse = -change if higher else change
+        regressed = worse > tolerance and abs(c - b) > noise_floor
+        rows.append({"metric": key, "baseline": b, "current": c, "change": change, "regressed": regressed})
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fail when a benchmark regresses beyond tolerance.")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed relative regression (0.10 = 10%%)")
+    parser.add_argument("--metrics", nargs="*", help="only compare these metric names (e.g. p95_ms throughput_rps)")
+    parser.add_argument("--noise-floor", type=float, default=0.0, help="ignore absolute differences below this")
+    args = parser.parse_args()
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)
+
+    if baseline.get("benchmark") != current.get("benchmark"):
+        print(f"benchmark mismatch: {baseline.get('benchmark')} vs {current.get('benchmark')}", file=sys.stderr)
+        sys.exit(2)
+
+    rows = compare(baseline, current, args.tolerance, args.metrics, args.noise_floor)
+    for r in rows:
+        flag = "REGRESSED" if r["regressed"] else "ok"
+        print(f"{flag:>9}  {r['metric']:<45} {r['baseline']:>12.3f} -> {r['current']:>12.3f}  ({r['change']:+.1%})")
+
+    regressions = [r for r in rows if r["regressed"]]
+    if regressions:
+        print(f"\n{len(regressions)} metric(s) regressed beyond {args.tolerance:.0%}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
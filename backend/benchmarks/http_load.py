@@ -0,0 +1,236 @@
+"""
+In-process HTTP/WebSocket load test for app.main:app.
+
+Drives the ASGI app directly (no sockets) against a temporary SQLite file:
+
+    cd backend
+    pip install -r benchmarks/requirements.txt
+    python -m benchmarks.http_load --cases 50 --requests 200 --concurrency 8 --out bench.json
+    python -m benchmarks.compare baseline.json bench.json --tolerance 0.15
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+from benchmarks._common import build_report, latency_summary, use_temp_database, write_report
+
+SCENARIOS = ["case_init", "step_save", "onboard_run", "hr_cases", "hr_employees", "ws_fanout"]
+
+_ROLES = ["Software Engineer", "Data Analyst", "Engineering Manager", "Product Designer", "Nurse", "HR Generalist"]
+_NATIONALITIES = ["US", "IN", "PK", "GB", "AE", "BD"]
+_LOCATIONS = ["UAE", "AE", "HQ", "London"]
+
+
+class _WSClient:
+    """
+    Minimal in-process ASGI websocket client: enough to subscribe to /ws/{case_id}
+    and collect the JSON frames the app sends.
+    """
+
+    def __init__(self, app, path: str) -> None:
+        self.app = app
+        self.path = path
+        self.frames: asyncio.Queue = asyncio.Queue()
+        self._inbound: asyncio.Queue = asyncio.Queue()
+        self._accepted = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    async def connect(self) -> None:
+        scope = {
+            "type": "websocket",
+            "asgi": {"version": "3.0"},
+            "scheme": "ws",
+            "path": self.path,
+            "raw_path": self.path.encode(),
+            "query_string": b"",
+            "headers": [],
+            "client": ("bench", 0),
+            "server": ("bench", 80),
+            "subprotocols": [],
+        }
+        await self._inbound.put({"type": "websocket.connect"})
+        self._task = asyncio.create_task(self.app(scope, self._inbound.get, self._send))
+        await self._accepted.wait()
+
+    async def _send(self, message: Dict[str, Any]) -> None:
+        if message["type"] == "websocket.accept":
+            self._accepted.set()
+        elif message["type"] == "websocket.send":
+            await self.frames.put(message.get("text") or message.get("bytes"))
+
+    async def close(self) -> None:
+        await self._inbound.put({"type": "websocket.disconnect", "code": 1000})
+        if self._task:
+            try:
+                await asyncio.wait_for(self._task, timeout=2)
+            except (asyncio.TimeoutError, Exception):
+                self._task.cancel()
+
+
+async def _run_scenario(
+    total: int,
+    concurrency: int,
+    op: Callable[[int], Awaitable[int]],
+) -> Dict[str, Any]:
+    """Run `op(i)` `total` times across `concurrency` workers; op returns the HTTP status."""
+    counter = itertools.count()
+    latencies: List[float] = []
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal errors
+        while True:
+            i = next(counter)
+            if i >= total:
+                return
+            t0 = time.perf_counter()
+            try:
+                status = await op(i)
+            except Exception:
+                status = 599
+            latencies.append((time.perf_counter() - t0) * 1000.0)
+            if status >= 400:
+                errors += 1
+
+    t_start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    return latency_summary(latencies, time.perf_counter() - t_start, errors)
+
+
+async def _seed(client, n_cases: int) -> List[Dict[str, str]]:
+    seeded: List[Dict[str, str]] = []
+    for i in range(n_cases):
+        r = await client.post(
+            "/api/hr/cases",
+            json={
+                "candidate_name": f"Bench Candidate {i}",
+                "role": _ROLES[i % len(_ROLES)],
+                "nationality": _NATIONALITIES[i % len(_NATIONALITIES)],
+                "work_location": _LOCATIONS[i % len(_LOCATIONS)],
+                "start_date": time.strftime("%Y-%m-%d", time.gmtime(time.time() + (14 + i % 60) * 86400)),
+                "salary": str(90000 + i),
+            },
+        )
+        case_id = r.json()["case_id"]
+        code = (await client.post(f"/api/hr/cases/{case_id}/generate_code")).json()["applicationCode"]
+        await client.post("/api/case/init", json={"applicationCode": code})
+        seeded.append({"caseId": case_id, "code": code})
+    return seeded
+
+
+async def _ws_fanout(app, client, case_id: str, subscribers: int, rounds: int) -> Dict[str, Any]:
+    clients = [_WSClient(app, f"/ws/{case_id}") for _ in range(subscribers)]
+    await asyncio.gather(*(c.connect() for c in clients))
+    # Let each socket finish replaying recent events and block on the live queue.
+    await asyncio.sleep(0.05)
+    for c in clients:
+        while not c.frames.empty():
+            c.frames.get_nowait()
+
+    latencies: List[float] = []
+    errors = 0
+    t_start = time.perf_counter()
+    for i in range(rounds):
+        t0 = time.perf_counter()
+        r = await client.post(f"/api/case/{case_id}/step/ws_bench", json={"payload": {"round": i}})
+        if r.status_code >= 400:
+            errors += 1
+            continue
+
+        async def _drain(c: _WSClient) -> None:
+            while True:
+                frame = await c.frames.get()
+                if '"ui.step_saved"' in (frame or ""):
+                    latencies.append((time.perf_counter() - t0) * 1000.0)
+                    return
+
+        try:
+            await asyncio.wait_for(asyncio.gather(*(_drain(c) for c in clients)), timeout=5)
+        except asyncio.TimeoutError:
+            errors += 1
+    wall = time.perf_counter() - t_start
+
+    await asyncio.gather(*(c.close() for c in clients))
+    out = latency_summary(latencies, wall, errors)
+    out["subscribers"] = subscribers
+    out["deliveries"] = out.pop("requests")
+    out["deliveries_per_s"] = out.pop("throughput_rps")
+    return out
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    import httpx
+
+    from app.main import app
+
+    await app.router.startup()
+    metrics: Dict[str, Dict[str, Any]] = {}
+    selected = [s for s in SCENARIOS if not args.only or s in args.only]
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        seeded = await _seed(client, args.cases)
+
+        async def case_init(i: int) -> int:
+            s = seeded[i % len(seeded)]
+            return (await client.post("/api/case/init", json={"applicationCode": s["code"]})).status_code
+
+        async def step_save(i: int) -> int:
+            s = seeded[i % len(seeded)]
+            payload = {"payload": {"fullName": f"Bench {i}", "notes": "x" * args.step_bytes}, "nextStepIndex": 2}
+            return (await client.post(f"/api/case/{s['caseId']}/step/profile", json=payload)).status_code
+
+        async def onboard_run(i: int) -> int:
+            s = seeded[i % len(seeded)]
+            return (await client.post(f"/api/onboard/run/{s['caseId']}", json={"notes": "bench"})).status_code
+
+        async def hr_cases(i: int) -> int:
+            return (await client.get("/api/hr/cases")).status_code
+
+        async def hr_employees(i: int) -> int:
+            return (await client.get("/api/hr/employees")).status_code
+
+        ops = {
+            "case_init": (case_init, args.requests),
+            "step_save": (step_save, args.requests),
+            "onboard_run": (onboard_run, args.requests),
+            "hr_cases": (hr_cases, max(1, args.requests // 4)),
+            "hr_employees": (hr_employees, max(1, args.requests // 4)),
+        }
+        for name in selected:
+            if name == "ws_fanout":
+                metrics[name] = await _ws_fanout(app, client, seeded[0]["caseId"], args.ws_subscribers, args.ws_rounds)
+                continue
+            op, total = ops[name]
+            metrics[name] = await _run_scenario(total, args.concurrency, op)
+
+    await app.router.shutdown()
+    return metrics
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="In-process HTTP/WS load test for the HR Automator API.")
+    parser.add_argument("--cases", type=int, default=50, help="synthetic cases to seed")
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--step-bytes", type=int, default=256, help="padding in step payloads")
+    parser.add_argument("--ws-subscribers", type=int, default=50)
+    parser.add_argument("--ws-rounds", type=int, default=50)
+    parser.add_argument("--only", nargs="*", choices=SCENARIOS, help="subset of scenarios")
+    parser.add_argument("--db", default=None, help="SQLite file to use (default: fresh temp file)")
+    parser.add_argument("--out", default=None, help="write JSON report here")
+    args = parser.parse_args()
+
+    db_path = use_temp_database(args.db)
+    metrics = asyncio.run(run(args))
+    params = {k: v for k, v in vars(args).items() if k not in {"out", "db"}}
+    params["db"] = db_path
+    write_report(build_report("http_load", params, metrics), args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Day-1 risk forecast throughput (app/services/risk_forecast.py).
+
+    cd backend
+    python -m benchmarks.risk_forecast --cases 100000 --db-cases 50000 --out risk.json
+
+`compute` times the vectorised pass alone on --cases synthetic rows (reported
+per 100k cases). `pipeline` loads --db-cases synthetic cases into a temp
+database and times run_forecast() end to end (load / compute / write-back),
+once from a stale state and once more with nothing left to change.
+`sweeper` rebuilds the risk sweeper heap on that database and replays
+--sweep-days simulated days, timing each daily sweep.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from datetime import date, timedelta
+from typing import Any, Dict
+
+from benchmarks._common import build_report, use_temp_database, write_report
+
+
+def _compute_metrics(n: int, seed: int, repeat: int) -> Dict[str, Any]:
+    from app.services.risk_forecast import AT_RISK, GREEN, build_inputs, forecast
+    from app.tools.it_tools import ticket_templates
+
+    rng = random.Random(seed)
+    today = date.today()
+    tickets = json.dumps(ticket_templates())
+    rows = [
+        (
+            f"CASE-{i:08X}",
+            (today + timedelta(days=int(rng.triangular(-30, 180, 45)))).isoformat(),
+            rng.choice([2, 2, 4, 8]),
+            rng.choice([3, 7]),
+            rng.choice([None, 3, 5, 7]),
+            AT_RISK if rng.random() < 0.15 else GREEN,
+            rng.choice([None, tickets]),
+        )
+        for i in range(n)
+    ]
+    t0 = time.perf_counter()
+    inputs = build_inputs(rows)
+    build_s = time.perf_counter() - t0
+
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        at_risk, changed = forecast(inputs, today)
+        best = min(best, time.perf_counter() - t0)
+    scale = 100_000 / max(1, n)
+    return {
+        "cases": n,
+        "build_ms_per_100k": round(build_s * 1000 * scale, 2),
+        "compute_ms_per_100k": round(best * 1000 * scale, 3),
+        "at_risk": int(at_risk.sum()),
+        "changed": int(changed.sum()),
+    }
+
+
+def _pipeline_metrics(n: int, seed: int) -> Dict[str, Any]:
+    from benchmarks.synthetic_data import generate
+    from app.services.risk_forecast import run_forecast
+
+    generate(n, seed, batch_size=5_000, progress=False)
+    first = run_forecast()
+    second = run_forecast()
+    return {
+        "cases": n,
+        "evaluated": first["evaluated"],
+        "changed": first["changed"],
+        "load_ms": first["timingsMs"]["load"],
+        "compute_ms": first["timingsMs"]["compute"],
+        "write_ms": first["timingsMs"]["write"],
+        "steady_total_ms": round(sum(second["timingsMs"].values()), 2),
+        "steady_changed": second["changed"],
+    }
+
+
+def _sweeper_metrics(days: int) -> Dict[str, Any]:
+    from app.services.risk_sweeper import RiskSweeper
+
+    sweeper = RiskSweeper()
+    today = date.today()
+    t0 = time.perf_counter()
+    scheduled = sweeper.rebuild(today)
+    rebuild_ms = (time.perf_counter() - t0) * 1000
+
+    sweep_ms, transitions = [], 0
+    for d in range(days + 1):
+        t0 = time.perf_counter()
+        transitions += sweeper.sweep(today + timedelta(days=d))
+        sweep_ms.append((time.perf_counter() - t0) * 1000)
+    return {
+        "scheduled": scheduled,
+        "rebuild_ms": round(rebuild_ms, 2),
+        "transitions": transitions,
+        "sweep_mean_ms": round(sum(sweep_ms) / len(sweep_ms), 3),
+        "sweep_max_ms": round(max(sweep_ms), 3),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the vectorised Day-1 risk forecast.")
+    parser.add_argument("--cases", type=int, default=100_000, help="rows for the in-memory compute pass")
+    parser.add_argument("--db-cases", type=int, default=20_000, help="synthetic cases for the DB pipeline (0 = skip)")
+    parser.add_argument("--sweep-days", type=int, default=30, help="simulated days for the sweeper replay")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=5, help="best-of-N for the compute pass")
+    parser.add_argument("--db", default=None, help="SQLite file to use (default: temp file)")
+    parser.add_argument("--out", default=None, help="write JSON report here")
+    args = parser.parse_args()
+
+    use_temp_database(args.db)
+    metrics: Dict[str, Any] = {"compute": _compute_metrics(args.cases, args.seed, args.repeat)}
+    if args.db_cases:
+        metrics["pipeline"] = _pipeline_metrics(args.db_cases, args.seed)
+        metrics["sweeper"] = _sweeper_metrics(args.sweep_days)
+
+    params = {k: v for k, v in vars(args).items() if k not in ("out", "db")}
+    write_report(build_report("risk_forecast", params, metrics), args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Typeahead latency of /api/hr/search (app/store/search_index.py).
+
+    cd backend
+    python -m benchmarks.search --rows 1000000 --queries 200 --out search.json
+
+Loads --rows synthetic case_summary rows (names, roles, locations, employee ids,
+emails, seats and asset tags drawn from benchmarks.synthetic_data's tables) into
+a temp database with the FTS5 sync triggers active, so `load` also measures the
+write-side cost of keeping the index in step. Then times search() for query
+classes a typeahead sends: 2/3/5-character name prefixes, two-term name
+prefixes, employee-id and asset-tag prefixes, and a role + location pair.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+from benchmarks._common import build_report, latency_summary, use_temp_database, write_report
+
+
+def _load(rows: int, seed: int, batch_size: int) -> Dict[str, Any]:
+    from app.db.database import engine
+    from app.db.models import Base, CaseSummary
+    from app.store.search_index import ensure_search_index
+    from benchmarks.synthetic_data import FIRST_NAMES, LAST_NAMES, LOCATIONS, ROLES, SEAT_ZONES
+
+    Base.metadata.create_all(bind=engine, tables=[CaseSummary.__table__])
+    ensure_search_index()
+
+    rng = random.Random(seed)
+    roles = [r for r, _ in ROLES]
+    locations = [l for l, _ in LOCATIONS]
+    now = datetime.utcnow()
+    t0 = time.perf_counter()
+    for start in range(0, rows, batch_size):
+        batch = []
+        for i in range(start, min(rows, start + batch_size)):
+            case_id = f"CASE-{i:08X}"
+            name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+            loc = rng.choice(locations)
+            employed = rng.random() < 0.6
+            batch.append({
+                "case_id": case_id,
+                "candidate_name": name,
+                "role": rng.choice(roles),
+                "work_location": loc,
+                "status": "ONBOARDING_IN_PROGRESS" if employed else "DRAFT",
+                "risk_status": "GREEN",
+                "employee_id": f"EMP-{case_id}" if employed else None,
+                "email": f"{name.lower().replace(' ', '.')}.{i}@example.com" if employed else None,
+                "seat_location": f"{loc.upper()}-{rng.randint(2, 6)}{rng.choice(SEAT_ZONES)}-{10 + i % 90}" if employed else None,
+                "asset_id": f"LAP-{i:08X}" if employed and rng.random() < 0.6 else None,
+                "confirmed": employed,
+                "created_at": now,
+                "updated_at": now,
+            })
+        with engine.begin() as conn:
+            conn.execute(CaseSummary.__table__.insert(), batch)
+    load_s = time.perf_counter() - t0
+    return {"rows": rows, "load_s": round(load_s, 2), "rows_per_s": round(rows / max(1e-9, load_s))}
+
+
+def _time(fn: Callable[[], Any], n: int) -> Dict[str, Any]:
+    lat: List[float] = []
+    t0 = time.perf_counter()
+    hits = 0
+    for _ in range(n):
+        t = time.perf_counter()
+        hits += len(fn()["results"])
+        lat.append((time.perf_counter() - t) * 1000)
+    summary = latency_summary(lat, time.perf_counter() - t0)
+    summary["mean_results"] = round(hits / max(1, n), 2)
+    return summary
+
+
+def _query_metrics(rows: int, n: int, seed: int, limit: int) -> Dict[str, Any]:
+    from app.store.search_index import search
+    from benchmarks.synthetic_data import FIRST_NAMES, LAST_NAMES
+
+    rng = random.Random(seed + 1)
+
+    def _name_prefix(k: int) -> Callable[[], Any]:
+        return lambda: search(rng.choice(FIRST_NAMES)[:k], limit=limit)
+
+    classes: Dict[str, Callable[[], Any]] = {
+        "name_prefix_2": _name_prefix(2),
+        "name_prefix_3": _name_prefix(3),
+        "name_prefix_5": _name_prefix(5),
+        "first_last_prefix": lambda: search(f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)[:3]}", limit=limit),
+        "employee_id_prefix": lambda: search(f"EMP-CASE-{rng.randrange(rows):08X}"[:14], limit=limit, employees_only=True),
+        "asset_tag_exact": lambda: search(f"LAP-{rng.randrange(rows):08X}", limit=limit),
+        "role_location": lambda: search("software uae", limit=limit),
+    }
+    return {name: _time(fn, n) for name, fn in classes.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark FTS5 typeahead search.")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=200, help="queries per class")
+    parser.add_argument("--limit", type=int, default=10, help="page size (typeahead)")
+    parser.add_argument("--batch-size", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db", default=None, help="SQLite file to use (default: temp file)")
+    parser.add_argument("--out", default=None, help="write JSON report here")
+    args = parser.parse_args()
+
+    use_temp_database(args.db)
+    metrics: Dict[str, Any] = {"load": _load(args.rows, args.seed, args.batch_size)}
+    metrics.update(_query_metrics(args.rows, args.queries, args.seed, args.limit))
+
+    params = {k: v for k, v in vars(args).items() if k not in ("out", "db")}
+    write_report(build_report("search", params, metrics), args.out)
+
+
+if __name__ == "__main__":
+    main()
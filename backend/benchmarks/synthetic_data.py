@@ -0,0 +1,283 @@
+"""
+Deterministic synthetic data generator for scale testing.
+
+Bulk-loads cases, application_codes, employee_records, workplace_assignments
+and case_states with realistic distributions (confirmed cases also carry the
+compliance/logistics/IT outputs the risk forecast reads):
+
+    cd backend
+    python -m benchmarks.synthetic_data --cases 100000 --seed 42 --db ./scale.db
+
+Same (--seed, --today) -> identical rows. Rows are generated and inserted
+in batches (executemany, one transaction per batch), so 1M cases load in a
+few minutes with constant memory.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterator, List, Tuple
+
+# (value, weight) tables. Weights are relative.
+NATIONALITIES = [
+    ("IN", 22), ("PK", 12), ("AE", 8), ("US", 10), ("GB", 8), ("PH", 9),
+    ("EG", 7), ("BD", 6), ("NP", 4), ("JO", 4), ("FR", 3), ("DE", 3), ("CN", 4),
+]
+LOCATIONS = [("UAE", 40), ("AE", 15), ("HQ", 25), ("London", 10), ("Remote", 5), ("Riyadh", 5)]
+ROLES = [
+    ("Software Engineer", 20), ("Senior Software Engineer", 8), ("Data Analyst", 8),
+    ("Data Scientist", 4), ("ML Engineer", 3), ("Engineering Manager", 4), ("Product Manager", 5),
+    ("Product Designer", 4), ("Staff Nurse", 8), ("Doctor", 3), ("HR Generalist", 5),
+    ("Finance Associate", 6), ("Sales Executive", 8), ("Graduate Intern", 6), ("Team Lead", 4),
+]
+STATUSES = [
+    ("DRAFT", 20), ("NEGOTIATION_PENDING", 8), ("ON_HOLD_HR", 4),
+    ("ONBOARDING_IN_PROGRESS", 35), ("READY_FOR_DAY1", 13), ("ONBOARDING_COMPLETE", 20),
+]
+CONFIRMED = {"ONBOARDING_IN_PROGRESS", "READY_FOR_DAY1", "ONBOARDING_COMPLETE"}
+STEP_KEYS = ["identity_contact", "profile", "work_auth", "documents", "offer", "review"]
+FIRST_NAMES = ["Aisha", "Omar", "Priya", "Rahul", "Sara", "John", "Mei", "Fatima", "Ali", "Maria", "Chen", "Noor", "James", "Leila"]
+LAST_NAMES = ["Khan", "Sharma", "Smith", "Haddad", "Garcia", "Wang", "Ahmed", "Patel", "Brown", "Nasser", "Lee", "Rossi"]
+SEAT_ZONES = "ABCD"
+
+_CASE_ID_SPACE = 1 << 32
+_CODE_SPACE = 1 << 24
+
+
+class _Weighted:
+    def __init__(self, table: List[Tuple[Any, int]]) -> None:
+        self.values = [v for v, _ in table]
+        acc = 0
+        self.cum: List[int] = []
+        for _, w in table:
+            acc += w
+            self.cum.append(acc)
+
+    def pick(self, rng: random.Random) -> Any:
+        return rng.choices(self.values, cum_weights=self.cum, k=1)[0]
+
+
+def _payload_size(rng: random.Random) -> int:
+    # Heavy-tailed step payload size: most steps are small, a few carry big notes/uploads metadata.
+    return min(64_000, int(rng.lognormvariate(5.5, 1.2)))
+
+
+def _generate_batch(
+    seed: int,
+    start: int,
+    count: int,
+    case_offset: int,
+    code_offset: int,
+    today: date,
+) -> Dict[str, List[Dict[str, Any]]]:
+    from app.tools.compliance_policy import get_policy
+    from app.tools.it_tools import it_delivery_days_for_location
+    from app.tools.logistics_tools import delivery_days
+
+    policy = get_policy()
+    nat_w, loc_w, role_w, status_w = (_Weighted(t) for t in (NATIONALITIES, LOCATIONS, ROLES, STATUSES))
+    created = datetime(today.year, today.month, today.day)
+
+    rows: Dict[str, List[Dict[str, Any]]] = {
+        "cases": [], "application_codes": [], "employee_records": [], "workplace_assignments": [], "case_states": [],
+    }
+    for i in range(start, start + count):
+        # Per-case RNG: row i is identical whatever the batch size or --start-index split.
+        rng = random.Random(seed * _CASE_ID_SPACE + i)
+        case_id = f"CASE-{(case_offset + i) % _CASE_ID_SPACE:08X}"
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        nationality = nat_w.pick(rng)
+        location = loc_w.pick(rng)
+        role = role_w.pick(rng)
+        status = status_w.pick(rng)
+        # Start dates: mostly 2-16 weeks out, some already started.
+        start_date = (today + timedelta(days=int(rng.triangular(-30, 180, 45)))).isoformat()
+        salary = str(int(rng.gauss(120_000, 35_000)) // 1000 * 1000)
+
+        rows["cases"].append({
+            "id": case_id,
+            "candidate_name": name,
+            "role": role,
+            "nationality": nationality,
+            "work_location": location,
+            "start_date": start_date,
+            "salary": salary,
+            "benefits": {"housing": rng.random() < 0.3, "relocation": rng.random() < 0.2},
+            "prior_notes": "",
+            "status": status,
+            "created_at": created,
+        })
+
+        code_n = (code_offset + 2 * i) % _CODE_SPACE
+        code = f"APP-{code_n:06X}"
+        if rng.random() < 0.1:
+            # A regenerated code leaves an inactive one behind.
+            rows["application_codes"].append({
+                "code": f"APP-{(code_n + 1) % _CODE_SPACE:06X}", "case_id": case_id, "active": False, "created_at": created,
+            })
+        rows["application_codes"].append({"code": code, "case_id": case_id, "active": True, "created_at": created})
+
+        n_steps = len(STEP_KEYS) if status in CONFIRMED else rng.randint(0, len(STEP_KEYS) - 1)
+        steps: Dict[str, Any] = {}
+        for key in STEP_KEYS[:n_steps]:
+            steps[key] = {"notes": "x" * _payload_size(rng)}
+        if "offer" in steps:
+            steps["offer"]["decision"] = "ACCEPT" if status in CONFIRMED else rng.choice(["ACCEPT", "NEGOTIATE"])
+
+        case_seed = {
+            "candidateName": name,
+            "role": role,
+            "workLocation": location,
+            "nationality": nationality,
+            "startDate": start_date,
+            "compensation": {"salary": salary},
+            "benefitsContext": {},
+            "priorNotes": "",
+        }
+        agent_outputs: Dict[str, Any] = {}
+
+        if status in CONFIRMED:
+            employee_id = f"EMP-{case_id}-{created.strftime('%Y%m%d%H%M%S')}"
+            email = f"{name.lower().replace(' ', '.')}.{i}@example.com"
+            rows["employee_records"].append({
+                "case_id": case_id, "employee_id": employee_id, "full_name": name,
+                "email": email, "department": role, "created_at": created,
+            })
+            agent_outputs["hris"] = {"summary": f"HRIS created employee record {employee_id}.", "risks": [], "actions": [],
+                                     "data": {"employeeId": employee_id, "email": email}}
+
+            remote = location == "Remote"
+            loc_code = location.upper()
+            floor = rng.randint(2, 6)
+            zone = rng.choice(SEAT_ZONES)
+            seat_id = "REMOTE-N/A" if remote else f"{loc_code}-{floor}{zone}-{10 + i % 90}"
+            device = "Dell Latitude 7440" if "Manager" in role or "Lead" in role else "Dell Latitude 5440"
+            equipment = {"bundleName": "Standard Bundle", "deviceModel": device}
+            if rng.random() < 0.6:
+                equipment["assetId"] = f"LAP-{case_id[5:]}"
+            seating = {"seatId": seat_id, "building": None if remote else loc_code, "floor": None if remote else floor,
+                       "zone": "Remote" if remote else zone}
+            rows["workplace_assignments"].append({
+                "case_id": case_id, "seat_id": seat_id, "bundle_name": equipment["bundleName"], "device_model": device,
+                "equipment": equipment, "seating": seating, "asset_id": equipment.get("assetId"), "created_at": created,
+            })
+            agent_outputs["workplace"] = {"summary": "Workplace planned.", "risks": [], "actions": [],
+                                          "data": {"equipment": equipment, "seating": seating}}
+            # Forecast inputs (no RNG draws, so older seeds produce the same rows otherwise).
+            agent_outputs["compliance"] = {"summary": "Compliance checked.", "risks": [], "actions": [],
+                                           "data": {"visaTimelineWeeks": policy.lookup(nationality, location, role).visa_weeks}}
+            agent_outputs["logistics"] = {"summary": "Logistics validated.", "risks": [], "actions": [],
+                                          "data": {"deliveryDays": delivery_days(location)}}
+            agent_outputs["it"] = {"summary": "IT provisioning planned.", "risks": [], "actions": [],
+                                   "data": {"deviceRequest": {"model": device, "deliveryDays": it_delivery_days_for_location(location)}}}
+
+        ts = created.strftime("%Y-%m-%dT%H:%M:%S")
+        rows["case_states"].append({
+            "case_id": case_id,
+            "state": {
+                "caseId": case_id,
+                "applicationNumber": code,
+                "candidateName": name,
+                "status": status,
+                "riskStatus": "AT_RISK" if rng.random() < 0.15 else "GREEN",
+                "currentStepIndex": n_steps,
+                "completedSteps": list(steps.keys()),
+                "steps": steps,
+                "seed": case_seed,
+                "agentOutputs": agent_outputs,
+                "createdAt": ts,
+                "updatedAt": ts,
+            },
+            "updated_at": created,
+        })
+    return rows
+
+
+def _batches(total: int, batch_size: int) -> Iterator[Tuple[int, int]]:
+    for start in range(0, total, batch_size):
+        yield start, min(batch_size, total - start)
+
+
+def generate(
+    total: int,
+    seed: int,
+    batch_size: int,
+    start_index: int = 0,
+    today: date | None = None,
+    progress: bool = True,
+) -> Dict[str, int]:
+    from sqlalchemy import event
+
+    from app.db.database import engine
+    from app.db.models import Base
+    from app.store.case_stats import case_stats
+    from app.store.case_summary import case_summary
+
+    Base.metadata.create_all(bind=engine)
+    tables = Base.metadata.tables
+    order = ["cases", "application_codes", "employee_records", "workplace_assignments", "case_states"]
+
+    if engine.dialect.name == "sqlite":
+        @event.listens_for(engine, "connect")
+        def _fast_pragmas(dbapi_conn, _):
+            cur = dbapi_conn.cursor()
+            cur.execute("PRAGMA journal_mode=WAL")
+            cur.execute("PRAGMA synchronous=OFF")
+            cur.execute("PRAGMA temp_store=MEMORY")
+            cur.execute("PRAGMA cache_size=-200000")
+            cur.close()
+        engine.dispose()
+
+    # Id offsets depend only on the seed, so reruns are reproducible and
+    # --start-index lets several runs append without colliding.
+    offsets = random.Random(seed)
+    case_offset = offsets.randrange(_CASE_ID_SPACE)
+    code_offset = offsets.randrange(_CODE_SPACE)
+    today = today or date.today()
+
+    counts = {t: 0 for t in order}
+    t0 = time.perf_counter()
+    for start, count in _batches(total, batch_size):
+        rows = _generate_batch(seed, start_index + start, count, case_offset, code_offset, today)
+        with engine.begin() as conn:
+            for name in order:
+                if rows[name]:
+                    conn.execute(tables[name].insert(), rows[name])
+                    counts[name] += len(rows[name])
+        # Bulk inserts bypass CaseStore, so bring the read model along explicitly.
+        case_summary.refresh_many([r["id"] for r in rows["cases"]])
+        if progress:
+            done = start + count
+            rate = done / max(1e-9, time.perf_counter() - t0)
+            print(f"\r{done}/{total} cases ({rate:,.0f}/s)", end="", file=sys.stderr, flush=True)
+    if progress:
+        print(file=sys.stderr)
+    case_stats.rebuild()
+    counts["seconds"] = round(time.perf_counter() - t0, 2)
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bulk-load deterministic synthetic onboarding data.")
+    parser.add_argument("--cases", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=5_000)
+    parser.add_argument("--start-index", type=int, default=0, help="offset for appending to an existing dataset")
+    parser.add_argument("--today", default=None, help="anchor date YYYY-MM-DD for start dates (default: today)")
+    parser.add_argument("--db", default=None, help="SQLite file (default: DATABASE_URL or ./hr_automator.db)")
+    args = parser.parse_args()
+
+    if args.db:
+        os.environ["DATABASE_URL"] = f"sqlite:///{args.db}"
+
+    today = date.fromisoformat(args.today) if args.today else None
+    counts = generate(args.cases, args.seed, args.batch_size, start_index=args.start_index, today=today)
+    print(counts)
+
+
+if __name__ == "__main__":
+    main()